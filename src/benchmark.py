@@ -0,0 +1,215 @@
+# benchmark.py
+# Autocomplete benchmark: Level 1 from all 25 start cells, Levels 2 and 3 from a seeded corpus
+#
+#   python src/benchmark.py --output src/benchmark_baseline.json     write a baseline
+#   python src/benchmark.py --compare src/benchmark_baseline.json    exit 1 if any case regressed
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game_logic import GameState, Level1Logic, Level2Logic, Level3Logic
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+CORPUS_SEEDS = range(8)
+LEVEL2_BACKTRACK_SEEDS = range(3)    # the old level 2 search is slow, so it only gets a few boards
+DEFAULT_THRESHOLD = 1.5             # a case regresses when it gets this many times worse
+TIME_SLACK_SECONDS = 0.005          # timer noise allowed on top of the threshold for very fast cases
+MEMORY_SLACK_BYTES = 64 * 1024
+
+Board = List[List[int]]
+KING_STEPS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)]
+
+
+@dataclass
+class CaseResult:
+    status: str
+    seconds: float
+    nodes: int
+    peak_bytes: int
+
+
+# ---- seeded corpus, built without the autocomplete code so solver changes don't move it ----
+
+def random_level1_board(rng: random.Random) -> Board:
+    """A random finished level 1 board: a king's path over all 25 cells."""
+    board = [[0] * 5 for _ in range(5)]
+
+    def free_neighbours(row: int, col: int) -> List[Tuple[int, int]]:
+        return [(row + dr, col + dc) for dr, dc in KING_STEPS
+                if 0 <= row + dr < 5 and 0 <= col + dc < 5 and board[row + dr][col + dc] == 0]
+
+    def extend(row: int, col: int, num: int) -> bool:
+        board[row][col] = num
+        if num == 25:
+            return True
+        options = free_neighbours(row, col)
+        rng.shuffle(options)
+        options.sort(key=lambda cell: len(free_neighbours(*cell)))   # fewest exits first, random ties
+        for next_row, next_col in options:
+            if extend(next_row, next_col, num + 1):
+                return True
+        board[row][col] = 0
+        return False
+
+    while not extend(rng.randrange(5), rng.randrange(5), 1):
+        pass
+    return board
+
+
+def level2_state(board: Board) -> Tuple[GameState, Level2Logic]:
+    """A fresh game at the start of level 2 on board, with the level 1 history it needs."""
+    gs = GameState()
+    positions = {board[row][col]: (row, col) for row in range(5) for col in range(5)}
+    gs.move_history.clear_history()
+    for num in range(1, 26):
+        gs.move_history.record_action_lv1(*positions[num], False)
+    gs.original_one_pos = positions[1]
+    gs.last_pos = positions[25]
+    gs.start_level2([row[:] for row in board])
+    return gs, Level2Logic(gs)
+
+
+def fill_ring_randomly(gs: GameState, l2: Level2Logic, rng: random.Random) -> bool:
+    """Place every number on a random ring cell that keeps the ring completable."""
+    while gs.current_num <= 25:
+        cells = [cell for cell in l2.get_valid_cells() if cell not in l2.get_breaking_cells()]
+        if not cells:
+            return False
+        l2.place_number(*rng.choice(cells))
+    return True
+
+
+def level3_state(board: Board, rng: random.Random) -> Tuple[GameState, Level3Logic]:
+    gs, l2 = level2_state(board)
+    if not fill_ring_randomly(gs, l2, rng):
+        raise RuntimeError("level 1 board has no complete ring")
+    gs.start_level3(gs.outer_ring.copy())
+    return gs, Level3Logic(gs)
+
+
+def level1_state(row: int, col: int) -> Tuple[GameState, Level1Logic]:
+    """A fresh level 1 game with 1 on (row, col)."""
+    gs = GameState()
+    gs.start_level1_at(row, col)
+    return gs, Level1Logic(gs)
+
+
+# ---- running cases ----
+
+def build_cases() -> Dict[str, Callable[[], Tuple[GameState, object]]]:
+    """Case name -> function that sets up a fresh game for it (set-up is not timed)."""
+    cases: Dict[str, Callable[[], Tuple[GameState, object]]] = {}
+    for row in range(5):
+        for col in range(5):
+            cases["level1_start_%d_%d" % (row, col)] = lambda row=row, col=col: level1_state(row, col)
+
+    for seed in CORPUS_SEEDS:
+        board = random_level1_board(random.Random(seed))
+        cases["level2_seed_%d" % seed] = lambda board=board: level2_state(board)
+        cases["level3_seed_%d" % seed] = lambda board=board, seed=seed: level3_state(board, random.Random(seed))
+
+    for seed in LEVEL2_BACKTRACK_SEEDS:
+        board = random_level1_board(random.Random(seed))
+
+        def setup(board: Board = board) -> Tuple[GameState, object]:
+            gs, l2 = level2_state(board)
+            gs.level2_solver = "backtrack"
+            return gs, l2
+
+        cases["level2_backtrack_seed_%d" % seed] = setup
+    return cases
+
+
+def run_case(setup: Callable[[], Tuple[GameState, object]], repeat: int = 1) -> CaseResult:
+    """Nodes and peak memory from one traced run, time is the fastest of repeat untraced runs."""
+    gs, logic = setup()
+    tracemalloc.start()
+    result = gs.autocomplete(logic)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = None
+    for _ in range(repeat):
+        gs, logic = setup()
+        start = time.perf_counter()
+        gs.autocomplete(logic)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    return CaseResult(result.status, seconds, result.nodes, peak)
+
+
+def run_all(names: Optional[List[str]] = None, repeat: int = 1) -> Dict[str, CaseResult]:
+    cases = build_cases()
+    if names:
+        cases = {name: cases[name] for name in names}
+    return {name: run_case(setup, repeat) for name, setup in cases.items()}
+
+
+def node_rate(result: CaseResult) -> float:
+    """Nodes searched per second, 0 for cases answered without a search."""
+    return result.nodes / result.seconds if result.seconds > 0 else 0.0
+
+
+# ---- baselines ----
+
+def to_json(results: Dict[str, CaseResult]) -> dict:
+    return {
+        "python": platform.python_version(),
+        "cases": {name: asdict(result) for name, result in sorted(results.items())},
+    }
+
+
+def compare(baseline: dict, results: Dict[str, CaseResult], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """One line per regression against baseline, empty if none."""
+    problems = []
+    for name, result in sorted(results.items()):
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        if result.status != base["status"]:
+            problems.append("%s: status %s, was %s" % (name, result.status, base["status"]))
+        if result.seconds > base["seconds"] * threshold + TIME_SLACK_SECONDS:
+            problems.append("%s: %.4fs, was %.4fs" % (name, result.seconds, base["seconds"]))
+        if result.nodes > base["nodes"] * threshold:
+            problems.append("%s: %d nodes, was %d" % (name, result.nodes, base["nodes"]))
+        if result.peak_bytes > base["peak_bytes"] * threshold + MEMORY_SLACK_BYTES:
+            problems.append("%s: %d bytes peak, was %d" % (name, result.peak_bytes, base["peak_bytes"]))
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark autocomplete on every level")
+    parser.add_argument("--output", type=Path, help="write the results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE,
+                        help="compare against a baseline and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the fastest is kept")
+    parser.add_argument("cases", nargs="*", help="case names to run (default: all)")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.cases, args.repeat)
+    for name, result in sorted(results.items()):
+        print("%-28s %-10s %9.4fs %8d nodes %9.0f nodes/s %9d bytes" % (
+            name, result.status, result.seconds, result.nodes, node_rate(result), result.peak_bytes))
+    if args.output:
+        args.output.write_text(json.dumps(to_json(results), indent=2, sort_keys=True) + "\n")
+
+    if args.compare:
+        problems = compare(json.loads(args.compare.read_text()), results, args.threshold)
+        for line in problems:
+            print("REGRESSION " + line)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,7 @@ class CompletionRecord:
     timestamp_iso: str
     level: int
     points: int
-    board: List[List[int]]  # 2D board (5x5)
+    board: List[List[int]]  # 2D board (5x5 unless the game was started on another size)
     outer_ring: Optional[Dict[Tuple[int, int], int]] = None  # For Level 2
 
 
@@ -36,8 +36,8 @@ class CompletionLogger:
         self.path = Path(filepath)
 
     def _format_board_ascii(self, board: List[List[int]]) -> str:
-        """Format 5x5 board as ASCII art."""
-        separator = "+----+----+----+----+----+"
+        """Format the inner board as ASCII art."""
+        separator = "+----" * len(board) + "+"
         lines = [separator]
         for row in board:
             row_str = "|"
@@ -48,13 +48,14 @@ class CompletionLogger:
         return "\n".join(lines)
 
     def _format_level2_ascii(self, board: List[List[int]], outer_ring: Dict[Tuple[int, int], int]) -> str:
-        """Format 7x7 board (inner 5x5 + outer ring) as ASCII art."""
-        separator = "+----+----+----+----+----+----+----+"
+        """Format the ring grid (inner board + outer ring, 7x7 on a 5x5 board) as ASCII art."""
+        size = len(board)
+        separator = "+----" * (size + 2) + "+"
         lines = [separator]
         
-        for r in range(7):
+        for r in range(size + 2):
             row_str = "|"
-            for c in range(7):
+            for c in range(size + 2):
                 # Check if this is an outer ring cell
                 if (r, c) in outer_ring:
                     val = outer_ring[(r, c)]
@@ -62,8 +63,8 @@ class CompletionLogger:
                         row_str += "    |"  # Empty outer cell
                     else:
                         row_str += f" {val:2d} |"
-                # Check if this is an inner board cell (rows 1-5, cols 1-5)
-                elif 1 <= r <= 5 and 1 <= c <= 5:
+                # Check if this is an inner board cell (rows and cols 1 to size)
+                elif 1 <= r <= size and 1 <= c <= size:
                     val = board[r - 1][c - 1]
                     row_str += f" {val:2d} |"
                 else:
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import threading
+import time
+from . import search_engine
+from .level1 import Level1Logic
+from .level2 import Level2Logic
+from .level3 import Level3Logic
+
+#Autocomplete in a background thread, so the window keeps drawing while it searches
+#The search runs on a copy of the game. The live game is only touched by apply(), which places the
+#whole solution in one call from the thread that owns it
+#A search that raises still finishes with an ERROR result and the exception in error, so nothing
+#waiting on the worker is left waiting forever
+
+LEVEL_LOGIC = {
+    1: Level1Logic,
+    2: Level2Logic,
+    3: Level3Logic,
+}
+
+
+class AutocompleteWorker:
+    def __init__(self, game_state, ordering=None, max_nodes=None, max_seconds=None):
+        self.state = game_state
+        self.level = game_state.level
+        self.start_num = game_state.current_num
+        self.start_keys = game_state.zobrist_keys
+        self.search_state = game_state.copy()
+        self.ordering = ordering
+        self.cancel_event = threading.Event()
+        self.budget = search_engine.SearchBudget(
+            max_nodes if max_nodes is not None else game_state.autocomplete_max_nodes,
+            max_seconds if max_seconds is not None else game_state.autocomplete_max_seconds,
+            self.cancel_event)
+        self.result = None      #SearchResult once the search has finished
+        self.moves = None       #cells to place on the live game, when solved
+        self.error = None       #what the search raised, with an ERROR result
+        self.started = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def _run(self):
+        try:
+            logic = LEVEL_LOGIC[self.level](self.search_state)
+            result = self.search_state.autocomplete(logic, self.ordering, budget=self.budget)
+            if result:
+                self.moves = self.search_state._solution_moves(self.start_num)
+        except Exception as error:
+            self.error = error
+            result = search_engine.SearchResult(search_engine.ERROR, nodes=self.budget.nodes)
+        self.result = result   #set last, is_done() must not see a result without its moves
+
+    def cancel(self):   #the search stops within a few hundred nodes
+        self.cancel_event.set()
+
+    def is_done(self):
+        return self.result is not None
+
+    def wait(self, timeout=None):
+        self.thread.join(timeout)
+        return self.is_done()
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return time.perf_counter() - self.started
+
+    def nodes(self):   #search progress so far
+        return self.result.nodes if self.result is not None else self.budget.nodes
+
+    def apply(self, level_class):   #place the solution on the live game, returns whether anything was placed
+        if not self.result:
+            return False
+        if self.state.zobrist_keys is not self.start_keys:
+            return False   #the game moved on since the search started, so the solution no longer fits
+
+        if self.level == 2:
+            self.state.auto_completed_from[1] = self.start_num
+        else:
+            self.state.auto_completed_from[0] = self.start_num
+        for row, col in self.moves:
+            level_class.place_number(row, col)
+        return True
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+#Bitboard helpers for the inner board
+#Cell (row, col) is stored as bit (row * size + col) of an int, so the 5x5 board fits in 25 bits
+
+BOARD_SIZE = 5
+
+
+def cell_index(row, col, size=BOARD_SIZE):   #convert (row, col) to a bit index
+    return row * size + col
+
+
+def index_to_cell(index, size=BOARD_SIZE):   #convert a bit index back to (row, col)
+    return divmod(index, size)
+
+
+def full_mask(size=BOARD_SIZE):   #mask with every cell of the board set
+    return (1 << (size * size)) - 1
+
+
+def build_neighbour_masks(size=BOARD_SIZE):   #king-move neighbours of every cell
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            mask = 0
+            for d_row in (-1, 0, 1):
+                for d_col in (-1, 0, 1):
+                    n_row = row + d_row
+                    n_col = col + d_col
+                    if (d_row or d_col) and 0 <= n_row < size and 0 <= n_col < size:
+                        mask |= 1 << cell_index(n_row, n_col, size)
+            masks.append(mask)
+    return masks
+
+
+def build_diagonal_masks(size=BOARD_SIZE):   #diagonal neighbours only (the moves that score in level 1)
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            mask = 0
+            for d_row in (-1, 1):
+                for d_col in (-1, 1):
+                    n_row = row + d_row
+                    n_col = col + d_col
+                    if 0 <= n_row < size and 0 <= n_col < size:
+                        mask |= 1 << cell_index(n_row, n_col, size)
+            masks.append(mask)
+    return masks
+
+
+def column_mask(col, size=BOARD_SIZE):   #every cell in one column
+    mask = 0
+    for row in range(size):
+        mask |= 1 << cell_index(row, col, size)
+    return mask
+
+
+def build_king_shifts(size=BOARD_SIZE):   #(shift, guard) per king direction, guard stops moves wrapping round a row
+    full = full_mask(size)
+    shifts = []
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            if not (d_row or d_col):
+                continue
+            guard = full
+            if d_col == 1:
+                guard &= ~column_mask(size - 1, size)
+            elif d_col == -1:
+                guard &= ~column_mask(0, size)
+            shifts.append((d_row * size + d_col, guard))
+    return shifts
+
+
+def board_to_mask(board):   #occupancy mask of a list-of-lists board
+    mask = 0
+    size = len(board)
+    for row in range(size):
+        for col in range(size):
+            if board[row][col] != 0:
+                mask |= 1 << cell_index(row, col, size)
+    return mask
+
+
+def iter_bits(mask):   #yield the index of every set bit, lowest first (row-major order)
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_to_cells(mask, size=BOARD_SIZE):   #list of (row, col) for every set bit
+    return [divmod(index, size) for index in iter_bits(mask)]
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+#The masks for one board size and the whole-board operations that need them
+#Built once per size (see masks_for), the module level names below are the 5x5 board's
+class BoardMasks:
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.full = full_mask(size)
+        self.neighbours = build_neighbour_masks(size)
+        self.diagonals = build_diagonal_masks(size)
+        self.king_shifts = build_king_shifts(size)
+        self.not_first_col = self.full & ~column_mask(0, size)
+        self.not_last_col = self.full & ~column_mask(size - 1, size)
+
+    def cell_index(self, row, col):
+        return row * self.size + col
+
+    def index_to_cell(self, index):
+        return divmod(index, self.size)
+
+    def mask_to_cells(self, mask):
+        return mask_to_cells(mask, self.size)
+
+    def dilate(self, mask):   #mask plus every king neighbour of it
+        size = self.size
+        horizontal = mask | ((mask << 1) & self.not_first_col) | ((mask >> 1) & self.not_last_col)
+        return (horizontal | (horizontal << size) | (horizontal >> size)) & self.full
+
+    def dilate_diagonal(self, mask):   #cells one diagonal step from mask (mask itself not included)
+        size = self.size
+        horizontal = ((mask << 1) & self.not_first_col) | ((mask >> 1) & self.not_last_col)
+        return ((horizontal << size) | (horizontal >> size)) & self.full
+
+    def diagonal_components(self, region):   #how many groups region splits into when only diagonal steps join cells
+        count = 0
+        while region:
+            reached = region & -region
+            while True:
+                grown = (reached | self.dilate_diagonal(reached)) & region
+                if grown == reached:
+                    break
+                reached = grown
+            region &= ~reached
+            count += 1
+        return count
+
+    def flood_fill(self, seed, region):   #cells of region connected to seed by king moves
+        reached = seed & region
+        while True:
+            grown = self.dilate(reached) & region
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def single_neighbour_cells(self, region):   #cells with exactly one king neighbour inside region
+        once = 0
+        twice = 0
+        for shift, guard in self.king_shifts:
+            if shift > 0:
+                hits = (region >> shift) & guard
+            else:
+                hits = (region << -shift) & guard
+            twice |= once & hits
+            once |= hits
+        return once & ~twice
+
+
+_MASKS = {}
+
+
+def masks_for(size):   #the BoardMasks of a board size, built the first time it is asked for
+    if size not in _MASKS:
+        _MASKS[size] = BoardMasks(size)
+    return _MASKS[size]
+
+
+DEFAULT = masks_for(BOARD_SIZE)
+FULL_MASK = DEFAULT.full
+NEIGHBOUR_MASKS = DEFAULT.neighbours
+DIAGONAL_MASKS = DEFAULT.diagonals
+KING_SHIFTS = DEFAULT.king_shifts
+NOT_FIRST_COL = DEFAULT.not_first_col
+NOT_LAST_COL = DEFAULT.not_last_col
+dilate = DEFAULT.dilate
+dilate_diagonal = DEFAULT.dilate_diagonal
+diagonal_components = DEFAULT.diagonal_components
+flood_fill = DEFAULT.flood_fill
+single_neighbour_cells = DEFAULT.single_neighbour_cells
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+from . import bitboard
+from . import lines
+
+#Counting how many ways a position can still be finished, for rating how forgiving it is
+#Every count takes a limit and stops adding once it gets there. Capped counts add up exactly
+#(min(limit, a + b) == min(limit, min(limit, a) + min(limit, b))), so they can be memoised like full ones
+
+
+#Levels 1 and 3: king paths from last over every empty cell
+#allowed[num] masks the cells num may go on in level 3, None means anywhere (level 1)
+#prune(empty, last) returns something truthy for states that cannot be finished, to skip counting them
+#memo is keyed on (occupied, last), the number to place follows from how many cells are filled
+#masks is the board's bitboard.BoardMasks
+def count_paths(occupied, last, num, allowed=None, limit=None, prune=None, masks=bitboard.DEFAULT):
+    memo = {}
+
+    def count(occupied, last, num):
+        empty = masks.full & ~occupied
+        if not empty:
+            return 1
+        key = (occupied, last)
+        if key in memo:
+            return memo[key]
+
+        total = 0
+        if prune is None or not prune(empty, last):
+            moves = masks.neighbours[last] & empty
+            if allowed is not None:
+                moves &= allowed[num]
+            for index in bitboard.iter_bits(moves):
+                total += count(occupied | 1 << index, index, num + 1)
+                if limit is not None and total >= limit:
+                    total = limit
+                    break
+        memo[key] = total
+        return total
+
+    return count(occupied, last, num)
+
+
+#Level 2: ways to fill the empty ring cells, a permanent of the number/cell matching
+#A number goes on an empty ring cell of one of its lines, and every line's empty cells need a number of
+#its own from that line. So the numbers are given out to lines, each line taking exactly as many as it
+#has empty cells, and the numbers on one line can sit on its cells in any order
+#homes[i] is the lines through the i-th number still to place, capacity[line] the line's empty ring cells
+#memo is keyed on the capacity left, which also says how many numbers have been given out
+def count_ring_fillings(homes, capacity, limit=None):
+    memo = {}
+    if sum(capacity) != len(homes):
+        return 0
+
+    def count(capacity):
+        placed = len(homes) - sum(capacity)
+        if placed == len(homes):
+            return 1
+        if capacity in memo:
+            return memo[capacity]
+
+        total = 0
+        for line in homes[placed]:
+            free = capacity[line]
+            if free:
+                rest = capacity[:line] + (free - 1,) + capacity[line + 1:]
+                total += free * count(rest)   #free cells on the line to pick from
+                if limit is not None and total >= limit:
+                    total = limit
+                    break
+        memo[capacity] = total
+        return total
+
+    return count(tuple(capacity))
+
+
+def ring_capacity(outer_ring, ring_line=lines.RING_LINE):   #empty ring cells per line
+    capacity = [0] * (max(ring_line.values()) + 1)
+    for pos, value in outer_ring.items():
+        if value == 0:
+            capacity[ring_line[pos]] += 1
+    return capacity
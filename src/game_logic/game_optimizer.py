@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+import time
+from . import bitboard
+from . import lines
+from . import search_engine
+from . import symmetry
+from .game_state import GameState
+from .level1 import Level1Logic
+from .level2 import Level2Logic
+from .level3 import Level3Logic
+from .search_problems import Level1MaxScore
+from .solver_stats import SolverStats
+
+#Whole-game score optimiser, for offline use rather than from the window
+#Level 1 runs the Level1MaxScore branch and bound, and every full level 1 board it reaches is handed to
+#RingPathSearch, which looks for the ring and the level 3 path together. A level 3 number has to sit on
+#the line of its ring cell and each line has two ring cells, so picking a line per number with no line
+#used more than twice is enough, the ring cells follow from the lines
+#Levels 2 and 3 score a point per placement, so a board adds at most LATER_LEVEL_POINTS after level 1
+#and that keeps the level 1 bound admissible
+
+MAX_NUMBER = bitboard.BOARD_SIZE * bitboard.BOARD_SIZE
+LATER_LEVEL_POINTS = 2 * (MAX_NUMBER - 1)
+
+
+def _ring_ends():   #the two ring cells of every line
+    ends = [[] for _ in range(lines.LINE_COUNT)]
+    for pos in sorted(lines.RING_LINE):
+        ends[lines.RING_LINE[pos]].append(pos)
+    return ends
+
+
+RING_ENDS = _ring_ends()
+
+
+#Levels 2 and 3 at once for a full level 1 board, a search problem for search_engine.run
+#Moves are (cell index, line): the next number goes on that inner cell in level 3 and on a ring cell of
+#that line in level 2. Failed (occupied, last, line use) states are kept in dead for the length of the run
+class RingPathSearch:
+    def __init__(self, game_state, positions):
+        self.state = game_state               #only used for its level 1 feasibility rules
+        self.positions = positions            #positions[num] is the cell index of num on the level 1 board
+        self.last = positions[1]
+        self.occupied = 1 << self.last
+        self.num = 2
+        self.line_use = [0] * lines.LINE_COUNT
+        self.line_left = [0] * lines.LINE_COUNT   #numbers still to place that could take each line
+        for index in positions[2:]:
+            for line in lines.INNER_LINES[index]:
+                self.line_left[line] += 1
+        self.history = []
+        self.dead = set()
+
+    def is_goal(self):
+        return self.num > MAX_NUMBER
+
+    def _key(self):
+        return (self.occupied, self.last, tuple(self.line_use))
+
+    def expand(self):
+        if self._key() in self.dead:
+            return None
+        if self.num > 2:
+            #every line ends up with exactly two numbers, check the ones the last number could have taken
+            for line in lines.INNER_LINES[self.positions[self.num - 1]]:
+                if self.line_left[line] < 2 - self.line_use[line]:
+                    return None
+        empty = bitboard.FULL_MASK & ~self.occupied
+        if self.state._level1_prune(empty, self.last) is not None:
+            return None   #level 3 is a king path over the empty cells just like level 1
+
+        home = lines.INNER_LINES[self.positions[self.num]]
+        moves = []
+        for index in bitboard.iter_bits(bitboard.NEIGHBOUR_MASKS[self.last] & empty):
+            for line in lines.INNER_LINES[index]:
+                if line in home and self.line_use[line] < 2:
+                    moves.append((index, line))
+        return moves
+
+    def make(self, move):
+        index, line = move
+        self.history.append(self.last)
+        self.occupied |= 1 << index
+        self.last = index
+        self.line_use[line] += 1
+        for home_line in lines.INNER_LINES[self.positions[self.num]]:
+            self.line_left[home_line] -= 1
+        self.num += 1
+
+    def unmake(self, move):
+        index, line = move
+        self.num -= 1
+        for home_line in lines.INNER_LINES[self.positions[self.num]]:
+            self.line_left[home_line] += 1
+        self.line_use[line] -= 1
+        self.occupied &= ~(1 << index)
+        self.last = self.history.pop()
+
+    def mark_dead(self):
+        self.dead.add(self._key())
+
+
+def ring_and_path(path):   #(level 2 moves, level 3 moves) from a RingPathSearch path
+    used = [0] * lines.LINE_COUNT
+    ring_moves = []
+    for _, line in path:
+        ring_moves.append(RING_ENDS[line][used[line]])
+        used[line] += 1
+    return ring_moves, [bitboard.index_to_cell(index) for index, _ in path]
+
+
+#Plays a whole game through the level logic classes, as clicks would
+#Returns the GameState and the score after each level, raises ValueError on a move the game rejects
+def play_game(start, moves):
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(*start)
+    level_scores = []
+    for level, level_class in enumerate((Level1Logic, Level2Logic, Level3Logic), 1):
+        if level == 2:
+            gs.start_level2([row[:] for row in gs.board])
+        elif level == 3:
+            gs.start_level3(gs.outer_ring.copy())
+        logic = level_class(gs)
+        for row, col in moves[level - 1]:
+            placed, error = logic.place_number(row, col)
+            if not placed:
+                raise ValueError("level %d move (%d, %d) rejected: %s" % (level, row, col, error))
+        level_scores.append(gs.score)
+    return gs, level_scores
+
+
+class BestGame:   #the best whole game found from one start cell
+    def __init__(self, start, score=None, moves=None, level_scores=None, proven=False, nodes=0, elapsed=0.0):
+        self.start = start
+        self.score = score                  #None when no game from start could be finished
+        self.moves = moves                  #[level 1 cells, level 2 ring cells, level 3 cells]
+        self.level_scores = level_scores    #score after each level
+        self.proven = proven                #the whole search space was covered, so score is the maximum
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def to_dict(self):
+        return {
+            "start": list(self.start),
+            "score": self.score,
+            "level_scores": self.level_scores,
+            "proven": self.proven,
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+            "moves": None if self.moves is None else [[list(cell) for cell in level] for level in self.moves],
+        }
+
+    def __repr__(self):
+        return "BestGame(start=%s, score=%s, proven=%s, nodes=%d)" % (self.start, self.score, self.proven, self.nodes)
+
+
+def optimize_game(start, max_seconds=None, max_nodes=None):   #best whole game with 1 on start
+    started = time.perf_counter()
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(*start)
+    ring_stats = SolverStats()
+    one = bitboard.cell_index(*start)
+
+    def later_points(path):   #what levels 2 and 3 add to a full level 1 board, None if they can't be finished
+        positions = [None, one] + list(path)
+        search = search_engine.run(RingPathSearch(gs, positions), None, ring_stats)
+        if not search:
+            return None
+        level1_moves = [bitboard.index_to_cell(index) for index in path]
+        _, level_scores = play_game(start, [level1_moves] + list(ring_and_path(search.path)))
+        return level_scores[2] - level_scores[0]
+
+    problem = Level1MaxScore(gs, stats=SolverStats(), leaf_value=later_points, leaf_bound=LATER_LEVEL_POINTS)
+    result = search_engine.run(problem, search_engine.SearchBudget(max_nodes, max_seconds), problem.stats)
+    best = BestGame(start, proven=result.impossible, nodes=result.nodes + ring_stats.nodes)
+    if problem.best_path is not None:
+        best.moves = _best_moves(gs, one, problem.best_path)
+        _, best.level_scores = play_game(start, best.moves)
+        best.score = best.level_scores[-1]
+    best.elapsed = time.perf_counter() - started
+    return best
+
+
+def _best_moves(gs, one, path):   #levels 2 and 3 again for the winning level 1 path
+    search = search_engine.run(RingPathSearch(gs, [None, one] + list(path)))
+    return [[bitboard.index_to_cell(index) for index in path]] + list(ring_and_path(search.path))
+
+
+#Batch over start cells (all 25 by default)
+#The rules look the same under every board symmetry, so only one start per symmetry class is searched
+#and the others get its best game turned round
+def optimize_all(starts=None, max_seconds=None, max_nodes=None):
+    if starts is None:
+        starts = [(row, col) for row in range(bitboard.BOARD_SIZE) for col in range(bitboard.BOARD_SIZE)]
+    searched = {}
+    results = {}
+    for start in starts:
+        canonical, t = min((symmetry.transform_cell(t, start[0], start[1], symmetry.BOARD_SIZE), t)
+                           for t in symmetry.SYMMETRIES)
+        if canonical not in searched:
+            searched[canonical] = optimize_game(canonical, max_seconds, max_nodes)
+        results[start] = _turned(searched[canonical], symmetry.inverse(t), start)
+    return results
+
+
+def _turned(best, t, start):   #best moved by symmetry t onto start
+    if best.moves is None:
+        moves = None
+    else:
+        sizes = (symmetry.BOARD_SIZE, symmetry.RING_SIZE, symmetry.BOARD_SIZE)
+        moves = [[symmetry.transform_cell(t, row, col, size) for row, col in level]
+                 for level, size in zip(best.moves, sizes)]
+    return BestGame(start, best.score, moves, best.level_scores, best.proven, best.nodes, best.elapsed)
@@ -1,21 +1,64 @@
 #!/usr/bin/env python
 
+import copy
 import random
+import time
+from . import bitboard
+from . import counting
+from . import geometry
+from . import move_ordering
+from . import symmetry
+from . import zobrist
+from . import level3_solver
+from . import search_engine
+from . import portfolio
+from .solver_stats import SolverStats
+from .level1 import Level1Logic
+from .search_problems import Level1Search, Level1MaxScore, LogicSearch
+from .transposition import TranspositionTable, DEFAULT_MAX_BYTES
+from .matching import hopcroft_karp
+
+#Feasibility checks run at every node of the level 1 search, in this order
+LEVEL1_PRUNE_RULES = ("dead_ends", "disconnected", "unreachable")
+
+#Level 2 autocomplete either matches numbers to ring cells or runs the older backtracking search
+LEVEL2_SOLVERS = ("matching", "backtrack")
+
+#Move ordering policies raced against the level's own one when autocomplete runs on several processes
+PORTFOLIO_POLICIES = ("warnsdorff", "row_major")
 
 
 class GameState:
-    def __init__(self):
+    def __init__(self, use_bitboard=True, transposition_bytes=DEFAULT_MAX_BYTES, board_size=bitboard.BOARD_SIZE):
+        self.board_size = board_size                        #inner board is board_size x board_size, the ring 2 wider
+        self.geometry = geometry.for_size(board_size)       #every table derived from the size (see geometry.py)
+        self.max_number = board_size * board_size           #last number to place
         self.level = 1                                      #current level (1 or 2)
-        self.board = [[0 for _ in range(5)] for _ in range(5)]  #5x5 inner board
+        self.board = self._create_empty_board()             #inner board
         self.outer_ring = {}                                #outer ring cells for level 2 (dict with (row, col) keys)
         self.current_num = 1                                #next number to place
         self.score = 0                                      #player score
         self.last_pos = None                                #position of last placed number
         self.original_one_pos = None                        #original position of "1" for clear functionality
+        self.givens = []                                    #cells of 1 and a puzzle's givens, in order, which undo and clear leave alone
         self.game_over = False                              #game over flag
         self.auto_completed_from = [-1, -1]                 #If this number is -1, ignore it
         self.win = False
         self.move_history = History()                       
+        self.occupied = 0                                   #bitboard of filled inner cells, kept in sync with board
+        self.use_bitboard = use_bitboard                    #use the bitboard for move generation and level 1 autocomplete
+        self.move_ordering = dict(move_ordering.DEFAULT_POLICIES)  #autocomplete move ordering policy per level
+        self.level1_prune_rules = LEVEL1_PRUNE_RULES        #enabled level 1 feasibility checks
+        self.prune_counts = {}                              #how often each rule pruned during the last autocomplete (its stats.prunes)
+        self.level2_solver = "matching"                     #one of LEVEL2_SOLVERS
+        self.ring_listener = None                           #the newest Level2Logic on this game, told by undo when a ring cell is cleared
+        self.autocomplete_max_nodes = None                  #default autocomplete node budget (None is unlimited)
+        self.autocomplete_max_seconds = None                #default autocomplete time budget in seconds (None is unlimited)
+        self.autocomplete_workers = 1                       #processes autocomplete searches on, 1 searches in this one
+        self.portfolio_policies = PORTFOLIO_POLICIES        #orderings raced when autocomplete_workers > 1
+        self.zobrist_keys = list(self.geometry.zobrist.level_deltas[1])    #search state hashed in all 8 orientations, kept in sync by place_number and undo
+        #dead ends found by autocomplete, kept between runs (0 bytes turns it off)
+        self.transposition_table = TranspositionTable(transposition_bytes) if transposition_bytes else None
     
     def reset_level1(self):   #reset for a new level 1 game (keeps "1" in original position per story 4)
         #Story 10: Deduct points for each cell being cleared (except "1")
@@ -26,7 +69,7 @@ class GameState:
                 self.score -= 1
         
         self.level = 1
-        self.board = [[0 for _ in range(5)] for _ in range(5)]
+        self.board = self._create_empty_board()
         self.outer_ring = {}
         self.game_over = False
         self.win = False
@@ -43,10 +86,21 @@ class GameState:
         else:
             self.current_num = 1
             self.last_pos = None
+        self.sync_occupancy()
+        self._place_givens(self.givens[1:])   #a puzzle keeps its givens too
         
     def start_level1_with_random_one(self):   #place number 1 randomly for level 1 start (story 1 requirement)
+        #place "1" randomly and save original position
+        row = random.randint(0, self.board_size - 1)
+        col = random.randint(0, self.board_size - 1)
+        #Number combo below is for testing backtracking
+        #row = 3
+        #col = 0
+        self.start_level1_at(row, col)
+    
+    def start_level1_at(self, row, col):   #new level 1 game with 1 on (row, col)
         self.level = 1
-        self.board = [[0 for _ in range(5)] for _ in range(5)]
+        self.board = self._create_empty_board()
         self.outer_ring = {}
         self.score = 0
         self.game_over = False
@@ -54,58 +108,166 @@ class GameState:
         self.auto_completed_from[0] = -1
         self.move_history.clear_history()
         
-        #place "1" randomly and save original position
-        row = random.randint(0, 4)
-        col = random.randint(0, 4)
-        #Number combo below is for testing backtracking
-        #row = 3
-        #col = 0
         self.board[row][col] = 1
         self.last_pos = (row, col)
         self.original_one_pos = (row, col)   #save for clear functionality (story 4)
+        self.givens = [(row, col)]
         self.move_history.record_action_lv1(row, col, False)
         self.current_num = 2
+        self.sync_occupancy()
+        
+    def start_level1_with_puzzle(self, puzzle):   #new level 1 game on a puzzle's givens (see puzzle_bank.py)
+        if len(puzzle.board) != self.board_size:
+            raise ValueError("a %dx%d puzzle does not fit a %dx%d board" % (
+                len(puzzle.board), len(puzzle.board), self.board_size, self.board_size))
+        givens = puzzle.givens()
+        self.start_level1_at(*givens[0])
+        self._place_givens(givens[1:])
+        self.givens = list(givens)
+    
+    def _place_givens(self, cells):   #place the numbers after 1 that a puzzle starts with
+        score = self.score
+        logic = Level1Logic(self)
+        for row, col in cells:
+            logic.place_number(row, col)
         
+        #the givens come with the puzzle, so none of them score
+        self.score = score
+        for action in self.move_history.arr:
+            action.scored = False
+    
+    def start_level1_from_bank(self, bank, difficulty, rng=random):   #random puzzle of a difficulty, one read from the bank
+        puzzle = bank.random(difficulty, rng)
+        self.start_level1_with_puzzle(puzzle)
+        return puzzle
+    
     def start_level2(self, completed_board):   #initialize level 2 with completed level 1 board
         self.level = 2
         self.board = [row[:] for row in completed_board]    #copy the completed board
         self.outer_ring = self._create_empty_ring()         #create empty outer ring
         self.current_num = 2                                #start placing from 2 in outer ring
         self.last_pos = (self.original_one_pos[0], self.original_one_pos[1])#find where 1 is on inner board
+        self.sync_occupancy()
         self.game_over = False
         self.win = False
     
     def start_level3(self, completed_ring):
         self.level = 3
         self.outer_ring = completed_ring.copy()
-        self.board = [[0 for _ in range(5)] for _ in range(5)] #Empty the inner board     
+        self.board = self._create_empty_board() #Empty the inner board
         self.board[self.original_one_pos[0]][self.original_one_pos[1]] = 1 #1st num remains as always
         self.current_num = 2
         self.last_pos = (self.original_one_pos[0],self.original_one_pos[1])
+        self.sync_occupancy()
         self.auto_completed_from[0] = -1
         self.game_over = False
         self.win = False
     
+    #Independent copy of the game for running autocomplete elsewhere
+    #The transposition table is shared, so what one copy learns the other can use
+    def copy(self):
+        other = copy.copy(self)
+        other.board = [row[:] for row in self.board]
+        other.outer_ring = dict(self.outer_ring)
+        other.auto_completed_from = list(self.auto_completed_from)
+        other.move_history = copy.deepcopy(self.move_history)
+        other.move_ordering = dict(self.move_ordering)
+        other.prune_counts = {}
+        other.ring_listener = None
+        other.zobrist_keys = list(self.zobrist_keys)
+        return other
+    
+    def _create_empty_board(self):
+        return [[0 for _ in range(self.board_size)] for _ in range(self.board_size)]
+    
     def _create_empty_ring(self):   #create empty outer ring dictionary
         ring = {}
-        #top row (7 cells: col 0-6, row 0)
-        for col in range(7):
+        last = self.board_size + 1   #last row and column of the ring grid (6 on the 5x5 board)
+        #top row (cols 0 to last, row 0)
+        for col in range(last + 1):
             ring[(0, col)] = 0
-        #bottom row (7 cells: col 0-6, row 6)
-        for col in range(7):
-            ring[(6, col)] = 0
-        #left column excluding corners (rows 1-5, col 0)
-        for row in range(1, 6):
+        #bottom row (cols 0 to last, row last)
+        for col in range(last + 1):
+            ring[(last, col)] = 0
+        #left column excluding corners (rows 1 to last - 1, col 0)
+        for row in range(1, last):
             ring[(row, 0)] = 0
-        #right column excluding corners (rows 1-5, col 6)
-        for row in range(1, 6):
-            ring[(row, 6)] = 0
+        #right column excluding corners (rows 1 to last - 1, col last)
+        for row in range(1, last):
+            ring[(row, last)] = 0
             
         return ring
     
+    def sync_occupancy(self):   #rebuild the bitboard and zobrist key after the board or ring was replaced
+        self.occupied = bitboard.board_to_mask(self.board)
+        self.zobrist_keys = self.compute_zobrist_keys()
+    
+    #Hash of everything the rest of an autocomplete search depends on, one key per board symmetry
+    #Level 1: filled cells and last cell. Level 2: the fixed inner board and filled ring cells
+    #Level 3: the fixed ring, filled cells and last cell
+    def compute_zobrist_keys(self):
+        deltas = self.geometry.zobrist
+        masks = self.geometry.masks
+        keys = list(deltas.level_deltas[self.level])
+        
+        if self.level == 2:
+            for row in range(self.board_size):
+                for col in range(self.board_size):
+                    keys = zobrist.combine(keys, deltas.inner_value_delta(masks.cell_index(row, col), self.board[row][col]))
+            for pos, value in self.outer_ring.items():
+                if value != 0:
+                    keys = zobrist.combine(keys, deltas.ring_deltas[pos])
+            return keys
+        
+        for index in bitboard.iter_bits(self.occupied):
+            keys = zobrist.combine(keys, deltas.inner_deltas[index])
+        if self.last_pos is not None:
+            keys = zobrist.combine(keys, deltas.last_deltas[masks.cell_index(*self.last_pos)])
+        if self.level == 3:
+            for pos, value in self.outer_ring.items():
+                keys = zobrist.combine(keys, deltas.ring_value_delta(pos, value))
+        return keys
+    
+    @property
+    def zobrist_key(self):   #the same for every orientation of the state, used as the autocomplete cache key
+        return zobrist.canonical(self.zobrist_keys)
+    
+    #The current number onto inner cell (row, col) for level 1 and level 3 make_move: board, bitboard,
+    #zobrist keys and last cell, nothing else. Returns the last cell before it, which remove_inner needs back
+    def place_inner(self, row, col):
+        previous = self.last_pos
+        masks = self.geometry.masks
+        deltas = self.geometry.zobrist
+        index = masks.cell_index(row, col)
+        self.board[row][col] = self.current_num
+        self.occupied |= 1 << index
+        
+        #the cell is now filled and holds the last number
+        #zobrist_keys is always replaced by a new list, never changed in place: Level2Logic, AutocompleteWorker
+        #and autocomplete's solution cache hold on to the list they saw and tell by identity whether it moved on
+        previous_last = deltas.last_deltas[masks.cell_index(*previous)] if previous is not None else zobrist.NO_DELTA
+        self.zobrist_keys = zobrist.combine(self.zobrist_keys, deltas.inner_deltas[index], deltas.last_deltas[index],
+                                            previous_last)
+        
+        self.last_pos = (row, col)
+        self.current_num += 1
+        return previous
+    
+    def remove_inner(self, row, col, previous):   #undo place_inner
+        masks = self.geometry.masks
+        deltas = self.geometry.zobrist
+        index = masks.cell_index(row, col)
+        self.board[row][col] = 0
+        self.occupied &= ~(1 << index)
+        previous_last = deltas.last_deltas[masks.cell_index(*previous)] if previous is not None else zobrist.NO_DELTA
+        self.zobrist_keys = zobrist.combine(self.zobrist_keys, deltas.inner_deltas[index], deltas.last_deltas[index],
+                                            previous_last)
+        self.last_pos = previous
+        self.current_num -= 1
+    
     def _find_number_position(self, num):   #find position of a number on the inner board
-        for row in range(5):
-            for col in range(5):
+        for row in range(self.board_size):
+            for col in range(self.board_size):
                 if self.board[row][col] == num:
                     return (row, col)
         return None
@@ -138,20 +300,29 @@ class GameState:
         self.last_pos = state['last_pos']
         self.move_history = state['board_history']
         self.auto_completed_from = state['auto_completed_from']
+        self.sync_occupancy()
         self.game_over = False
         self.win = False
     
     def undo(self):
         if self.current_num == 1: return #You cannot undo the first number
+        masks = self.geometry.masks
+        deltas = self.geometry.zobrist
         
-        #In lv 1 I can just pop from the array
+        #In lv 1 I can just pop from the array, down to 1 and a puzzle's givens
         if self.level == 1:
+            if self.current_num <= len(self.givens) + 1:
+                return
             last_action = self.move_history.undo_history()
             penult_action = self.move_history.get_action(-1)
             
+            removed = masks.cell_index(last_action.inner_pos_x, last_action.inner_pos_y)
             self.board[last_action.inner_pos_x][last_action.inner_pos_y] = 0
+            self.occupied &= ~(1 << removed)
             self.current_num -= 1
             self.last_pos = (penult_action.inner_pos_x, penult_action.inner_pos_y)
+            self.zobrist_keys = zobrist.combine(self.zobrist_keys, deltas.inner_deltas[removed], deltas.last_deltas[removed],
+                                                deltas.last_deltas[masks.cell_index(*self.last_pos)])
             
             #deduct score if the last action scored
             if last_action.scored:
@@ -165,12 +336,18 @@ class GameState:
             #Accounting for array starting at 0, previous action is current num - 2
             last_action = self.move_history.get_action(self.current_num - 2)
             penult_action = self.move_history.get_action(self.current_num - 3)
+            cleared = last_action.outer_pos
+            previous_keys = self.zobrist_keys
             
-            self.outer_ring[last_action.outer_pos] = 0
+            self.outer_ring[cleared] = 0
+            self.zobrist_keys = zobrist.combine(self.zobrist_keys, deltas.ring_deltas[cleared])
             last_action.edit_outer_pos((-1, -1))
             self.current_num -= 1
             self.last_pos = (penult_action.inner_pos_x, penult_action.inner_pos_y)
             
+            if self.ring_listener is not None:
+                self.ring_listener.ring_cell_cleared(self.current_num, cleared, previous_keys)
+            
             #deduct score if the last action scored, since lv2 only gives points for outer ring
             self.score -= 1
         
@@ -181,7 +358,9 @@ class GameState:
             row, col = last_action.third_pos
             penult_row, penult_col = penult_action.third_pos
             
+            removed = masks.cell_index(row, col)
             self.board[row][col] = 0
+            self.occupied &= ~(1 << removed)
             last_action.edit_lv3((-1, -1))
             self.current_num -= 1
             
@@ -189,6 +368,8 @@ class GameState:
                 self.last_pos = self.original_one_pos
             else:    
                 self.last_pos = (penult_row, penult_col)
+            self.zobrist_keys = zobrist.combine(self.zobrist_keys, deltas.inner_deltas[removed], deltas.last_deltas[removed],
+                                                deltas.last_deltas[masks.cell_index(*self.last_pos)])
             
             #deduct score if the last action scored, lv3 only gives points for inner board
             self.score -= 1
@@ -209,10 +390,34 @@ class GameState:
         
         return num >= checking
     
-    def autocomplete(self, level_class):
-        ring_check = {}
+    #Returns a search_engine.SearchResult, which is truthy only when the board was completed
+    #Running out of budget leaves the board as it was and reports EXHAUSTED rather than impossible
+    #result.stats is a SolverStats with what the run did
+    #A budget passed in is used as is, for callers that want to cancel the run or watch its progress
+    #workers > 1 races the first moves under several orderings on a process pool (see portfolio.py)
+    #optimize=True looks for the highest scoring level 1 finish instead of the first one and returns an
+    #OptimizeResult, with the best finish found placed when the budget runs out before it is proven
+    def autocomplete(self, level_class, ordering=None, max_nodes=None, max_seconds=None, budget=None, workers=None,
+                     optimize=False):
+        if optimize and self.level != 1:
+            raise ValueError("optimize only applies to level 1, every level %d finish scores the same" % self.level)
+        ring_check = None
+        if optimize and ordering is None:
+            ordering = "diagonal_first"
+        order = self._get_move_order(ordering)
+        if budget is None:
+            budget = search_engine.SearchBudget(
+                max_nodes if max_nodes is not None else self.autocomplete_max_nodes,
+                max_seconds if max_seconds is not None else self.autocomplete_max_seconds)
+        started = time.perf_counter()
+        stats = SolverStats()
+        if self.level == 1:
+            stats.prunes.update({rule: 0 for rule in self.level1_prune_rules})
+        self.prune_counts = stats.prunes
         
         if self.level == 2:
+            if self.level2_solver not in LEVEL2_SOLVERS:
+                raise ValueError("unknown level 2 solver: %s" % self.level2_solver)
             self.auto_completed_from[1] = self.current_num
             ring_check = self.make_ring_check()
         else:
@@ -221,14 +426,121 @@ class GameState:
         #if self.level == 3:
         #    self.lv3_retread_complete(level_class)
         #    return True
-        if self.backtrack_complete(level_class, ring_check):
-            return True
+        start_num = self.current_num
+        start_keys = self.zobrist_keys
+        if not optimize and self._replay_cached_solution(level_class):
+            stats.cache_hit("solution")
+            stats.elapsed = time.perf_counter() - started
+            return search_engine.SearchResult(search_engine.SOLVED, self._solution_moves(start_num), 0, stats.elapsed, stats)
+        
+        if workers is None:
+            workers = self.autocomplete_workers
+        if optimize:
+            result = self._optimize_complete(level_class, order, budget, stats)
+        elif self.level == 2 and self.level2_solver == "matching":
+            result = self.matching_complete(level_class)
+        elif workers > 1:
+            result = portfolio.solve(self, level_class, workers, portfolio.policy_names(self, ordering), budget, stats)
+        else:
+            result = self.backtrack_complete(level_class, ring_check, order, budget, stats)
+        result.stats = stats
+        stats.elapsed = time.perf_counter() - started
+        
+        if result:
+            self._cache_solution(start_keys, start_num)
         else:
             if self.level == 2:
                 self.auto_completed_from[1] = -1
             else:
                 self.auto_completed_from[0] = -1
-        return False
+        return result
+    
+    #How many ways the current level can still be finished, for rating how forgiving a position is
+    #Counting stops at limit, so a UI only after "easy or not" can keep it cheap (None counts them all)
+    def count_completions(self, level_logic, limit=None):
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        if self.current_num > self.last_number():
+            return 1
+        
+        g = self.geometry
+        if self.level == 2:
+            if not level_logic.is_completable():
+                return 0
+            homes = [g.inner_lines[g.masks.cell_index(*self.find_inner_position(num - 1))]
+                     for num in range(self.current_num, self.last_number() + 1)]
+            return counting.count_ring_fillings(homes, counting.ring_capacity(self.outer_ring, g.ring_line), limit)
+        
+        allowed = None
+        if self.level == 3:
+            allowed = level3_solver.allowed_masks(self._ring_positions(), g.ring_cell_masks, self.board_size)
+        if self.last_pos is None:   #1 can still go anywhere
+            total = 0
+            for index in range(self.max_number):
+                total += counting.count_paths(1 << index, index, 2, allowed, limit, self._level1_prune, g.masks)
+                if limit is not None and total >= limit:
+                    return limit
+            return total
+        return counting.count_paths(self.occupied, g.masks.cell_index(*self.last_pos), self.current_num,
+                                    allowed, limit, self._level1_prune, g.masks)
+    
+    def _ring_positions(self):   #ring cell of every number level 2 placed, indexed by number
+        return [None, None] + [self.find_outer_position(num - 1) for num in range(2, self.geometry.last_ring_number + 1)]
+    
+    def last_number(self):   #last number the current level places, level 2 stops when the ring is full
+        return self.geometry.last_ring_number if self.level == 2 else self.max_number
+    
+    def _move_grid_size(self):   #level 2 moves go on the ring grid, the others on the inner board
+        return self.geometry.ring_size if self.level == 2 else self.board_size
+    
+    def _solution_moves(self, start_num):   #cells used by numbers start_num to the last one, in order
+        if self.level == 1:
+            return [(action.inner_pos_x, action.inner_pos_y) for action in self.move_history.arr[start_num - 1:]]
+        if self.level == 2:
+            return [self.find_outer_position(num - 1) for num in range(start_num, self.last_number() + 1)]
+        return [self.move_history.get_action(num - 2).third_pos for num in range(start_num, self.max_number + 1)]
+    
+    #Solutions are cached in the canonical orientation, so a mirrored or rotated copy of a solved
+    #position is a cache hit as well
+    def _cache_solution(self, start_keys, start_num):
+        if self.transposition_table is None or self.current_num <= self.last_number():
+            return   #only a finished level is a solution worth replaying
+        
+        to_canonical = zobrist.canonical_symmetry(start_keys)
+        size = self._move_grid_size()
+        moves = [symmetry.transform_cell(to_canonical, row, col, size) for row, col in self._solution_moves(start_num)]
+        self.transposition_table.store_solution(zobrist.canonical(start_keys), moves)
+    
+    def _replay_cached_solution(self, level_class):
+        if self.transposition_table is None:
+            return False
+        moves = self.transposition_table.get_solution(self.zobrist_key)
+        if moves is None:
+            return False
+        
+        from_canonical = symmetry.inverse(zobrist.canonical_symmetry(self.zobrist_keys))
+        size = self._move_grid_size()
+        start_num = self.current_num
+        for row, col in moves:
+            row, col = symmetry.transform_cell(from_canonical, row, col, size)
+            if not level_class.place_number(row, col)[0]:
+                #only a key collision gets here, so take the moves back and search normally
+                while self.current_num > start_num:
+                    self.undo()
+                return False
+        return True
+    
+    def _get_move_order(self, ordering=None):   #ordering overrides the level's default policy for one run
+        if self.level == 2:
+            return move_ordering.row_major
+        if ordering is None:
+            ordering = self.move_ordering.get(self.level, "row_major")
+        return move_ordering.get_policy(ordering)
+    
+    def _order_moves(self, level_class, cells, order):
+        return order(cells,
+                     lambda cell: level_class.count_onward_moves(cell[0], cell[1]),
+                     lambda cell: level_class.score_gain(cell[0], cell[1]))
     
     def auto_undo(self):
         if self.is_auto_completed(self.current_num, self.level == 2):
@@ -237,119 +549,159 @@ class GameState:
     #In a lv 2 board, if empty cells in the ring's col, row or diagonal ever outnumber thier inner baord counterpart
     #Then that means you've reached a dead end
     #To optimize the lv2 backteacking algorithm, there will be a check for this
+    #ring_check[line] counts the numbers still to place on a line (ids from lines.py) and
+    #ring_check[line_count + line] the empty ring cells at its ends
+    #Every empty ring cell needs a number of its own from that line, so more cells than numbers is a dead end
     def make_ring_check(self):
-        ring_check = {}
-        
-        for i in range(5):
-            ring_check[str("row_%d" % (i+1))] = [5,2]
-            ring_check[str("col_%d" % (i+1))] = [5,2]
-        ring_check[str("diagonal")] = [5,2]
-        ring_check[str("anti")] = [5,2]
-        
-        #The ring check needs to account for the first value on the inner board
-        one_row, one_col = self.original_one_pos
-        
-        if one_row == one_col:
-            ring_check["diagonal"][0] -= 1
-        if one_row + one_col == 6:
-            ring_check["anti"][0] -= 1
-        ring_check[str("col_%d" % (one_col + 1))][0] -= 1
-        ring_check[str("row_%d" % (one_row + 1))][0] -= 1
-        
+        g = self.geometry
+        ring_check = [0] * (2 * g.line_count)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                if self.current_num <= self.board[row][col] <= g.last_ring_number:
+                    for line in g.inner_lines[g.masks.cell_index(row, col)]:
+                        ring_check[line] += 1
+        for pos, value in self.outer_ring.items():
+            if value == 0:
+                ring_check[g.line_count + g.ring_line[pos]] += 1
         return ring_check
 
-    def is_deadend(self, row, col, ring_check):
-        if row == col and self.single_deadend_check(ring_check["diagonal"]):
-            return True
-        
-        if row + col == 6 and self.single_deadend_check(ring_check["anti"]):
+    def is_deadend(self, row, col, ring_check, num=None):   #did num going on ring cell (row, col) leave a line short
+        g = self.geometry
+        if self.single_deadend_check(ring_check, g.ring_line[(row, col)]):
             return True
-        
-        if row != 0 and row != 6:
-            row_check = ring_check[str("row_%d" % (row))]
-            if self.single_deadend_check(row_check):
-                return True
-        
-        if col != 0 and col != 6:
-            col_check = ring_check[str("col_%d" % (col))]
-            if self.single_deadend_check(col_check):
-                return True
-        
+        if num is not None:
+            for line in g.inner_lines[g.masks.cell_index(*self.find_inner_position(num - 1))]:
+                if self.single_deadend_check(ring_check, line):
+                    return True
         return False
     
-    def single_deadend_check(self, single_item):
-        return single_item[1] > single_item[0]
+    def single_deadend_check(self, ring_check, line):
+        return ring_check[self.geometry.line_count + line] > ring_check[line]
     
     def edit_ring_check(self, num, row, col, ring_check, add=False):
-        mult = 1 if add else -1
-        
-        #Edit inner count by 1 on everything this cell is a part of
-        inner_row, inner_col = self.find_inner_position(num - 1)
-        
-        if inner_row == inner_col:
-            ring_check["diagonal"][0] += 1 * mult
-        if inner_row + inner_col == 6:
-            ring_check["anti"][0] += 1 * mult
-        ring_check[str("col_%d" % (inner_col + 1))][0] += 1 * mult
-        ring_check[str("row_%d" % (inner_row + 1))][0] += 1 * mult 
-        
-        #Edit outer count by 1 on the cell it would get placed on
-        if row == col:
-            ring_check["diagonal"][1] += 1 * mult
-        elif row + col == 6:
-            ring_check["anti"][1] += 1 * mult
-        elif row == 0 or row == 6:
-            ring_check[str("col_%d" % (col))][1] += 1 * mult
-        elif col == 0 or col == 6:
-            ring_check[str("row_%d" % (row))][1] += 1 * mult
+        g = self.geometry
+        step = 1 if add else -1
+        
+        #num leaves every line through its inner cell, and the ring cell it goes on is no longer empty
+        for line in g.inner_lines[g.masks.cell_index(*self.find_inner_position(num - 1))]:
+            ring_check[line] += step
+        ring_check[g.line_count + g.ring_line[(row, col)]] += step
         
         return ring_check
     
     #With 1 at row3 col0, it took around 28 seconds. The rest is near instant
-    def backtrack_complete(self, level_class, ring_check):
-        if self.current_num >= 26:
-            return True
+    #All searches run on search_engine, so they can be stopped by the budget between any two nodes
+    def backtrack_complete(self, level_class, ring_check, order=move_ordering.row_major, budget=None, stats=None):
+        if stats is None:
+            stats = SolverStats()
+        if self.current_num > self.last_number():
+            return search_engine.SearchResult(search_engine.SOLVED, stats=stats)
         
-        current = self.current_num
-        valid_cells = level_class.get_valid_cells()
-        #print(current)
-        
-        for i in range(len(valid_cells)):
-            cell = valid_cells[i]
-            row, col = cell
+        if self.level == 1 and self.use_bitboard:
+            return self._bitboard_complete(level_class, order, budget, stats)
+        if self.level == 3 and self.use_bitboard:
+            return self._level3_complete(level_class, order, budget, stats)
+        problem = LogicSearch(self, level_class, ring_check, order, stats)
+        result = search_engine.run(problem, budget, stats)
+        if result:
+            #score and history are only built once, by placing the solution for real
+            problem.rewind()
+            for row, col in result.path:
+                level_class.place_number(row, col)
+        return result
 
-            if self.level == 2:
-               self.edit_ring_check(current, row, col, ring_check, False)
-               
-               if self.is_deadend(row, col, ring_check):
-                   #print(current, ring_check)
-                   #print(current, "DEAD END 1")
-                   self.edit_ring_check(current, row, col, ring_check, True)
-                   continue
-            
-            #if self.level == 3:
-            #    print("%d was placed in (%d,%d)" % (current, row, col))
+    #Level 1 search that only touches the occupancy mask
+    #The path is replayed through place_number once it is found, so score and history are only built once
+    def _bitboard_complete(self, level_class, order=move_ordering.row_major, budget=None, stats=None):
+        result = search_engine.run(Level1Search(self, order, stats), budget, stats)
+        if result:
+            self._replay_indexes(level_class, result.path)
+        return result
+    
+    #Branch and bound for the best level 1 finish (see Level1MaxScore), the best path found is placed
+    def _optimize_complete(self, level_class, order=move_ordering.diagonal_first, budget=None, stats=None):
+        if stats is None:
+            stats = SolverStats()
+        start_score = self.score
+        if self.current_num > self.max_number:
+            return search_engine.OptimizeResult(search_engine.SOLVED, stats=stats, score=start_score,
+                                                upper_bound=start_score, proven=True)
+        
+        problem = Level1MaxScore(self, order, stats)
+        searched = search_engine.run(problem, budget, stats)
+        proven = searched.impossible   #the whole tree was walked
+        upper_bound = start_score + (problem.best_gain if proven else problem.root_bound)
+        if problem.best_path is None:
+            status = search_engine.IMPOSSIBLE if proven else searched.status
+            return search_engine.OptimizeResult(status, [], searched.nodes, searched.elapsed, stats,
+                                                upper_bound=None if proven else upper_bound, proven=proven)
+        
+        self._replay_indexes(level_class, problem.best_path)
+        return search_engine.OptimizeResult(search_engine.SOLVED, problem.best_path, searched.nodes, searched.elapsed,
+                                            stats, self.score, upper_bound, proven)
+    
+    #Level 3 search on bitmasks, memoised on (occupied, last) for the length of one run
+    #Like level 1, the path is only replayed through place_number once it is found
+    def _level3_complete(self, level_class, order=move_ordering.row_major, budget=None, stats=None):
+        table = self.transposition_table
+        if table is not None and table.is_dead_end(self.zobrist_key):
+            stats.cache_hit("dead_end")
+            return search_engine.SearchResult(search_engine.IMPOSSIBLE, stats=stats)
+        
+        masks = self.geometry.masks
+        allowed = level3_solver.allowed_masks(self._ring_positions(), self.geometry.ring_cell_masks, self.board_size)
+        problem = level3_solver.Level3Search(self.occupied, masks.cell_index(*self.last_pos), self.current_num,
+                                             allowed, order, stats, masks, self._level1_prune)
+        result = search_engine.run(problem, budget, stats)
+        if result:
+            self._replay_indexes(level_class, result.path)
+        elif result.impossible and table is not None:
+            table.store_dead_end(self.zobrist_key)
+        return result
+    
+    def _replay_indexes(self, level_class, path):   #place a path of bit indexes found on the bitboard
+        for index in path:
+            row, col = self.geometry.masks.index_to_cell(index)
             level_class.place_number(row, col)
-            is_viable = True
-            
-            if self.level == 2:
-                for i in range(current + 1, 26):
-                    if len(level_class.get_valid_cells(i)) == 0:
-                        is_viable = False
-                        #print(current, "DEAD END 2")
-                        break
-            
-            if is_viable and self.backtrack_complete(level_class, ring_check):
-                return True    
+
+    #The rest of a level 1 game is a Hamiltonian king path from last over the empty cells
+    #Returns the name of the first rule that proves no such path exists, or None
+    def _level1_prune(self, empty, last):
+        masks = self.geometry.masks
+        head = 1 << last
+        for rule in self.level1_prune_rules:
+            if rule == "dead_ends":
+                #A cell with a single way in can only be where the path ends, and there is only one end
+                dead_ends = masks.single_neighbour_cells(empty | head) & empty
+                if dead_ends & (dead_ends - 1):
+                    return rule
             
-            if self.level == 2:
-                self.edit_ring_check(current, row, col, ring_check, True)
+            elif rule == "disconnected":
+                #The path never crosses a filled cell, so it cannot visit two separate regions
+                lowest = empty & -empty
+                if masks.flood_fill(lowest, empty) != empty:
+                    return rule
             
-            #print("%d: Found nothing in (%d, %d)" % (current, row, col))
-            self.auto_undo()
+            elif rule == "unreachable":
+                #Every empty cell has to be reachable from the last placed number
+                if masks.flood_fill(masks.neighbours[last] & empty, empty) != empty:
+                    return rule
+        
+        return None
 
-        #If this leads to a dead end, don't check the ith cell in current number anymore
-        return False
+    #A level 2 number only needs an empty ring cell lined up with its inner position, and numbers
+    #don't chain off each other, so finishing the ring is a bipartite matching of numbers to ring cells
+    def matching_complete(self, level_class):
+        candidates = {num: level_class.get_valid_cells(num) for num in range(self.current_num, self.last_number() + 1)}
+        assignment = hopcroft_karp(candidates)
+        if len(assignment) < len(candidates):
+            return search_engine.SearchResult(search_engine.IMPOSSIBLE)
+        
+        #Place in order so the ring, score and history end up exactly as if each number was clicked
+        path = [assignment[num] for num in sorted(assignment)]
+        for ring_row, ring_col in path:
+            level_class.place_number(ring_row, ring_col)
+        return search_engine.SearchResult(search_engine.SOLVED, path)
 
     def lv3_retread_complete(self, level_class):
         for action in self.move_history.arr:
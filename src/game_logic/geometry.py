@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+from . import bitboard
+from . import level3_solver
+from . import lines
+from . import symmetry
+from . import zobrist
+
+#Every table the game and its solvers need for one board size, so a GameState only has to carry one object
+#An N x N board has numbers 1..N*N and a ring of (N+2) x (N+2) cells round it, each ring cell the end of
+#one of the 2N+2 lines. Tables are built the first time a size is asked for and shared after that
+#
+#The ring has 4N+4 cells, so level 2 places numbers 2..4N+5 and level 3 only ties those to their ring
+#cell's line, the numbers after them just need a king step. On the 5x5 board that is every number, as
+#before. Below 5x5 the ring would have more cells than there are numbers, so that is the smallest board
+
+MIN_BOARD_SIZE = 5
+
+
+class Geometry:
+    def __init__(self, size=bitboard.BOARD_SIZE):
+        if size < MIN_BOARD_SIZE:
+            raise ValueError("board size must be at least %d, not %d" % (MIN_BOARD_SIZE, size))
+        self.size = size
+        self.ring_size = size + 2
+        self.max_number = size * size
+        self.masks = bitboard.masks_for(size)               #neighbours, full board, flood fill and friends
+        self.zobrist = zobrist.keys_for(size)
+        self.line_count = lines.line_count(size)
+        self.inner_lines = lines.build_inner_lines(size)    #lines through every inner cell, by cell index
+        self.ring_line = lines.build_ring_lines(size)       #ring cell -> the line it ends
+        self.line_cells = lines.build_line_cells(size)
+        self.ring_cells = symmetry.ring_cells(self.ring_size)
+        self.last_ring_number = len(self.ring_cells) + 1    #last number level 2 places
+        self.ring_cell_masks = level3_solver.build_ring_cell_masks(size)
+
+    def __reduce__(self):   #pickled as its size, so a copy sent to a worker process shares that process's tables
+        return (for_size, (self.size,))
+
+    def is_inner_cell(self, row, col):
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def is_ring_corner(self, row, col):
+        last = self.ring_size - 1
+        return row in (0, last) and col in (0, last)
+
+
+_GEOMETRIES = {}
+
+
+def for_size(size):
+    if size not in _GEOMETRIES:
+        _GEOMETRIES[size] = Geometry(size)
+    return _GEOMETRIES[size]
+
+
+DEFAULT = for_size(bitboard.BOARD_SIZE)
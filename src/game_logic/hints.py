@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+import math
+import random
+import time
+from .background import LEVEL_LOGIC
+from .simulation import BOTS, SolverBot
+
+#Monte Carlo tree search hints: a ranking of the next cells for the current number, within a time budget
+#too short for autocomplete to prove anything
+#Every iteration walks the tree by UCT from the current position, adds one new move and finishes the level
+#with a rollout bot from simulation.py, all through the level logic's make_move/unmake_move on a copy of the
+#game. Each node keeps how many of the games through it finished the level and the scores they ended on
+#
+#The tree outlives a hint: the next one walks down the moves placed since, checks it got to the same
+#position (zobrist keys) and carries on from there, so a player asking after every move keeps what was learned
+#
+#Rewards are in [0, 1]. A game that gets stuck earns up to 0.5 for how far it got, a finished one at
+#least 0.5 and the rest by its level 1 score (the other levels score the same on every finish)
+
+EXPLORATION = 1.0   #UCT exploration constant, rewards are in [0, 1]
+
+
+class HintNode:
+    def __init__(self, move=None, parent=None):
+        self.move = move            #cell that got here from parent
+        self.parent = parent
+        self.children = []
+        self.untried = None         #valid cells not expanded yet, None until the node is first reached
+        self.keys = None            #zobrist keys of the position, checked when the tree is reused
+        self.visits = 0
+        self.completions = 0        #games through here that finished the level
+        self.score_total = 0        #sum of the scores the games ended the level on, stuck ones too
+        self.reward_total = 0.0
+
+    def uct(self, log_visits, exploration):
+        return self.reward_total / self.visits + exploration * math.sqrt(log_visits / self.visits)
+
+    def child(self, move):
+        return next((child for child in self.children if child.move == move), None)
+
+
+class CellHint:   #what the search thinks of one next cell
+    def __init__(self, cell, visits, completions, score_total):
+        self.cell = cell            #(row, col), ring grid coordinates on level 2
+        self.visits = visits
+        self.completion_rate = completions / visits if visits else 0.0   #estimated chance of finishing the level
+        self.expected_score = score_total / visits if visits else None   #mean score at the end of the level
+
+    def to_dict(self):
+        return {
+            "cell": list(self.cell),
+            "visits": self.visits,
+            "completion_rate": self.completion_rate,
+            "expected_score": self.expected_score,
+        }
+
+    def __repr__(self):
+        return "CellHint(cell=%s, visits=%d, completion_rate=%.3f)" % (self.cell, self.visits, self.completion_rate)
+
+
+class HintResult:
+    def __init__(self, level, cells, iterations, reused, elapsed):
+        self.level = level
+        self.cells = cells              #CellHints, best first
+        self.iterations = iterations    #rollouts this call
+        self.reused = reused            #rollouts already in the tree from earlier calls
+        self.elapsed = elapsed
+
+    @property
+    def best(self):
+        return self.cells[0] if self.cells else None
+
+    def heat(self):   #cell -> visits relative to the best cell's, for drawing the ranking as a heatmap
+        if not self.cells:
+            return {}
+        top = self.cells[0].visits
+        return {hint.cell: hint.visits / top for hint in self.cells}
+
+    def to_dict(self):
+        return {
+            "level": self.level,
+            "iterations": self.iterations,
+            "reused": self.reused,
+            "elapsed": self.elapsed,
+            "cells": [hint.to_dict() for hint in self.cells],
+        }
+
+    def __len__(self):
+        return len(self.cells)
+
+
+class HintEngine:
+    def __init__(self, rollout="warnsdorff", exploration=EXPLORATION, seed=None):
+        if rollout not in BOTS or BOTS[rollout] is SolverBot:
+            raise ValueError("unknown rollout bot: %s" % rollout)
+        self.bot = BOTS[rollout]()
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.root = None
+        self.root_level = None
+        self.root_num = None
+
+    def reset(self):   #forget the tree
+        self.root = None
+
+    #Ranked next cells for game_state's current number, searched for max_seconds (None is no limit) or
+    #max_iterations rollouts (None is no limit), whichever runs out first. At least one rollout is made
+    def hint(self, game_state, max_seconds=0.05, max_iterations=None):
+        if max_seconds is None and max_iterations is None:
+            raise ValueError("hint needs max_seconds or max_iterations")
+        started = time.perf_counter()
+        state = game_state.copy()
+        logic = LEVEL_LOGIC[state.level](state)
+        root = self._find_root(state)
+        reused = root.visits
+
+        iterations = 0
+        deadline = None if max_seconds is None else started + max_seconds
+        while not game_state.win and state.current_num <= state.last_number():
+            self._iterate(root, state, logic)
+            iterations += 1
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        #most visited first, the usual MCTS pick since it is the estimate backed by the most games
+        ranked = sorted(root.children, key=lambda child: (-child.visits, -child.reward_total))
+        cells = [CellHint(child.move, child.visits, child.completions, child.score_total) for child in ranked]
+        return HintResult(state.level, cells, iterations, reused, time.perf_counter() - started)
+
+    def _find_root(self, state):   #the old tree's node for state if the game only moved on since, a new root otherwise
+        node = None
+        if self.root is not None and self.root_level == state.level and state.current_num >= self.root_num:
+            node = self.root
+            moves = state._solution_moves(self.root_num)[:state.current_num - self.root_num]
+            for move in moves:
+                node = node.child(move)
+                if node is None:
+                    break
+            if node is not None and node.keys != tuple(state.zobrist_keys):
+                node = None
+
+        if node is None:
+            node = HintNode()
+            node.keys = tuple(state.zobrist_keys)
+        node.parent = None   #lets the rest of the old tree go
+        self.root = node
+        self.root_level = state.level
+        self.root_num = state.current_num
+        return node
+
+    def _iterate(self, root, state, logic):   #one selection, expansion, rollout and backup
+        made = []   #(cell, what unmake_move needs)
+        score = state.score
+        node = root
+        while True:
+            if node.untried is None:
+                node.untried = logic.get_valid_cells() if state.current_num <= state.last_number() else []
+                self.rng.shuffle(node.untried)
+            if node.untried:
+                cell = node.untried.pop()
+                score += logic.score_gain(*cell)
+                made.append((cell, logic.make_move(*cell)))
+                child = HintNode(cell, node)
+                child.keys = tuple(state.zobrist_keys)
+                node.children.append(child)
+                node = child
+                break
+            if not node.children:
+                break   #finished or stuck
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.uct(log_visits, self.exploration))
+            score += logic.score_gain(*node.move)
+            made.append((node.move, logic.make_move(*node.move)))
+
+        score = self._rollout(state, logic, made, score)
+        completed = state.current_num > state.last_number()
+        reward = self._reward(state, completed, score)
+        for cell, previous in reversed(made):
+            logic.unmake_move(cell[0], cell[1], previous)
+        while node is not None:
+            node.visits += 1
+            node.reward_total += reward
+            node.completions += completed
+            node.score_total += score
+            node = node.parent
+
+    def _rollout(self, state, logic, made, score):   #play the level out with the bot, returns the final score
+        while state.current_num <= state.last_number():
+            cells = logic.get_valid_cells()
+            if not cells:
+                break
+            cell = self.bot.choose(state, logic, cells, self.rng)
+            score += logic.score_gain(*cell)
+            made.append((cell, logic.make_move(*cell)))
+        return score
+
+    def _reward(self, state, completed, score):
+        if not completed:
+            return 0.5 * (state.current_num - 2) / max(1, state.last_number() - 1)
+        if state.level != 1:
+            return 1.0
+        return 0.5 + 0.5 * score / max(1, state.max_number - 1)
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 
+from . import bitboard
+
 
 class Level1Logic:
     def __init__(self, game_state):
@@ -7,7 +9,8 @@ class Level1Logic:
         
     def is_valid_move(self, row, col):   #check if a move is valid
         #check bounds
-        if row < 0 or row > 4 or col < 0 or col > 4:
+        size = self.state.board_size
+        if row < 0 or row >= size or col < 0 or col >= size:
             return (False, "out_of_bounds")
         #check if cell is empty
         if self.state.board[row][col] != 0:
@@ -31,10 +34,20 @@ class Level1Logic:
         col_diff = abs(col - last_col)
         return row_diff == 1 and col_diff == 1
     
+    def get_valid_mask(self):   #bitboard of valid cells: neighbours of the last cell AND empty cells
+        masks = self.state.geometry.masks
+        if self.state.current_num == 1 or self.state.last_pos is None:
+            return masks.full & ~self.state.occupied
+        last = masks.cell_index(*self.state.last_pos)
+        return masks.neighbours[last] & ~self.state.occupied
+    
     def get_valid_cells(self):   #get list of all valid cells for current move
+        if self.state.use_bitboard:
+            return self.state.geometry.masks.mask_to_cells(self.get_valid_mask())
+        
         valid = []
-        for row in range(5):
-            for col in range(5):
+        for row in range(self.state.board_size):
+            for col in range(self.state.board_size):
                 is_valid, _ = self.is_valid_move(row, col)
                 if is_valid:
                     valid.append((row, col))
@@ -50,19 +63,33 @@ class Level1Logic:
         if scored:
             self.state.score += 1
         
-        #place the number
-        self.state.board[row][col] = self.state.current_num
-        
-        #update state
-        self.state.last_pos = (row, col)
-        self.state.current_num += 1
+        #place the number and update state
+        self.make_move(row, col)
         self.state.move_history.record_action_lv1(row, col, scored)
         
         #check win condition
-        if self.state.current_num > 25:
+        if self.state.current_num > self.state.max_number:
             self.state.win = True
             
         return (True, None)
     
+    #Search-only placement: no validation, score or history, the move generator guarantees the move
+    #is valid and the search rebuilds score and history once it has a solution
+    #Returns what unmake_move needs to take the move back
+    def make_move(self, row, col):
+        return self.state.place_inner(row, col)
+    
+    def unmake_move(self, row, col, previous):
+        self.state.remove_inner(row, col, previous)
+    
+    def count_onward_moves(self, row, col):   #moves the next number would have if the current one went to (row, col)
+        masks = self.state.geometry.masks
+        return bitboard.popcount(masks.neighbours[masks.cell_index(row, col)] & ~self.state.occupied)
+    
+    def score_gain(self, row, col):   #points for placing the current number at (row, col)
+        return 1 if self.is_diagonal_move(row, col) else 0
+    
     def has_valid_moves(self):   #check if there are any valid moves left
+        if self.state.use_bitboard:
+            return self.get_valid_mask() != 0
         return len(self.get_valid_cells()) > 0
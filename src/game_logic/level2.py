@@ -1,70 +1,66 @@
 #!/usr/bin/env python
 
+from . import zobrist
+from .matching import hopcroft_karp, augment
+
 
 class Level2Logic:
     def __init__(self, game_state):
         self.state = game_state   #reference to shared game state
         
-    def _get_inner_board_position(self, num):   #find position of number on inner 5x5 board
+        #Maximum matching of the numbers still to place to empty ring cells, repaired after every move
+        #It is only trusted while _matching_keys is the state's current zobrist_keys list
+        self.matched_cell = {}          #number -> ring cell
+        self.cell_owner = {}            #ring cell -> number
+        self._matching_keys = None
+        self._breaking_cells = None     #cached result of get_breaking_cells
+        
+        #Candidate counts, kept up to date by make_move/unmake_move in O(cells' degree)
+        #option_count[num] is how many empty ring cells num could still go on, wanting[cell] the numbers
+        #that could go on cell and starved how many numbers still to place have no cell left at all
+        #Like the matching they are only trusted while _counts_keys is the state's current zobrist_keys list
+        self.option_count = [0] * (self.state.max_number + 1)
+        self.wanting = {}
+        self.starved = 0
+        self._counts_keys = None
+        self.state.ring_listener = self   #replaces any older Level2Logic, which just rebuilds its caches if used again
+        
+    def _get_inner_board_position(self, num):   #find position of number on the inner board
         return self.state.find_inner_position(num - 1) #Account for the array starting at 0 and the lack of the first value's position
     
-    def _inner_to_outer_coords(self, inner_row, inner_col):   #convert inner board coords to outer 7x7 coords
-        #inner board is offset by 1 in the 7x7 grid
+    def _inner_to_outer_coords(self, inner_row, inner_col):   #convert inner board coords to outer ring grid coords
+        #inner board is offset by 1 in the ring grid
         return (inner_row + 1, inner_col + 1)
     
     def _is_on_main_diagonal(self, row, col):   #check if position is on main diagonal (top-left to bottom-right)
         return row == col
     
     def _is_on_anti_diagonal(self, row, col):   #check if position is on anti-diagonal (top-right to bottom-left)
-        return row + col == 4
+        return row + col == self.state.board_size - 1
     
-    def get_valid_cells(self, num = -1):   #get valid outer ring cells for placing a number
-        if num == -1: #Allow it to have a specific num in case I want to check non-chronologically
-            num = self.state.current_num
+    def _candidate_cells(self, num):   #every ring cell lined up with num, whether it's empty or not
         #find where this number is on the inner board
         inner_pos = self._get_inner_board_position(num)
         if inner_pos is None:
             return []
         
         inner_row, inner_col = inner_pos
-        valid_cells = []
-        
-        #row ends - can place at left or right edge of this row
-        #in 7x7 coords: row is inner_row + 1, cols are 0 and 6
-        left_cell = (inner_row + 1, 0)
-        right_cell = (inner_row + 1, 6)
-        
-        if self._is_ring_cell_empty(left_cell):
-            valid_cells.append(left_cell)
-        if self._is_ring_cell_empty(right_cell):
-            valid_cells.append(right_cell)
-            
-        #column ends - can place at top or bottom edge of this column
-        #in 7x7 coords: col is inner_col + 1, rows are 0 and 6
-        top_cell = (0, inner_col + 1)
-        bottom_cell = (6, inner_col + 1)
+        last = self.state.board_size + 1   #last row and column of the ring grid
+        #row ends - in ring coords: row is inner_row + 1, cols are 0 and last
+        #column ends - in ring coords: col is inner_col + 1, rows are 0 and last
+        cells = [(inner_row + 1, 0), (inner_row + 1, last), (0, inner_col + 1), (last, inner_col + 1)]
         
-        if self._is_ring_cell_empty(top_cell):
-            valid_cells.append(top_cell)
-        if self._is_ring_cell_empty(bottom_cell):
-            valid_cells.append(bottom_cell)
-            
         #diagonal corners (if on main or anti diagonal)
         if self._is_on_main_diagonal(inner_row, inner_col):
-            #main diagonal corners: (0,0) and (6,6)
-            if self._is_ring_cell_empty((0, 0)):
-                valid_cells.append((0, 0))
-            if self._is_ring_cell_empty((6, 6)):
-                valid_cells.append((6, 6))
-                
+            cells += [(0, 0), (last, last)]
         if self._is_on_anti_diagonal(inner_row, inner_col):
-            #anti-diagonal corners: (0,6) and (6,0)
-            if self._is_ring_cell_empty((0, 6)):
-                valid_cells.append((0, 6))
-            if self._is_ring_cell_empty((6, 0)):
-                valid_cells.append((6, 0))
-                
-        return valid_cells
+            cells += [(0, last), (last, 0)]
+        return cells
+    
+    def get_valid_cells(self, num = -1):   #get valid outer ring cells for placing a number
+        if num == -1: #Allow it to have a specific num in case I want to check non-chronologically
+            num = self.state.current_num
+        return [cell for cell in self._candidate_cells(num) if self._is_ring_cell_empty(cell)]
     
     def _is_ring_cell_empty(self, pos):   #check if a ring cell is empty
         return pos in self.state.outer_ring and self.state.outer_ring[pos] == 0
@@ -93,26 +89,153 @@ class Level2Logic:
             return (False, error)
         
         pos = (ring_row, ring_col)
-        
-        #place the number in the ring
-        self.state.outer_ring[pos] = self.state.current_num
+        matching_in_sync = self._matching_keys is self.state.zobrist_keys
         
         #add score for every successful placement, lv2 rule
         self.state.score += 1
         
-        #update state
-        self.state.last_pos = pos
+        #place the number in the ring and update state
         self.state.move_history.record_outer_action(self.state.current_num - 1, pos)
-        self.state.current_num += 1
+        self.make_move(ring_row, ring_col)
+        if matching_in_sync:
+            self._ring_cell_filled(self.state.current_num - 1, pos)
         
-        #check win condition (all 24 cells filled = numbers 2-25 placed)
-        if self.state.current_num > 25:
+        #check win condition (every ring cell filled = numbers 2 to the last ring number placed)
+        if self.state.current_num > self.state.last_number():
             self.state.win = True
             
         return (True, None)
     
+    #Search-only placement: no validation, score or history (see Level1Logic.make_move)
+    #The matching is left alone and rebuilt the next time it is asked for, the candidate counts follow along
+    def make_move(self, ring_row, ring_col):
+        state = self.state
+        previous = state.last_pos
+        pos = (ring_row, ring_col)
+        state.outer_ring[pos] = state.current_num
+        counts_in_sync = self._counts_keys is state.zobrist_keys
+        state.zobrist_keys = zobrist.combine(state.zobrist_keys, state.geometry.zobrist.ring_deltas[pos])
+        state.last_pos = pos
+        state.current_num += 1
+        if counts_in_sync:
+            self._cell_taken(state.current_num - 1, pos)
+        return previous
+    
+    def unmake_move(self, ring_row, ring_col, previous):
+        state = self.state
+        pos = (ring_row, ring_col)
+        state.outer_ring[pos] = 0
+        counts_in_sync = self._counts_keys is state.zobrist_keys
+        state.zobrist_keys = zobrist.combine(state.zobrist_keys, state.geometry.zobrist.ring_deltas[pos])
+        state.last_pos = previous
+        state.current_num -= 1
+        if counts_in_sync:
+            self._cell_freed(state.current_num, pos)
+    
+    def score_gain(self, ring_row, ring_col):   #every placement scores in level 2
+        return 1
+    
     def has_valid_moves(self):   #check if there are any valid moves for current number
         return len(self.get_valid_cells()) > 0
     
+    def _remaining_numbers(self):
+        return range(self.state.current_num, self.state.last_number() + 1)
+    
+    def _rebuild_matching(self):
+        candidates = {num: self.get_valid_cells(num) for num in self._remaining_numbers()}
+        self.matched_cell = hopcroft_karp(candidates)
+        self.cell_owner = {cell: num for num, cell in self.matched_cell.items()}
+        self._matching_keys = self.state.zobrist_keys
+        self._breaking_cells = None
+    
+    def _repair_matching(self):
+        #Only numbers without a cell need an augmenting path, which is just the one the last move freed
+        #while the ring is still completable
+        visited = set()
+        for num in self._remaining_numbers():
+            if num not in self.matched_cell:
+                if augment(num, self.get_valid_cells, self.matched_cell, self.cell_owner, visited):
+                    visited = set()
+        self._matching_keys = self.state.zobrist_keys
+        self._breaking_cells = None
+    
+    def _ring_cell_filled(self, num, pos):   #num was placed on pos, neither is part of the matching any more
+        old_cell = self.matched_cell.pop(num, None)
+        if old_cell is not None:
+            del self.cell_owner[old_cell]
+        owner = self.cell_owner.pop(pos, None)
+        if owner is not None:
+            del self.matched_cell[owner]
+        self._repair_matching()
+    
+    def ring_cell_cleared(self, num, pos, previous_keys):   #called by GameState.undo when num is taken off pos
+        if self._counts_keys is previous_keys:
+            self._cell_freed(num, pos)
+        if self._matching_keys is previous_keys:
+            self._repair_matching()
+    
+    def _sync_matching(self):
+        if self._matching_keys is not self.state.zobrist_keys:
+            self._rebuild_matching()
+    
+    def _rebuild_counts(self):
+        self.wanting = {cell: [] for cell in self.state.outer_ring}
+        self.option_count = [0] * (self.state.max_number + 1)
+        for num in range(2, self.state.geometry.last_ring_number + 1):
+            for cell in self._candidate_cells(num):
+                self.wanting[cell].append(num)
+                if self._is_ring_cell_empty(cell):
+                    self.option_count[num] += 1
+        self.starved = sum(1 for num in self._remaining_numbers() if self.option_count[num] == 0)
+        self._counts_keys = self.state.zobrist_keys
+    
+    def _cell_taken(self, num, pos):   #num went on pos, every number that wanted pos loses an option
+        for other in self.wanting[pos]:
+            self.option_count[other] -= 1
+            if self.option_count[other] == 0 and other > num:
+                self.starved += 1
+        self._counts_keys = self.state.zobrist_keys
+    
+    def _cell_freed(self, num, pos):   #num came off pos, the reverse of _cell_taken
+        for other in self.wanting[pos]:
+            if self.option_count[other] == 0 and other > num:
+                self.starved -= 1
+            self.option_count[other] += 1
+        self._counts_keys = self.state.zobrist_keys
+    
+    def has_starved_number(self):   #does some number still to place have no empty cell left
+        if self._counts_keys is not self.state.zobrist_keys:
+            self._rebuild_counts()
+        return self.starved > 0
+    
+    def is_completable(self):   #can every number still left find a ring cell
+        self._sync_matching()
+        return len(self.matched_cell) == len(self._remaining_numbers())
+    
+    def get_breaking_cells(self):   #valid cells for the current number that would leave the ring impossible to finish
+        self._sync_matching()
+        if self._breaking_cells is None:
+            self._breaking_cells = []
+            if self.state.current_num <= self.state.last_number() and self.is_completable():
+                num = self.state.current_num
+                for cell in self.get_valid_cells(num):
+                    if not self._can_finish_with(num, cell):
+                        self._breaking_cells.append(cell)
+        return self._breaking_cells
+    
+    def _can_finish_with(self, num, cell):   #is there still a full matching once num takes cell
+        owner = self.cell_owner.get(cell)
+        if owner is None or owner == num:
+            return True
+        
+        #num gives up its own cell and owner loses cell, so owner needs a new augmenting path
+        matched_cell = dict(self.matched_cell)
+        cell_owner = dict(self.cell_owner)
+        del cell_owner[matched_cell.pop(num)]
+        del matched_cell[owner]
+        del cell_owner[cell]
+        neighbours = lambda other: [option for option in self.get_valid_cells(other) if option != cell]
+        return augment(owner, neighbours, matched_cell, cell_owner, set())
+    
     def get_ring_cell_positions(self):   #get all ring cell positions for rendering
         return list(self.state.outer_ring.keys())
@@ -1,97 +1,56 @@
 #!/usr/bin/env python
 
+from . import bitboard
+
 class Level3Logic:
     def __init__(self, game_state):
         self.state = game_state
     
-    def _outer_to_inner_coords(self, outer_row, outer_col):   #convert outer board coords back to inner 5x5
+    def _outer_to_inner_coords(self, outer_row, outer_col):   #convert outer board coords back to the inner board
         return (outer_row - 1, outer_col - 1)
     
-    def _is_outer_diagonal(self, outer_row, outer_col):
-        return outer_row == outer_col
-    
-    def _is_outer_anti_diagonal(self, outer_row, outer_col):
-        return outer_row + outer_col == 6
-    
-    def _is_on_diagonal(self, row, col, outer_row, outer_col):   #check if position is on main diagonal (top-left to bottom-right)
-        return row == col and self._is_outer_diagonal(outer_row, outer_col)
-    
-    def _is_on_anti_diagonal(self, row, col, outer_row, outer_col):   #check if position is on anti-diagonal (top-right to bottom-left)
-        return row + col == 4 and self._is_outer_anti_diagonal(outer_row, outer_col)
-    
-    def _is_orthoginal_cell(self, rowcol): #Check if a cell is in the same col or row as the 5x5 grid
-        return rowcol > 0 and rowcol < 6
-    
     def _is_valid_move(self, row, col):
         #check bounds
-        if row < 0 or row > 4 or col < 0 or col > 4:
+        size = self.state.board_size
+        if row < 0 or row >= size or col < 0 or col >= size:
             return (False, "out_of_bounds")
         #check if cell is empty
-        if self.state.board[row][col] != 0:
+        bit = 1 << self.state.geometry.masks.cell_index(row, col)
+        if self.state.occupied & bit:
             return (False, "cell_occupied")
         #first move can be anywhere (but in GUI, 1 is pre-placed)
         if self.state.current_num == 1:
             return (True, None)
 
         #check if one step away from last position
-        last_row, last_col = self.state.last_pos
-        row_diff = abs(row - last_row)
-        col_diff = abs(col - last_col)
-        if not(row_diff <= 1 and col_diff <= 1 and (row_diff + col_diff) > 0):
+        if not self._neighbour_mask() & bit:
             return (False, "not_adjacent") 
         
-        #Account for array starting at 0
-        outer_y, outer_x = self.state.find_outer_position(self.state.current_num - 1)
-        
-        #Check if cell aligns with ring row, col, diagonal or antidiagonal
-        ring_aligned = (
-                        col == outer_x - 1 or
-                        row == outer_y - 1 or
-                        self._is_on_diagonal(row, col, outer_x, outer_y)
-                        or self._is_on_anti_diagonal(row, col, outer_x, outer_y))
-        
-        if not ring_aligned:
+        if not self._aligned_mask(self.state.current_num) & bit:
             return (False, "outside_ring_position")
         
         return (True, None)
+    
+    def _aligned_mask(self, num):   #inner cells lined up with num's ring cell
+        if num > self.state.geometry.last_ring_number:   #past the ring, so anywhere will do
+            return self.state.geometry.masks.full
+        #Account for array starting at 0
+        return self.state.geometry.ring_cell_masks[self.state.find_outer_position(num - 1)]
+    
+    def _neighbour_mask(self):   #cells one king step from the last number
+        masks = self.state.geometry.masks
+        return masks.neighbours[masks.cell_index(*self.state.last_pos)]
+    
+    def _is_ring_aligned(self, row, col, num):
+        #Check if cell aligns with ring row, col, diagonal or antidiagonal
+        return self._aligned_mask(num) >> self.state.geometry.masks.cell_index(row, col) & 1 == 1
         
     def get_valid_cells(self):   #get list of all valid cells for current move
-        valid = []
-        outer_y, outer_x = self.state.find_outer_position(self.state.current_num - 1)
-        
-        #Check which row/col can be skipped over with current outer ring position
-        if self._is_orthoginal_cell(outer_x): #Check if outer cel is vertical
-            current_col = outer_x - 1 #Offset by since ring is 7x7
-            for row in range(5):
-                #print(current_col, row, self._is_valid_move(row, current_col))
-                is_valid, _ = self._is_valid_move(row, current_col)
-                if is_valid:
-                    valid.append((row, current_col))
-        
-        elif self._is_orthoginal_cell(outer_y): #Check if outer cell is horizontal
-            current_row = outer_y - 1 #Offset by since ring is 7x7
-            for col in range(5):
-                #print(col, current_row, self._is_valid_move(current_row, col))
-                is_valid, _ = self._is_valid_move(current_row, col)
-                if is_valid:
-                    valid.append((current_row, col))
-        
-        elif self._is_outer_diagonal(outer_x, outer_y):#Check if outer ring pos is diagonal
-            for offset in range(5):
-                #print(offset, offset, self._is_valid_move(offset, offset))
-                is_valid, _ = self._is_valid_move(offset, offset)
-                if is_valid:
-                    valid.append((offset, offset))
-                
-        elif self._is_outer_anti_diagonal(outer_x, outer_y): #Check if it's anti diagonal
-            for row in range(5):
-                current_col = 4 - row
-                #print(current_col, row, self._is_valid_move(row, current_col))
-                is_valid, _ = self._is_valid_move(row, current_col)
-                if is_valid:
-                    valid.append((row, current_col)) 
-        
-        return valid
+        masks = self.state.geometry.masks
+        empty = masks.full & ~self.state.occupied
+        if self.state.current_num == 1:
+            return masks.mask_to_cells(empty)
+        return masks.mask_to_cells(self._aligned_mask(self.state.current_num) & self._neighbour_mask() & empty)
     
     def is_diagonal_move(self, row, col):   #check if move is diagonal from last position
         if self.state.last_pos is None:
@@ -109,19 +68,35 @@ class Level3Logic:
         #add score for every successful placement, lv3 rule
         self.state.score += 1
         
-        #place the number
-        self.state.board[row][col] = self.state.current_num
-        
-        #update state
-        self.state.last_pos = (row, col)
+        #place the number and update state
         self.state.move_history.record_action_lv3(self.state.current_num - 2, (row, col))
-        self.state.current_num += 1
+        self.make_move(row, col)
         
         #check win condition
-        if self.state.current_num > 25:
+        if self.state.current_num > self.state.max_number:
             self.state.win = True
             
         return (True, None)
     
+    #Search-only placement: no validation, score or history (see Level1Logic.make_move)
+    def make_move(self, row, col):
+        return self.state.place_inner(row, col)
+    
+    def unmake_move(self, row, col, previous):
+        self.state.remove_inner(row, col, previous)
+    
+    def count_onward_moves(self, row, col):   #moves the next number would have if the current one went to (row, col)
+        next_num = self.state.current_num + 1
+        if next_num > self.state.max_number:
+            return 0
+        
+        masks = self.state.geometry.masks
+        index = masks.cell_index(row, col)
+        empty = masks.full & ~self.state.occupied & ~(1 << index)
+        return bitboard.popcount(self._aligned_mask(next_num) & masks.neighbours[index] & empty)
+    
+    def score_gain(self, row, col):   #every placement scores in level 3
+        return 1
+    
     def has_valid_moves(self):   #check if there are any valid moves left
         return len(self.get_valid_cells()) > 0
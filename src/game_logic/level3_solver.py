@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+from . import bitboard
+from . import lines
+from . import move_ordering
+from .solver_stats import SolverStats
+
+#Level 3 solver on bitmasks
+#Once the ring is complete each number can only go on the inner cells lined up with its ring cell,
+#so that is worked out once per number as a mask. The rest of the game then only depends on the
+#filled cells and the last cell, and a (occupied, last) pair that failed once fails every time
+
+BOARD_SIZE = bitboard.BOARD_SIZE
+MAX_NUMBER = BOARD_SIZE * BOARD_SIZE
+
+
+def row_mask(row, size=BOARD_SIZE):   #every cell in one row
+    return ((1 << size) - 1) << (row * size)
+
+
+def diagonal_mask(size=BOARD_SIZE):   #top left to bottom right
+    mask = 0
+    for offset in range(size):
+        mask |= 1 << bitboard.cell_index(offset, offset, size)
+    return mask
+
+
+def anti_diagonal_mask(size=BOARD_SIZE):   #top right to bottom left
+    mask = 0
+    for offset in range(size):
+        mask |= 1 << bitboard.cell_index(offset, size - 1 - offset, size)
+    return mask
+
+
+#Inner cells lined up with a ring cell, same rules as Level3Logic._is_ring_aligned
+def ring_cell_mask(ring_row, ring_col, size=BOARD_SIZE):
+    mask = 0
+    if 1 <= ring_col <= size:
+        mask |= bitboard.column_mask(ring_col - 1, size)
+    if 1 <= ring_row <= size:
+        mask |= row_mask(ring_row - 1, size)
+    if ring_row == ring_col:
+        mask |= diagonal_mask(size)
+    if ring_row + ring_col == size + 1:
+        mask |= anti_diagonal_mask(size)
+    return mask
+
+
+#Every ring cell's mask, worked out once per board size for Level3Logic and the solver alike
+#Adjacency comes from the board's neighbour masks, so a level 3 move is just
+#ring_cell_masks[ring cell] & empty & neighbours[last]
+def build_ring_cell_masks(size=BOARD_SIZE):
+    return {pos: ring_cell_mask(pos[0], pos[1], size) for pos in lines.build_ring_lines(size)}
+
+
+RING_CELL_MASKS = build_ring_cell_masks()
+
+
+#ring_positions[num] is the ring cell of num, index 0 and 1 are unused. Boards bigger than 5x5 have
+#more numbers than ring cells, and the numbers past the ring may go on any cell (see geometry.py)
+#The allowed list that comes back is indexed by number as well, up to the board's last number
+def allowed_masks(ring_positions, ring_cell_masks=RING_CELL_MASKS, size=BOARD_SIZE):
+    allowed = [bitboard.full_mask(size)] * (size * size + 1)
+    allowed[0] = allowed[1] = 0
+    for num in range(2, len(ring_positions)):
+        allowed[num] = ring_cell_masks[ring_positions[num]]
+    return allowed
+
+
+def is_viable(empty, num, allowed):   #every number still to place has at least one empty cell to go to
+    for later in range(num, len(allowed)):
+        if not allowed[later] & empty:
+            return False
+    return True
+
+
+#Search problem for search_engine.run, state is (occupied, last) with num the next number to place
+#Moves are cell indexes, and every (occupied, last) pair that failed is kept in dead
+#masks is the board's bitboard.BoardMasks, the last number to place follows from allowed
+#The rest of level 3 is a king path over the empty cells like level 1 is, so prune(empty, last) can be
+#GameState._level1_prune, it returns the name of a rule that proves there is no such path or None
+class Level3Search:
+    def __init__(self, occupied, last, num, allowed, order=move_ordering.row_major, stats=None, masks=bitboard.DEFAULT,
+                 prune=None):
+        self.masks = masks
+        self.prune = prune
+        self.max_number = len(allowed) - 1
+        self.occupied = occupied
+        self.last = last
+        self.num = num
+        self.allowed = allowed
+        self.order = order
+        self.stats = stats if stats is not None else SolverStats()
+        self.dead = set()
+        self.history = []   #(occupied, last) before every move made
+
+    def is_goal(self):
+        return self.num > self.max_number
+
+    def expand(self):
+        state = (self.occupied, self.last)
+        if state in self.dead:
+            self.stats.cache_hit("memo")
+            return None
+
+        masks = self.masks
+        empty = masks.full & ~self.occupied
+        if not is_viable(empty, self.num, self.allowed):
+            self.stats.prune("viability")
+            self.dead.add(state)
+            return None
+        if self.prune is not None:
+            rule = self.prune(empty, self.last)
+            if rule is not None:
+                self.stats.prune(rule)
+                self.dead.add(state)
+                return None
+
+        moves = masks.neighbours[self.last] & empty & self.allowed[self.num]
+        candidates = list(bitboard.iter_bits(moves))
+        if self.order is not move_ordering.row_major:
+            next_allowed = self.allowed[self.num + 1] if self.num < self.max_number else 0
+            candidates = self.order(candidates,
+                                    lambda index: bitboard.popcount(masks.neighbours[index] & empty & next_allowed),
+                                    lambda index: 1)
+        return candidates
+
+    def make(self, index):
+        self.history.append((self.occupied, self.last))
+        self.occupied |= 1 << index
+        self.last = index
+        self.num += 1
+
+    def unmake(self, index):
+        self.occupied, self.last = self.history.pop()
+        self.num -= 1
+
+    def mark_dead(self):
+        self.dead.add((self.occupied, self.last))
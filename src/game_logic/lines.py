@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+from . import bitboard
+
+#Line ids for the board's rows, columns and two diagonals, so per-line counts can live in a plain list
+#Rows are 0-4, columns 5-9, the main diagonal 10 and the anti-diagonal 11
+#Every ring cell is the end of exactly one line, every inner cell is on two to four of them
+
+BOARD_SIZE = bitboard.BOARD_SIZE
+
+
+def row_line(row, size=BOARD_SIZE):
+    return row
+
+
+def col_line(col, size=BOARD_SIZE):
+    return size + col
+
+
+def diagonal_line(size=BOARD_SIZE):
+    return 2 * size
+
+
+def anti_diagonal_line(size=BOARD_SIZE):
+    return 2 * size + 1
+
+
+def line_count(size=BOARD_SIZE):
+    return 2 * size + 2
+
+
+def build_inner_lines(size=BOARD_SIZE):   #lines through every inner cell, by cell index
+    inner_lines = []
+    for row in range(size):
+        for col in range(size):
+            cell_lines = [row_line(row, size), col_line(col, size)]
+            if row == col:
+                cell_lines.append(diagonal_line(size))
+            if row + col == size - 1:
+                cell_lines.append(anti_diagonal_line(size))
+            inner_lines.append(tuple(cell_lines))
+    return inner_lines
+
+
+def build_ring_lines(size=BOARD_SIZE):   #ring cell (in outer coords) -> the line it ends
+    ring_lines = {}
+    last = size + 1
+    for offset in range(1, last):
+        ring_lines[(offset, 0)] = ring_lines[(offset, last)] = row_line(offset - 1, size)
+        ring_lines[(0, offset)] = ring_lines[(last, offset)] = col_line(offset - 1, size)
+    ring_lines[(0, 0)] = ring_lines[(last, last)] = diagonal_line(size)
+    ring_lines[(0, last)] = ring_lines[(last, 0)] = anti_diagonal_line(size)
+    return ring_lines
+
+
+def build_line_cells(size=BOARD_SIZE):   #inner (row, col) cells on every line, row-major
+    line_cells = [[] for _ in range(line_count(size))]
+    for index, cell_lines in enumerate(build_inner_lines(size)):
+        for line in cell_lines:
+            line_cells[line].append(bitboard.index_to_cell(index, size))
+    return line_cells
+
+
+LINE_COUNT = line_count()
+INNER_LINES = build_inner_lines()
+RING_LINE = build_ring_lines()
+LINE_CELLS = build_line_cells()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+from collections import deque
+
+#Maximum bipartite matching (Hopcroft-Karp)
+#candidates maps every left vertex to the right vertices it may be matched with
+
+
+def hopcroft_karp(candidates):   #returns {left: right} for a maximum matching
+    match_left = {left: None for left in candidates}
+    match_right = {}
+
+    while True:
+        #Layer the left vertices by their distance from a free left vertex along alternating paths
+        dist = {}
+        queue = deque()
+        for left in candidates:
+            if match_left[left] is None:
+                dist[left] = 0
+                queue.append(left)
+
+        found_free = False
+        while queue:
+            left = queue.popleft()
+            for right in candidates[left]:
+                partner = match_right.get(right)
+                if partner is None:
+                    found_free = True
+                elif partner not in dist:
+                    dist[partner] = dist[left] + 1
+                    queue.append(partner)
+
+        if not found_free:
+            break
+
+        #Augment along vertex-disjoint shortest paths
+        for left in candidates:
+            if match_left[left] is None:
+                _augment(left, candidates, match_left, match_right, dist)
+
+    return {left: right for left, right in match_left.items() if right is not None}
+
+
+def _augment(left, candidates, match_left, match_right, dist):
+    for right in candidates[left]:
+        partner = match_right.get(right)
+        if partner is None or (dist.get(partner) == dist[left] + 1
+                               and _augment(partner, candidates, match_left, match_right, dist)):
+            match_left[left] = right
+            match_right[right] = left
+            return True
+
+    dist[left] = None   #no augmenting path through here in this phase
+    return False
+
+
+def augment(left, neighbours, match_left, match_right, visited):
+    #Kuhn's search for one augmenting path from an unmatched left vertex
+    #neighbours(left) lists the right vertices left may use, visited collects right vertices already tried
+    for right in neighbours(left):
+        if right in visited:
+            continue
+        visited.add(right)
+        partner = match_right.get(right)
+        if partner is None or augment(partner, neighbours, match_left, match_right, visited):
+            match_left[left] = right
+            match_right[right] = left
+            return True
+    return False
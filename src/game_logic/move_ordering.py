@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+#Move ordering policies for the autocomplete search
+#A policy gets the candidate cells and two callbacks:
+#   onward(cell) - how many moves the next number would have if the current number went to cell
+#   gain(cell)   - how many points placing the current number on cell would score
+#and returns the candidates in the order the search should try them
+
+
+def row_major(cells, onward, gain):   #original order, cells come in row by row
+    return cells
+
+
+def warnsdorff(cells, onward, gain):   #fewest onward moves first, ties go to the move that scores
+    return sorted(cells, key=lambda cell: (onward(cell), -gain(cell)))
+
+
+def diagonal_first(cells, onward, gain):   #greedy on score, ties go to fewest onward moves
+    return sorted(cells, key=lambda cell: (-gain(cell), onward(cell)))
+
+
+POLICIES = {
+    "row_major": row_major,
+    "warnsdorff": warnsdorff,
+    "diagonal_first": diagonal_first,
+}
+
+#Level 2 has no adjacency chain, so there is nothing to count onward moves against and it stays row major
+DEFAULT_POLICIES = {
+    1: "warnsdorff",
+    3: "warnsdorff",
+}
+
+
+def get_policy(name):
+    if name not in POLICIES:
+        raise ValueError("unknown move ordering policy: %s" % name)
+    return POLICIES[name]
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+import time
+from . import bitboard
+
+try:
+    import numpy as np
+except ImportError:   #numpy is optional, only the batched playouts need it
+    np = None
+
+#Level 1 random playouts, many boards at once on numpy arrays for Monte Carlo analysis
+#B boards are a (B, cells) array of the numbers placed (0 is empty). Every step moves each board that can
+#still move to a uniformly random empty king neighbour of its last cell, so all B boards advance together
+#and the Python loop only runs once per number instead of once per board
+#
+#Move generation uses a (cells, 8) table of every cell's neighbours, one column per king direction.
+#Directions that leave the board point at an extra always-filled cell, so no board ever picks them
+
+
+DIRECTIONS = [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1) if d_row or d_col]
+DIAGONAL_DIRECTIONS = [d_row != 0 and d_col != 0 for d_row, d_col in DIRECTIONS]   #the steps that score
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("batched playouts need numpy (pip install numpy)")
+
+
+def neighbour_table(size=bitboard.BOARD_SIZE):   #(cells, 8) neighbour indexes, size * size where there is none
+    _require_numpy()
+    cells = size * size
+    table = np.full((cells, len(DIRECTIONS)), cells, dtype=np.intp)
+    for index in range(cells):
+        row, col = divmod(index, size)
+        for slot, (d_row, d_col) in enumerate(DIRECTIONS):
+            if 0 <= row + d_row < size and 0 <= col + d_col < size:
+                table[index, slot] = bitboard.cell_index(row + d_row, col + d_col, size)
+    return table
+
+
+class PlayoutBatch:   #what random_playouts did to each board
+    def __init__(self, starts, boards, scores, placed):
+        self.starts = starts        #(B,) cell index of 1
+        self.boards = boards        #(B, cells) numbers placed, 0 where a stuck board never got to
+        self.scores = scores        #(B,) diagonal steps made
+        self.placed = placed        #(B,) highest number placed
+
+    @property
+    def completed(self):   #(B,) bool, the board was filled
+        return self.placed == self.boards.shape[1]
+
+    def __len__(self):
+        return len(self.starts)
+
+
+#One random level 1 game per entry of starts (cell indexes), rng is a numpy Generator
+def random_playouts(starts, rng, size=bitboard.BOARD_SIZE, table=None):
+    _require_numpy()
+    if table is None:
+        table = neighbour_table(size)
+    cells = size * size
+    starts = np.asarray(starts, dtype=np.intp)
+    count = len(starts)
+    rows = np.arange(count)
+    diagonal = np.array(DIAGONAL_DIRECTIONS)
+
+    boards = np.zeros((count, cells), dtype=np.int16)
+    filled = np.zeros((count, cells + 1), dtype=bool)
+    filled[:, cells] = True   #the off-board cell
+    boards[rows, starts] = 1
+    filled[rows, starts] = True
+    last = starts.copy()
+    scores = np.zeros(count, dtype=np.int16)
+    placed = np.ones(count, dtype=np.int16)
+
+    moving = rows
+    for num in range(2, cells + 1):
+        neighbours = table[last[moving]]                          #(moving, 8)
+        free = ~filled[moving[:, None], neighbours]
+        options = free.sum(axis=1)
+        can_move = options > 0
+        moving = moving[can_move]
+        if len(moving) == 0:
+            break
+        neighbours = neighbours[can_move]
+        free = free[can_move]
+
+        #the k-th free direction, k uniform below the number of free ones
+        pick = (rng.random(len(moving)) * options[can_move]).astype(np.intp)
+        slot = np.argmax(free.cumsum(axis=1) > pick[:, None], axis=1)
+        chosen = neighbours[np.arange(len(moving)), slot]
+
+        boards[moving, chosen] = num
+        filled[moving, chosen] = True
+        last[moving] = chosen
+        scores[moving] += diagonal[slot]
+        placed[moving] = num
+    return PlayoutBatch(starts, boards, scores, placed)
+
+
+class StartStats:   #playouts from one start cell
+    def __init__(self, start, games, completed, score_histogram, completed_score_histogram):
+        self.start = start                                          #(row, col)
+        self.games = games
+        self.completed = completed
+        self.score_histogram = score_histogram                      #games by score, all of them
+        self.completed_score_histogram = completed_score_histogram  #games by score, filled boards only
+
+    @property
+    def completion_rate(self):
+        return self.completed / self.games if self.games else 0.0
+
+    def mean_score(self, completed_only=False):
+        histogram = self.completed_score_histogram if completed_only else self.score_histogram
+        games = int(histogram.sum())
+        return float((histogram * np.arange(len(histogram))).sum()) / games if games else None
+
+    def to_dict(self):
+        return {
+            "start": list(self.start),
+            "games": self.games,
+            "completed": self.completed,
+            "completion_rate": self.completion_rate,
+            "score_histogram": self.score_histogram.tolist(),
+            "completed_score_histogram": self.completed_score_histogram.tolist(),
+        }
+
+
+class PlayoutReport:
+    def __init__(self, size, by_start, elapsed):
+        self.size = size
+        self.by_start = by_start    #(row, col) -> StartStats
+        self.elapsed = elapsed
+
+    @property
+    def playouts(self):
+        return sum(stats.games for stats in self.by_start.values())
+
+    @property
+    def playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "board_size": self.size,
+            "playouts": self.playouts,
+            "elapsed": self.elapsed,
+            "playouts_per_second": self.playouts_per_second,
+            "starts": [self.by_start[start].to_dict() for start in sorted(self.by_start)],
+        }
+
+
+#playouts_per_start random games from every start cell (all of them by default), batch_size boards at a time
+def run_playouts(playouts_per_start, starts=None, seed=0, size=bitboard.BOARD_SIZE, batch_size=100000):
+    _require_numpy()
+    if playouts_per_start < 1:
+        raise ValueError("playouts_per_start must be at least 1")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if starts is None:
+        starts = [(row, col) for row in range(size) for col in range(size)]
+    cells = size * size
+    rng = np.random.default_rng(seed)
+    table = neighbour_table(size)
+
+    start_cells = np.repeat([bitboard.cell_index(row, col, size) for row, col in starts], playouts_per_start)
+    histogram = np.zeros((cells, cells), dtype=np.int64)            #[start cell, score]
+    completed_histogram = np.zeros((cells, cells), dtype=np.int64)
+    started = time.perf_counter()
+    for first in range(0, len(start_cells), batch_size):
+        batch = random_playouts(start_cells[first:first + batch_size], rng, size, table)
+        np.add.at(histogram, (batch.starts, batch.scores), 1)
+        done = batch.completed
+        np.add.at(completed_histogram, (batch.starts[done], batch.scores[done]), 1)
+    elapsed = time.perf_counter() - started
+
+    by_start = {}
+    for row, col in starts:
+        index = bitboard.cell_index(row, col, size)
+        by_start[(row, col)] = StartStats((row, col), playouts_per_start, int(completed_histogram[index].sum()),
+                                          histogram[index], completed_histogram[index])
+    return PlayoutReport(size, by_start, elapsed)
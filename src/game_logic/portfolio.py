@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from . import search_engine
+from .background import LEVEL_LOGIC
+from .solver_stats import SolverStats
+from .transposition import ENTRY_BYTES, TranspositionTable
+
+#Autocomplete spread over several processes
+#Every first move from the current position is tried under every move ordering policy, one task each.
+#Hard starts usually have one quick branch and a few slow ones, so the first task to solve wins and
+#the others are told to stop through a shared event
+
+#How often the caller checks its own budget while the workers run
+POLL_SECONDS = 0.05
+
+
+def _solve_task(snapshot, first_move, ordering, max_nodes, max_seconds, table_bytes, cancel_event):
+    #Runs in a worker process on its own copy of the game and returns (status, stats, moves)
+    state = snapshot
+    state.transposition_table = TranspositionTable(table_bytes) if table_bytes else None
+    logic = LEVEL_LOGIC[state.level](state)
+    start_num = state.current_num
+
+    if not logic.place_number(*first_move)[0]:
+        return (search_engine.IMPOSSIBLE, SolverStats(), [])
+    budget = search_engine.SearchBudget(max_nodes, max_seconds, cancel_event)
+    result = state.autocomplete(logic, ordering, budget=budget)
+    moves = state._solution_moves(start_num) if result else []
+    return (result.status, result.stats, moves)
+
+
+#Shares max_nodes out between the tasks, returns the tasks to run and each one's node budget
+#A task counts one node for its first move and its search can count one past its budget on the node that
+#runs it out, so each gets its share less 2. Too small a budget for every task runs only the first few
+def _split_nodes(tasks, max_nodes):
+    if max_nodes is None:
+        return tasks, None
+    tasks = tasks[:max(1, max_nodes // 3)]
+    return tasks, max(1, max_nodes // len(tasks) - 2)
+
+
+#Returns a SearchResult like GameState.autocomplete, a solution is placed on game_state through level_class
+#The workers' stats are added into stats one level deeper, under the first move each of them made
+def solve(game_state, level_class, workers, policies, budget, stats):
+    if game_state.current_num > game_state.last_number():
+        return search_engine.SearchResult(search_engine.SOLVED, stats=stats)
+    root_moves = level_class.get_valid_cells()
+    if not root_moves:
+        return search_engine.SearchResult(search_engine.IMPOSSIBLE, stats=stats)
+
+    start = time.perf_counter()
+    snapshot = game_state.copy()
+    snapshot.autocomplete_workers = 1   #the workers search on their own
+    table = game_state.transposition_table
+    snapshot.transposition_table = None
+    table_bytes = table.max_entries * ENTRY_BYTES if table is not None else 0
+    tasks = [(move, ordering) for ordering in policies for move in root_moves]
+    tasks, task_nodes = _split_nodes(tasks, budget.max_nodes)
+    budget.start()
+
+    with multiprocessing.Manager() as manager:
+        cancel_event = manager.Event()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            task_moves = {}
+            for move, ordering in tasks:
+                future = pool.submit(_solve_task, snapshot, move, ordering, task_nodes,
+                                     budget.max_seconds, table_bytes, cancel_event)
+                pending.add(future)
+                task_moves[future] = move
+
+            proven = set()    #first moves some worker proved impossible
+            moves = None
+            status = None
+            while pending and moves is None:
+                if budget.is_cancelled():
+                    status = search_engine.CANCELLED
+                    break
+                if budget.is_out_of_time():
+                    status = search_engine.EXHAUSTED
+                    break
+                done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_status, task_stats, task_solution = future.result()
+                    stats.nodes += 1   #the first move itself
+                    stats.record_node(1)
+                    stats.merge(task_stats, depth_offset=1)
+                    if task_status == search_engine.SOLVED:
+                        moves = task_solution
+                        break
+                    if task_status == search_engine.IMPOSSIBLE:
+                        proven.add(task_moves[future])
+
+            #first answer wins, the rest stop at their next budget check
+            cancel_event.set()
+            for future in pending:
+                future.cancel()
+
+    if moves is not None:
+        for row, col in moves:
+            level_class.place_number(row, col)
+        return search_engine.SearchResult(search_engine.SOLVED, moves, stats.nodes, time.perf_counter() - start, stats)
+    if status is None:
+        status = search_engine.IMPOSSIBLE if len(proven) == len(root_moves) else search_engine.EXHAUSTED
+    return search_engine.SearchResult(status, [], stats.nodes, time.perf_counter() - start, stats)
+
+
+def policy_names(game_state, ordering=None):   #policies to race, the level's own one first
+    if game_state.level == 2:
+        return ["row_major"]   #level 2 search ignores ordering, racing policies would only repeat work
+    first = ordering if ordering is not None else game_state.move_ordering.get(game_state.level, "row_major")
+    names = [first]
+    for name in game_state.portfolio_policies:
+        if name not in names:
+            names.append(name)
+    return names
+
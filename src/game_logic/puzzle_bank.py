@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+import json
+import random
+import struct
+from .game_state import GameState
+from .level1 import Level1Logic
+
+#Seeded level 1 puzzles, rated by the solver and kept in an on-disk bank indexed by difficulty
+#A puzzle is a level 1 board with 1 and the first few numbers already placed (the givens)
+#
+#Bank file layout:
+#   4 bytes       header length, little endian
+#   header        JSON: format, version, record size and index {difficulty: [first record, record count]}
+#   records       RECORD_FORMAT each, grouped by difficulty in DIFFICULTIES order
+#so fetching puzzle i of a difficulty is one seek and one fixed-size read, however big the bank is
+
+BANK_FORMAT = "level1-puzzle-bank"
+BANK_VERSION = 1
+RECORD_FORMAT = "<25BII"    #board cells (0 is empty), completion count, solver nodes
+RECORD_BYTES = struct.calcsize(RECORD_FORMAT)
+HEADER_LENGTH = struct.Struct("<I")
+
+#Easiest first, a puzzle goes in the first tier whose minimum completion count it reaches
+#Completions are counted up to COUNT_LIMIT, so the easy tier is everything that hits the cap
+COUNT_LIMIT = 10000
+DIFFICULTIES = ("easy", "medium", "hard", "expert")
+MIN_COMPLETIONS = {"easy": COUNT_LIMIT, "medium": 500, "hard": 20, "expert": 1}
+EFFORT_NODES = 2000         #a solver needing more nodes than this makes a puzzle one tier harder
+
+
+class Puzzle:
+    def __init__(self, board, completions, nodes, difficulty=None):
+        self.board = board                  #5x5 list of lists, givens numbered 1..k and 0 elsewhere
+        self.completions = completions      #ways to finish it, capped at COUNT_LIMIT
+        self.nodes = nodes                  #nodes autocomplete searched to solve it from scratch
+        self.difficulty = difficulty if difficulty is not None else rate(completions, nodes)
+
+    def givens(self):   #cells of 1, 2, ... k in order
+        cells = {self.board[row][col]: (row, col) for row in range(5) for col in range(5) if self.board[row][col]}
+        return [cells[num] for num in range(1, len(cells) + 1)]
+
+    def to_record(self):
+        return struct.pack(RECORD_FORMAT, *[value for row in self.board for value in row],
+                           self.completions, self.nodes)
+
+    @classmethod
+    def from_record(cls, data, difficulty=None):
+        values = struct.unpack(RECORD_FORMAT, data)
+        board = [list(values[row * 5:row * 5 + 5]) for row in range(5)]
+        return cls(board, values[25], values[26], difficulty)
+
+    def __repr__(self):
+        return "Puzzle(%s, givens=%d, completions=%d, nodes=%d)" % (
+            self.difficulty, len(self.givens()), self.completions, self.nodes)
+
+
+def rate(completions, nodes):
+    for tier, difficulty in enumerate(DIFFICULTIES):
+        if completions >= MIN_COMPLETIONS[difficulty]:
+            if nodes > EFFORT_NODES:
+                tier = min(tier + 1, len(DIFFICULTIES) - 1)
+            return DIFFICULTIES[tier]
+    return None   #no way to finish it, not a puzzle
+
+
+#One puzzle from rng: a random start for 1 and a random walk of givens numbers, kept only if it can
+#still be finished. Returns None when the walk got stuck or left an unfinishable board
+def generate_puzzle(rng, givens):
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(rng.randrange(5), rng.randrange(5))
+    logic = Level1Logic(gs)
+    while gs.current_num <= givens:
+        cells = logic.get_valid_cells()
+        if not cells:
+            return None
+        logic.place_number(*rng.choice(cells))
+
+    board = [row[:] for row in gs.board]
+    completions = gs.count_completions(logic, COUNT_LIMIT)
+    if completions == 0:
+        return None
+    result = gs.autocomplete(logic)   #fresh game with no table, so the nodes are the whole effort
+    if not result:
+        return None
+    return Puzzle(board, completions, result.nodes)
+
+
+#count puzzles from seed, with givens spread evenly between min_givens and max_givens
+def generate_puzzles(seed, count, min_givens=1, max_givens=16):
+    rng = random.Random(seed)
+    puzzles = []
+    while len(puzzles) < count:
+        puzzle = generate_puzzle(rng, rng.randint(min_givens, max_givens))
+        if puzzle is not None:
+            puzzles.append(puzzle)
+    return puzzles
+
+
+def write_bank(path, puzzles, seed=None):
+    tiers = {difficulty: [] for difficulty in DIFFICULTIES}
+    for puzzle in puzzles:
+        tiers[puzzle.difficulty].append(puzzle)
+
+    index = {}
+    first = 0
+    for difficulty in DIFFICULTIES:
+        index[difficulty] = [first, len(tiers[difficulty])]
+        first += len(tiers[difficulty])
+    header = json.dumps({
+        "format": BANK_FORMAT,
+        "version": BANK_VERSION,
+        "record_bytes": RECORD_BYTES,
+        "seed": seed,
+        "index": index,
+    }, sort_keys=True).encode("utf-8")
+
+    with open(path, "wb") as bank_file:
+        bank_file.write(HEADER_LENGTH.pack(len(header)))
+        bank_file.write(header)
+        for difficulty in DIFFICULTIES:
+            for puzzle in tiers[difficulty]:
+                bank_file.write(puzzle.to_record())
+    return index
+
+
+class PuzzleBank:   #reads the header once, then every lookup is a single seek and read
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as bank_file:
+            length, = HEADER_LENGTH.unpack(bank_file.read(HEADER_LENGTH.size))
+            header = json.loads(bank_file.read(length).decode("utf-8"))
+        if header.get("format") != BANK_FORMAT or header.get("version") != BANK_VERSION:
+            raise ValueError("%s is not a version %d puzzle bank" % (path, BANK_VERSION))
+        self.seed = header["seed"]
+        self.index = {difficulty: tuple(span) for difficulty, span in header["index"].items()}
+        self.records_start = HEADER_LENGTH.size + length
+
+    def count(self, difficulty):
+        if difficulty not in self.index:
+            raise ValueError("unknown difficulty: %s" % difficulty)
+        return self.index[difficulty][1]
+
+    def get(self, difficulty, number):
+        first, count = self.index.get(difficulty, (0, 0))
+        if not 0 <= number < count:
+            raise IndexError("%s has %d puzzles, no puzzle %d" % (difficulty, count, number))
+        with open(self.path, "rb") as bank_file:
+            bank_file.seek(self.records_start + (first + number) * RECORD_BYTES)
+            return Puzzle.from_record(bank_file.read(RECORD_BYTES), difficulty)
+
+    def random(self, difficulty, rng=random):
+        count = self.count(difficulty)
+        if count == 0:
+            raise IndexError("no %s puzzles in the bank" % difficulty)
+        return self.get(difficulty, rng.randrange(count))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+import time
+from .solver_stats import SolverStats
+
+#Iterative depth-first search with an explicit stack, used by every autocomplete search
+#A problem object describes one search and keeps its own current state:
+#   is_goal()    - every number has been placed
+#   expand()     - the moves to try from the current state in order, or None if the state is known to fail
+#   make(move)   - step into the child state
+#   unmake(move) - step back out of it
+#   mark_dead()  - every move from the current state was tried and none worked
+#Because nothing is recursive the search can stop between any two nodes and hand back a partial answer
+
+SOLVED = "solved"
+IMPOSSIBLE = "impossible"
+EXHAUSTED = "exhausted"
+CANCELLED = "cancelled"
+ERROR = "error"           #the search raised, only reported by callers that catch it (see background.py)
+
+#The clock and the cancel event are only checked every this many nodes, reading the clock at every
+#node costs more than the node itself
+CLOCK_INTERVAL = 256
+
+_DONE = object()   #end of a move iterator, moves themselves can be anything including 0 or None
+
+
+#cancel_event is anything with is_set(), normally a threading.Event set from another thread
+#nodes is refreshed as the search goes, so whoever started it can show progress
+class SearchBudget:
+    def __init__(self, max_nodes=None, max_seconds=None, cancel_event=None):
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+        if max_seconds is not None and max_seconds <= 0:
+            raise ValueError("max_seconds must be positive")
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.cancel_event = cancel_event
+        self.deadline = None
+        self.nodes = 0
+
+    def start(self):
+        self.nodes = 0
+        if self.max_seconds is not None:
+            self.deadline = time.perf_counter() + self.max_seconds
+
+    def is_spent(self, nodes):
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            return True
+        if nodes % CLOCK_INTERVAL == 0:
+            self.nodes = nodes
+            return self.is_cancelled() or self.is_out_of_time()
+        return False
+
+    def is_out_of_time(self):
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def is_cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+
+class SearchResult:   #truthy only when solved, so existing `if autocomplete(...)` checks keep working
+    def __init__(self, status, path=None, nodes=0, elapsed=0.0, stats=None):
+        self.status = status
+        self.path = path if path is not None else []   #moves from the start state to the goal
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.stats = stats if stats is not None else SolverStats()
+
+    def __bool__(self):
+        return self.status == SOLVED
+
+    @property
+    def solved(self):
+        return self.status == SOLVED
+
+    @property
+    def impossible(self):
+        return self.status == IMPOSSIBLE
+
+    @property
+    def exhausted(self):
+        return self.status == EXHAUSTED
+
+    @property
+    def cancelled(self):
+        return self.status == CANCELLED
+
+    @property
+    def failed(self):
+        return self.status == ERROR
+
+    def __repr__(self):
+        return "SearchResult(%s, nodes=%d, elapsed=%.3fs)" % (self.status, self.nodes, self.elapsed)
+
+
+#What a best-score search found: score is the game score after the best finish found, upper_bound the
+#most any finish could score, and proven whether the whole tree was searched so score is the optimum
+#It is solved whenever some finish was found, even if the budget ran out before it was proven best
+class OptimizeResult(SearchResult):
+    def __init__(self, status, path=None, nodes=0, elapsed=0.0, stats=None, score=None, upper_bound=None, proven=False):
+        SearchResult.__init__(self, status, path, nodes, elapsed, stats)
+        self.score = score
+        self.upper_bound = upper_bound
+        self.proven = proven
+
+    @property
+    def optimum(self):   #the best score there is, None until it is proven
+        return self.score if self.proven else None
+
+    def __repr__(self):
+        return "OptimizeResult(%s, score=%s, upper_bound=%s, proven=%s, nodes=%d, elapsed=%.3fs)" % (
+            self.status, self.score, self.upper_bound, self.proven, self.nodes, self.elapsed)
+
+
+#Runs problem from its current state
+#On SOLVED the problem is left in the goal state, otherwise it is back in the state it started in
+#A state is only marked dead once all its moves were tried, so running out of budget never records one
+#stats gets the node counts per depth, the problem itself records its prunes and cache hits
+def run(problem, budget=None, stats=None):
+    start = time.perf_counter()
+    if budget is None:
+        budget = SearchBudget()
+    if stats is None:
+        stats = SolverStats()
+    budget.start()
+
+    if problem.is_goal():
+        return _result(SOLVED, [], 0, start, stats)
+    moves = problem.expand()
+    if moves is None:
+        return _result(IMPOSSIBLE, [], 0, start, stats)
+
+    nodes = 0
+    path = []
+    stack = [iter(moves)]
+    while stack:
+        move = next(stack[-1], _DONE)
+        if move is _DONE:
+            stack.pop()
+            problem.mark_dead()
+            if path:
+                problem.unmake(path.pop())
+            continue
+
+        nodes += 1
+        if budget.is_spent(nodes):
+            while path:
+                problem.unmake(path.pop())
+            status = CANCELLED if budget.is_cancelled() else EXHAUSTED
+            return _result(status, [], nodes, start, stats)
+
+        problem.make(move)
+        path.append(move)
+        stats.record_node(len(path))
+        if problem.is_goal():
+            return _result(SOLVED, path, nodes, start, stats)
+
+        moves = problem.expand()
+        if moves is None:
+            problem.unmake(path.pop())
+        else:
+            stack.append(iter(moves))
+
+    return _result(IMPOSSIBLE, [], nodes, start, stats)
+
+
+def _result(status, path, nodes, start, stats):
+    elapsed = time.perf_counter() - start
+    stats.nodes += nodes
+    stats.elapsed += elapsed
+    return SearchResult(status, path, nodes, elapsed, stats)
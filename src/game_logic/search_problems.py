@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+
+from . import bitboard
+from . import move_ordering
+from . import zobrist
+from .solver_stats import SolverStats
+
+#Search problems for search_engine.run (see there for the interface)
+
+
+#Level 1 on the occupancy mask only, moves are cell indexes
+#The zobrist keys are carried along with the same XORs as Level1Logic.place_number, so every
+#node can be looked up in and stored to the game's transposition table
+#Keys and last cells sit in stacks indexed by depth, made once up front, so make and unmake allocate nothing
+class Level1Search:
+    def __init__(self, game_state, order=move_ordering.row_major, stats=None):
+        self.state = game_state
+        self.order = order
+        self.stats = stats if stats is not None else SolverStats()
+        self.masks = game_state.geometry.masks
+        self.deltas = game_state.geometry.zobrist
+        self.occupied = game_state.occupied
+        self.last = -1 if game_state.last_pos is None else self.masks.cell_index(*game_state.last_pos)
+        depth = bitboard.popcount(self.masks.full & ~self.occupied)   #most moves the search can make
+        self.key_stack = [list(game_state.zobrist_keys)] + [[0] * 8 for _ in range(depth)]
+        self.last_stack = [-1] * (depth + 1)   #last cell before the move made at each depth
+        self.depth = 0
+        self.keys = self.key_stack[0]
+
+    def is_goal(self):
+        return self.occupied == self.masks.full
+
+    def expand(self):
+        table = self.state.transposition_table
+        if table is not None and table.is_dead_end(zobrist.canonical(self.keys)):
+            self.stats.cache_hit("dead_end")
+            return None
+
+        masks = self.masks
+        empty = masks.full & ~self.occupied
+        if self.last == -1:
+            moves = empty
+            diagonals = 0
+        else:
+            rule = self.state._level1_prune(empty, self.last)
+            if rule is not None:
+                self.stats.prune(rule)
+                return None
+            moves = masks.neighbours[self.last] & empty
+            diagonals = masks.diagonals[self.last]
+
+        #Lowest bit first keeps the same row-major order as get_valid_cells
+        candidates = list(bitboard.iter_bits(moves))
+        if self.order is not move_ordering.row_major:
+            candidates = self.order(candidates,
+                                    lambda index: bitboard.popcount(masks.neighbours[index] & empty),
+                                    lambda index: diagonals >> index & 1)
+        return candidates
+
+    def make(self, index):
+        deltas = self.deltas
+        depth = self.depth
+        self.last_stack[depth] = self.last
+        previous_last = deltas.last_deltas[self.last] if self.last != -1 else zobrist.NO_DELTA
+        self.keys = self.key_stack[depth + 1]
+        zobrist.combine_into(self.keys, self.key_stack[depth], deltas.inner_deltas[index], deltas.last_deltas[index],
+                             previous_last)
+        self.depth = depth + 1
+        self.occupied |= 1 << index
+        self.last = index
+
+    def unmake(self, index):
+        self.depth -= 1
+        self.keys = self.key_stack[self.depth]
+        self.last = self.last_stack[self.depth]
+        self.occupied &= ~(1 << index)
+
+    def mark_dead(self):
+        table = self.state.transposition_table
+        if table is not None:
+            table.store_dead_end(zobrist.canonical(self.keys))
+
+
+#Most diagonal steps a level 1 path from last over every empty cell could still make
+#A run of diagonal steps never leaves one diagonally connected group of cells, and it takes an
+#orthogonal step to get from one group to the next, so every group after the first costs a point
+def diagonal_step_bound(empty, last, masks=bitboard.DEFAULT):
+    return bitboard.popcount(empty) - masks.diagonal_components(empty | 1 << last) + 1
+
+
+#Level 1 branch and bound for the highest scoring finish, moves are cell indexes
+#is_goal is never true, so search_engine.run walks the whole tree and only finishes (IMPOSSIBLE) once
+#the best path is proven. Every full board is compared with the best found so far instead, and a branch
+#is cut once diagonal_step_bound says it cannot beat that
+#upper[(occupied, last)] is the most a fully searched state could still add, so it can be cut on sight later
+#leaf_value(path) adds points for what comes after level 1 (None if the board cannot be finished), and
+#leaf_bound is the most it ever adds, so bounds stay admissible (see game_optimizer.py)
+#leaf_value depends on the order the numbers went down, not just on (occupied, last), so upper is not
+#kept then: what one path to a state could add says nothing about another path to it
+class Level1MaxScore:
+    def __init__(self, game_state, order=move_ordering.diagonal_first, stats=None, leaf_value=None, leaf_bound=0):
+        self.state = game_state
+        self.order = order
+        self.stats = stats if stats is not None else SolverStats()
+        self.leaf_value = leaf_value
+        self.leaf_bound = leaf_bound
+        self.masks = game_state.geometry.masks
+        self.occupied = game_state.occupied
+        self.last = -1 if game_state.last_pos is None else self.masks.cell_index(*game_state.last_pos)
+        self.gain = 0           #diagonal steps made on the current path
+        self.path = []
+        self.history = []       #(last, gain) before every move made
+        self.upper = {}
+        self.best_gain = -1     #-1 until a full board is found, leaf_value included
+        self.best_path = None
+        self.root_bound = self.bound()
+
+    def bound(self):   #most the current state could still add
+        empty = self.masks.full & ~self.occupied
+        if self.last == -1:
+            return max(bitboard.popcount(empty) - 1, 0) + self.leaf_bound
+        return diagonal_step_bound(empty, self.last, self.masks) + self.leaf_bound
+
+    def is_goal(self):
+        return False
+
+    def expand(self):
+        masks = self.masks
+        empty = masks.full & ~self.occupied
+        if not empty:
+            gain = self.gain
+            if self.leaf_value is not None:
+                extra = self.leaf_value(self.path) if gain + self.leaf_bound > self.best_gain else None
+                gain = None if extra is None else gain + extra
+            if gain is not None and gain > self.best_gain:
+                self.best_gain = gain
+                self.best_path = list(self.path)
+            return []
+
+        if self.last == -1:
+            return list(bitboard.iter_bits(empty))
+
+        needed = self.best_gain - self.gain   #the rest of the path has to add more than this
+        if self.leaf_value is None and self.upper.get((self.occupied, self.last), needed + 1) <= needed:
+            self.stats.cache_hit("bound")
+            return None
+        rule = self.state._level1_prune(empty, self.last)
+        if rule is not None:
+            self.stats.prune(rule)
+            return None
+        if diagonal_step_bound(empty, self.last, masks) + self.leaf_bound <= needed:
+            self.stats.prune("bound")
+            return None
+
+        diagonals = masks.diagonals[self.last]
+        candidates = list(bitboard.iter_bits(masks.neighbours[self.last] & empty))
+        return self.order(candidates,
+                          lambda index: bitboard.popcount(masks.neighbours[index] & empty),
+                          lambda index: diagonals >> index & 1)
+
+    def make(self, index):
+        self.history.append((self.last, self.gain))
+        if self.last != -1:
+            self.gain += self.masks.diagonals[self.last] >> index & 1
+        self.occupied |= 1 << index
+        self.last = index
+        self.path.append(index)
+
+    def unmake(self, index):
+        self.occupied &= ~(1 << index)
+        self.last, self.gain = self.history.pop()
+        self.path.pop()
+
+    def mark_dead(self):
+        #every child either was searched or could not beat the best, so this state adds at most that much
+        if self.leaf_value is None:
+            self.upper[(self.occupied, self.last)] = self.best_gain - self.gain
+
+
+#Any level through the logic class itself, moves are (row, col)
+#Moves go through the logic class's make_move/unmake_move, so score and history are left alone until
+#rewind() takes the solution back off for the caller to place properly
+#Level 2 also keeps its ring_check counts up to date
+class LogicSearch:
+    def __init__(self, game_state, level_class, ring_check, order=move_ordering.row_major, stats=None):
+        self.state = game_state
+        self.level_class = level_class
+        self.ring_check = ring_check
+        self.order = order
+        self.stats = stats if stats is not None else SolverStats()
+        self.placed = []   #cells placed by this search, latest last
+        self.undo_info = []   #what unmake_move needs for each of them
+
+    def is_goal(self):
+        return self.state.current_num > self.state.last_number()
+
+    def expand(self):
+        state = self.state
+        if state.level == 2 and self.placed:
+            row, col = self.placed[-1]
+            if state.is_deadend(row, col, self.ring_check, state.current_num - 1):
+                self.stats.prune("ring_check")
+                return None
+            if self.level_class.has_starved_number():
+                self.stats.prune("viability")
+                return None
+
+        table = state.transposition_table
+        if table is not None and table.is_dead_end(state.zobrist_key):
+            self.stats.cache_hit("dead_end")
+            return None
+
+        valid_cells = self.level_class.get_valid_cells()
+        if self.order is not move_ordering.row_major:
+            valid_cells = state._order_moves(self.level_class, valid_cells, self.order)
+        return valid_cells
+
+    def make(self, cell):
+        row, col = cell
+        if self.state.level == 2:
+            self.state.edit_ring_check(self.state.current_num, row, col, self.ring_check, False)
+        self.undo_info.append(self.level_class.make_move(row, col))
+        self.placed.append(cell)
+
+    def unmake(self, cell):
+        row, col = cell
+        self.level_class.unmake_move(row, col, self.undo_info.pop())
+        self.placed.pop()
+        if self.state.level == 2:
+            self.state.edit_ring_check(self.state.current_num, row, col, self.ring_check, True)
+
+    def rewind(self):   #take back every move made, back to the state the search started from
+        while self.placed:
+            self.unmake(self.placed[-1])
+
+    def mark_dead(self):
+        table = self.state.transposition_table
+        if table is not None:
+            table.store_dead_end(self.state.zobrist_key)
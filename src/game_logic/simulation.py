@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from . import bitboard
+from . import move_ordering
+from .background import LEVEL_LOGIC
+from .game_state import GameState
+
+#Headless bulk play: whole three-level games driven by a bot instead of the window, for measuring rule
+#and solver changes over thousands of games. Nothing here imports pygame
+#A bot plays one level at a time through the level logic classes, just as clicks would, and the game
+#fails at the first level the bot cannot finish
+#Every game gets its own seed drawn from the run's seed, so a run gives the same games on any number of workers
+
+
+class RandomBot:   #any valid cell
+    name = "random"
+
+    def __init__(self, max_seconds=None):
+        self.max_seconds = max_seconds
+
+    def choose(self, game_state, logic, cells, rng):
+        return rng.choice(cells)
+
+    def play_level(self, game_state, logic, rng):   #True once the level is won
+        while not game_state.win:
+            cells = logic.get_valid_cells()
+            if not cells:
+                return False
+            logic.place_number(*self.choose(game_state, logic, cells, rng))
+        return True
+
+
+#Picks the first cell of a move_ordering policy, the same orderings autocomplete tries its moves in
+#Level 2 has nothing to order on, so it takes any cell that doesn't leave the ring impossible to finish
+#Cells are shuffled first so ties go to rng, and nothing looks further ahead than the next move
+class OrderingBot(RandomBot):
+    ordering = "warnsdorff"
+
+    def choose(self, game_state, logic, cells, rng):
+        rng.shuffle(cells)
+        if game_state.level == 2:
+            breaking = logic.get_breaking_cells()
+            return next((cell for cell in cells if cell not in breaking), cells[0])
+        order = move_ordering.get_policy(self.ordering)
+        return order(cells, lambda cell: logic.count_onward_moves(*cell), lambda cell: logic.score_gain(*cell))[0]
+
+
+class GreedyDiagonalBot(OrderingBot):   #a scoring step whenever there is one, so level 1 often gets stuck
+    name = "greedy_diagonal"
+    ordering = "diagonal_first"
+
+
+class WarnsdorffBot(OrderingBot):   #fewest onward moves first
+    name = "warnsdorff"
+    ordering = "warnsdorff"
+
+
+#Autocomplete plays every level, given max_seconds per level (None is unlimited)
+class SolverBot(RandomBot):
+    name = "solver"
+
+    def play_level(self, game_state, logic, rng):
+        return bool(game_state.autocomplete(logic, max_seconds=self.max_seconds)) and game_state.win
+
+
+BOTS = {bot.name: bot for bot in (RandomBot, GreedyDiagonalBot, WarnsdorffBot, SolverBot)}
+
+
+def make_bot(name, max_seconds=None):
+    if name not in BOTS:
+        raise ValueError("unknown bot: %s" % name)
+    return BOTS[name](max_seconds)
+
+
+class GameRecord:   #how one simulated game went
+    def __init__(self, seed, start, score, level_scores, failed_level, elapsed):
+        self.seed = seed
+        self.start = start                  #cell of 1
+        self.score = score                  #final score, of a failed game too
+        self.level_scores = level_scores    #score after each level that was won
+        self.failed_level = failed_level    #None when all three levels were won
+        self.elapsed = elapsed
+
+    @property
+    def completed(self):
+        return self.failed_level is None
+
+    def to_dict(self):
+        return {
+            "seed": self.seed,
+            "start": list(self.start),
+            "score": self.score,
+            "level_scores": self.level_scores,
+            "failed_level": self.failed_level,
+            "elapsed": self.elapsed,
+        }
+
+    def __repr__(self):
+        return "GameRecord(seed=%d, score=%d, failed_level=%s)" % (self.seed, self.score, self.failed_level)
+
+
+#One whole game from seed, 1 goes on a random cell unless start says where
+def simulate_game(bot, seed, board_size=bitboard.BOARD_SIZE, start=None):
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    gs = GameState(transposition_bytes=0, board_size=board_size)
+    if start is None:
+        start = (rng.randrange(board_size), rng.randrange(board_size))
+    gs.start_level1_at(*start)
+    level_scores = []
+    failed_level = None
+    for level in (1, 2, 3):
+        if level == 2:
+            gs.start_level2([row[:] for row in gs.board])
+        elif level == 3:
+            gs.start_level3(gs.outer_ring.copy())
+        if not bot.play_level(gs, LEVEL_LOGIC[level](gs), rng):
+            failed_level = level
+            break
+        level_scores.append(gs.score)
+    return GameRecord(seed, start, gs.score, level_scores, failed_level, time.perf_counter() - started)
+
+
+def _play_games(bot_name, max_seconds, seeds, board_size):   #one worker task
+    bot = make_bot(bot_name, max_seconds)
+    return [simulate_game(bot, seed, board_size) for seed in seeds]
+
+
+class SimulationReport:
+    def __init__(self, bot, board_size, records, elapsed, workers):
+        self.bot = bot
+        self.board_size = board_size
+        self.records = records          #GameRecords in seed order
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def games(self):
+        return len(self.records)
+
+    @property
+    def completed(self):
+        return sum(1 for record in self.records if record.completed)
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def failures(self):   #failed games by the level they failed on
+        counts = Counter(record.failed_level for record in self.records if not record.completed)
+        return {level: counts[level] for level in (1, 2, 3)}
+
+    def failure_rates(self):   #out of the games that reached each level
+        rates = {}
+        reached = self.games
+        for level, failed in sorted(self.failures().items()):
+            rates[level] = failed / reached if reached else 0.0
+            reached -= failed
+        return rates
+
+    def score_histogram(self, completed_only=False):   #score -> games
+        counts = Counter(record.score for record in self.records if record.completed or not completed_only)
+        return dict(sorted(counts.items()))
+
+    def score_percentile(self, percent, completed_only=False):   #nearest-rank percentile, None without games
+        scores = sorted(record.score for record in self.records if record.completed or not completed_only)
+        if not scores:
+            return None
+        rank = max(1, -(-len(scores) * percent // 100))
+        return scores[int(rank) - 1]
+
+    def mean_score(self, completed_only=False):
+        scores = [record.score for record in self.records if record.completed or not completed_only]
+        return sum(scores) / len(scores) if scores else None
+
+    def to_dict(self):
+        return {
+            "bot": self.bot,
+            "board_size": self.board_size,
+            "games": self.games,
+            "completed": self.completed,
+            "workers": self.workers,
+            "elapsed": self.elapsed,
+            "games_per_second": self.games_per_second,
+            "failures": {str(level): count for level, count in self.failures().items()},
+            "failure_rates": {str(level): rate for level, rate in self.failure_rates().items()},
+            "mean_score": self.mean_score(),
+            "score_histogram": {str(score): count for score, count in self.score_histogram().items()},
+            "completed_score_histogram": {str(score): count
+                                          for score, count in self.score_histogram(completed_only=True).items()},
+        }
+
+
+#games whole games with bot_name, spread over workers processes (1 plays them in this one)
+#max_seconds is the solver bot's autocomplete budget per level
+def simulate(bot_name, games, seed=0, workers=1, board_size=bitboard.BOARD_SIZE, max_seconds=None, chunk_size=None):
+    make_bot(bot_name)   #unknown names fail here rather than in a worker
+    if games < 1:
+        raise ValueError("games must be at least 1")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    seed_rng = random.Random(seed)
+    seeds = [seed_rng.getrandbits(32) for _ in range(games)]
+
+    started = time.perf_counter()
+    if workers == 1:
+        records = _play_games(bot_name, max_seconds, seeds, board_size)
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, -(-games // (workers * 4)))   #a few chunks per worker keeps them all busy
+        chunks = [seeds[first:first + chunk_size] for first in range(0, games, chunk_size)]
+        records = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_play_games, bot_name, max_seconds, chunk, board_size) for chunk in chunks]
+            for future in futures:
+                records.extend(future.result())
+    return SimulationReport(bot_name, board_size, records, time.perf_counter() - started, workers)
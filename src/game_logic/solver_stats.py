@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+import json
+
+#What one autocomplete run did, attached to its SearchResult as result.stats
+#depth_histogram[d] counts the nodes d moves below the starting position
+#prunes counts why branches were cut without searching them:
+#   dead_ends, disconnected, unreachable - the level 1 feasibility rules
+#   ring_check - a level 2 ring line has more empty cells than numbers left for it
+#   viability  - a later number has no cell left at all
+#   bound      - the level 1 optimiser's score bound says the branch cannot beat the best finish so far
+#cache_hits counts answers that came from memory instead of a search:
+#   dead_end - the transposition table already knew the state fails
+#   memo     - the level 3 solver already saw this (occupied, last) fail in this run
+#   solution - the whole answer was replayed from the transposition table
+#   bound    - the level 1 optimiser already searched this state and knows it cannot do better
+
+
+class SolverStats:
+    def __init__(self):
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.max_depth = 0
+        self.depth_histogram = []
+        self.prunes = {}
+        self.cache_hits = {}
+
+    def record_node(self, depth):
+        while len(self.depth_histogram) <= depth:
+            self.depth_histogram.append(0)
+        self.depth_histogram[depth] += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def prune(self, cause):
+        self.prunes[cause] = self.prunes.get(cause, 0) + 1
+
+    def cache_hit(self, kind):
+        self.cache_hits[kind] = self.cache_hits.get(kind, 0) + 1
+
+    def merge(self, other, depth_offset=0):   #add another run's counts, its depths shifted down by depth_offset
+        self.nodes += other.nodes
+        for depth, count in enumerate(other.depth_histogram):
+            while len(self.depth_histogram) <= depth + depth_offset:
+                self.depth_histogram.append(0)
+            self.depth_histogram[depth + depth_offset] += count
+        self.max_depth = max(self.max_depth, other.max_depth + depth_offset)
+        for cause, count in other.prunes.items():
+            self.prunes[cause] = self.prunes.get(cause, 0) + count
+        for kind, count in other.cache_hits.items():
+            self.cache_hits[kind] = self.cache_hits.get(kind, 0) + count
+
+    def to_dict(self):
+        return {
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+            "max_depth": self.max_depth,
+            "depth_histogram": list(self.depth_histogram),
+            "prunes": dict(self.prunes),
+            "cache_hits": dict(self.cache_hits),
+        }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.nodes = data["nodes"]
+        stats.elapsed = data["elapsed"]
+        stats.max_depth = data["max_depth"]
+        stats.depth_histogram = list(data["depth_histogram"])
+        stats.prunes = dict(data["prunes"])
+        stats.cache_hits = dict(data["cache_hits"])
+        return stats
+
+    def __repr__(self):
+        return "SolverStats(nodes=%d, elapsed=%.3fs, max_depth=%d)" % (self.nodes, self.elapsed, self.max_depth)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+from . import bitboard
+
+#The 8 symmetries of the square board (dihedral group D4)
+#Symmetry t mirrors across the main diagonal when t >= 4, then turns a quarter clockwise t % 4 times
+#The inner board sits in the middle of the ring grid (5x5 in 7x7 by default), so one symmetry moves both the same way
+
+BOARD_SIZE = bitboard.BOARD_SIZE
+RING_SIZE = BOARD_SIZE + 2
+SYMMETRIES = range(8)
+
+
+def transform_cell(t, row, col, size):
+    if t >= 4:
+        row, col = col, row
+    for _ in range(t % 4):
+        row, col = col, size - 1 - row
+    return (row, col)
+
+
+def inverse(t):   #rotations undo each other, mirrors undo themselves
+    if t < 4:
+        return (4 - t) % 4
+    return t
+
+
+def ring_cells(size=RING_SIZE):   #every cell on the edge of the ring grid
+    return [(row, col) for row in range(size) for col in range(size)
+            if row in (0, size - 1) or col in (0, size - 1)]
+
+
+def transform_board(t, board):   #copy of a list-of-lists board moved by symmetry t
+    size = len(board)
+    moved = [[0 for _ in range(size)] for _ in range(size)]
+    for row in range(size):
+        for col in range(size):
+            new_row, new_col = transform_cell(t, row, col, size)
+            moved[new_row][new_col] = board[row][col]
+    return moved
+
+
+def transform_ring(t, ring, size=RING_SIZE):   #copy of an outer ring dict moved by symmetry t
+    return {transform_cell(t, row, col, size): value for (row, col), value in ring.items()}
+
+
+#inner_maps[t][index] is where bit index of the inner board goes under symmetry t
+def build_inner_maps(size=BOARD_SIZE):
+    return [[bitboard.cell_index(*transform_cell(t, row, col, size), size)
+             for row in range(size) for col in range(size)] for t in SYMMETRIES]
+
+
+#ring_maps[t][pos] is where ring cell pos goes under symmetry t, for the ring round a size board
+def build_ring_maps(size=BOARD_SIZE):
+    return [{pos: transform_cell(t, pos[0], pos[1], size + 2) for pos in ring_cells(size + 2)} for t in SYMMETRIES]
+
+
+RING_CELLS = ring_cells()
+INNER_MAPS = build_inner_maps()
+RING_MAPS = build_ring_maps()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+from collections import OrderedDict
+
+#Rough size of one OrderedDict entry holding a 64-bit key (key object, hash slot and link node)
+ENTRY_BYTES = 128
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEAD_END = True
+
+
+class TranspositionTable:
+    #Bounded LRU map from canonical Zobrist keys to what the search proved about that state:
+    #DEAD_END, or the moves that finish the board (stored in the canonical orientation)
+    #Once full, the least recently used key is dropped to make room
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes < ENTRY_BYTES:
+            raise ValueError("max_bytes must hold at least one entry")
+        self.max_entries = max_bytes // ENTRY_BYTES
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def _hit(self, key):
+        self.entries.move_to_end(key)
+        self.hits += 1
+    
+    def _store(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def is_dead_end(self, key):
+        if self.entries.get(key) is DEAD_END:
+            self._hit(key)
+            return True
+        self.misses += 1
+        return False
+    
+    def store_dead_end(self, key):
+        self._store(key, DEAD_END)
+    
+    def get_solution(self, key):   #moves that finish the state, or None
+        entry = self.entries.get(key)
+        if entry is None or entry is DEAD_END:
+            self.misses += 1
+            return None
+        self._hit(key)
+        return entry
+    
+    def store_solution(self, key, moves):
+        self._store(key, tuple(moves))
+    
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+        }
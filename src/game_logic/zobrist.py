@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+import random
+from . import symmetry
+
+#Zobrist keys for autocomplete search states
+#A state's key is the XOR of one random 64-bit number per feature it has, so placing or
+#removing a number only needs one or two XORs instead of rehashing the whole board
+#The seed is fixed so keys are the same on every run
+
+BOARD_SIZE = symmetry.BOARD_SIZE
+MAX_NUMBER = BOARD_SIZE * BOARD_SIZE
+SEED = 20260207
+
+
+#Every key and delta for one board size, see keys_for
+#A state is hashed in all 8 board orientations at once, one key per symmetry
+#Each delta holds the key a feature contributes under every symmetry, so one update moves all 8 keys
+class ZobristKeys:
+    def __init__(self, size=BOARD_SIZE):
+        rng = random.Random(SEED if size == BOARD_SIZE else SEED * 100 + size)
+        random_key = lambda: rng.getrandbits(64)
+        cells = size * size
+        ring_cells = symmetry.ring_cells(size + 2)
+        self.inner_maps = symmetry.build_inner_maps(size)
+        self.ring_maps = symmetry.build_ring_maps(size)
+
+        self.level_keys = [random_key() for _ in range(4)]                          #indexed by level
+        self.inner_keys = [random_key() for _ in range(cells)]                      #inner cell is filled (levels 1 and 3)
+        self.last_keys = [random_key() for _ in range(cells)]                       #inner cell holds the last number (levels 1 and 3)
+        self.ring_keys = {pos: random_key() for pos in ring_cells}                  #ring cell is filled (level 2)
+        self.inner_value_keys = [[random_key() for _ in range(cells + 1)] for _ in range(cells)]   #fixed inner board in level 2
+        self.ring_value_keys = {pos: [random_key() for _ in range(cells + 1)] for pos in ring_cells}  #fixed ring in level 3
+
+        self.level_deltas = [(key,) * 8 for key in self.level_keys]
+        self.inner_deltas = [tuple(self.inner_keys[moved[index]] for moved in self.inner_maps) for index in range(cells)]
+        self.last_deltas = [tuple(self.last_keys[moved[index]] for moved in self.inner_maps) for index in range(cells)]
+        self.ring_deltas = {pos: tuple(self.ring_keys[moved[pos]] for moved in self.ring_maps) for pos in ring_cells}
+
+    def inner_value_delta(self, index, value):
+        return tuple(self.inner_value_keys[moved[index]][value] for moved in self.inner_maps)
+
+    def ring_value_delta(self, pos, value):
+        return tuple(self.ring_value_keys[moved[pos]][value] for moved in self.ring_maps)
+
+
+_KEYS = {}
+
+
+def keys_for(size):   #the ZobristKeys of a board size, built the first time it is asked for
+    if size not in _KEYS:
+        _KEYS[size] = ZobristKeys(size)
+    return _KEYS[size]
+
+
+DEFAULT = keys_for(BOARD_SIZE)
+LEVEL_KEYS = DEFAULT.level_keys
+INNER_KEYS = DEFAULT.inner_keys
+LAST_KEYS = DEFAULT.last_keys
+RING_KEYS = DEFAULT.ring_keys
+INNER_VALUE_KEYS = DEFAULT.inner_value_keys
+RING_VALUE_KEYS = DEFAULT.ring_value_keys
+LEVEL_DELTAS = DEFAULT.level_deltas
+INNER_DELTAS = DEFAULT.inner_deltas
+LAST_DELTAS = DEFAULT.last_deltas
+RING_DELTAS = DEFAULT.ring_deltas
+inner_value_delta = DEFAULT.inner_value_delta
+ring_value_delta = DEFAULT.ring_value_delta
+
+
+NO_DELTA = (0,) * 8   #stands in for a delta that is not there, such as the last cell before any was filled
+
+
+#xor every delta into the 8 keys, as a new list
+#A move on the inner board is always three deltas (the cell, it being last and the old last cell no longer
+#being last), so that case is done in one pass instead of a list per delta
+def combine(keys, *deltas):
+    if len(deltas) == 3:
+        first, second, third = deltas
+        return [key ^ a ^ b ^ c for key, a, b, c in zip(keys, first, second, third)]
+    for delta in deltas:
+        keys = [key ^ part for key, part in zip(keys, delta)]
+    return keys
+
+
+def combine_into(out, keys, first, second, third):   #combine of three deltas written over the 8 keys in out
+    for i in range(8):
+        out[i] = keys[i] ^ first[i] ^ second[i] ^ third[i]
+
+
+def canonical(keys):   #same value for all 8 orientations of a state
+    return min(keys)
+
+
+def canonical_symmetry(keys):   #the symmetry that moves a state onto its canonical orientation
+    return min(symmetry.SYMMETRIES, key=keys.__getitem__)
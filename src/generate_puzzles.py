@@ -0,0 +1,37 @@
+# generate_puzzles.py
+# Seeded level 1 puzzle generator, writes a bank GameState.start_level1_from_bank can read
+#
+#   python src/generate_puzzles.py --seed 7 --count 500 --output puzzles.bank
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from game_logic.puzzle_bank import DIFFICULTIES, generate_puzzles, write_bank
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate and rate level 1 puzzles into a puzzle bank")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=200, help="puzzles to generate")
+    parser.add_argument("--min-givens", type=int, default=1, help="fewest numbers placed in advance, 1 included")
+    parser.add_argument("--max-givens", type=int, default=16, help="most numbers placed in advance")
+    parser.add_argument("--output", type=Path, default=Path("puzzles.bank"))
+    args = parser.parse_args(argv)
+    if not 1 <= args.min_givens <= args.max_givens <= 24:
+        parser.error("need 1 <= --min-givens <= --max-givens <= 24")
+
+    start = time.perf_counter()
+    puzzles = generate_puzzles(args.seed, args.count, args.min_givens, args.max_givens)
+    index = write_bank(args.output, puzzles, args.seed)
+    print("%d puzzles in %.1fs -> %s" % (len(puzzles), time.perf_counter() - start, args.output))
+    for difficulty in DIFFICULTIES:
+        print("  %-8s %5d" % (difficulty, index[difficulty][1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
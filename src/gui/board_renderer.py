@@ -3,16 +3,26 @@
 import pygame
 from .colors import *
 
+#Most room the ring grid gets on screen, a 7x7 grid of 70px cells
+MAX_GRID_PIXELS = 7 * 70
+
 class BoardRenderer:
-    def __init__(self, screen, cell_size=70, board_offset_y=120):
+    def __init__(self, screen, cell_size=70, board_offset_y=120, board_size=5):
         self.screen = screen
-        self.cell_size = cell_size
+        self.max_cell_size = cell_size
+        self.set_board_size(board_size)
         self.board_offset_x = 50      #will be recalculated for centering
         self.board_offset_y = board_offset_y
         self.font = None
         self.small_font = None
         self.title_font = None
         
+    def set_board_size(self, board_size):   #inner board is board_size cells across, the ring grid 2 more
+        self.board_size = board_size
+        self.grid_size = board_size + 2
+        #bigger boards get smaller cells so the ring grid still fits between the header and the buttons
+        self.cell_size = min(self.max_cell_size, MAX_GRID_PIXELS // self.grid_size)
+        
     def init_fonts(self):   #initialize fonts (must be called after pygame.init)
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
@@ -23,24 +33,24 @@ class BoardRenderer:
         #level 1 board is positioned where the inner board will be in level 2
         window_width = self.screen.get_width()
         window_height = self.screen.get_height()
-        board_width_7x7 = 7 * self.cell_size
-        board_height_7x7 = 7 * self.cell_size
+        grid_width = self.grid_size * self.cell_size
+        grid_height = self.grid_size * self.cell_size
         
         #vertical centering: between header (60px) and buttons (620px)
         header_end = 60
         buttons_start = 620
         available_height = buttons_start - header_end
-        base_offset_y = header_end + (available_height - board_height_7x7) // 2
+        base_offset_y = header_end + (available_height - grid_height) // 2
         
         #horizontal centering
-        base_offset_x = (window_width - board_width_7x7) // 2
+        base_offset_x = (window_width - grid_width) // 2
         
         if level == 1:
             #position level 1 board where inner board will be in level 2
             self.board_offset_x = base_offset_x + self.cell_size
             self.board_offset_y = base_offset_y + self.cell_size
         else:
-            #level 2: position the full 7x7 grid centered
+            #level 2: position the full ring grid centered
             self.board_offset_x = base_offset_x
             self.board_offset_y = base_offset_y
         
@@ -74,27 +84,28 @@ class BoardRenderer:
         self.screen.blit(level_value, (width - 62, 32))
         
     def draw_level1_board(self, board, last_pos=None, hover_cell=None, auto_completed_from=-1):
-        #draw 5x5 board for level 1
-        for row in range(5):
-            for col in range(5):
+        #draw the inner board for level 1
+        for row in range(self.board_size):
+            for col in range(self.board_size):
                 self._draw_cell(row, col, board[row][col], 
                                is_last=(last_pos == (row, col)),
                                is_hover=(hover_cell == (row, col)),
                                is_auto=(self._is_auto(auto_completed_from, board[row][col])))
                                
-    def draw_level2_board(self, inner_board, outer_ring, hover_cell=None, auto_completed_from=[-1,-1]):
-        #draw 7x7 board for level 2 (inner board + outer ring)
+    def draw_level2_board(self, inner_board, outer_ring, hover_cell=None, auto_completed_from=[-1,-1], breaking_cells=()):
+        #draw the ring grid for level 2 (inner board + outer ring)
         #draw outer ring cells first
         for pos, value in outer_ring.items():
             ring_row, ring_col = pos
             is_hover = hover_cell == pos
             is_corner = self._is_corner_cell(ring_row, ring_col)
             is_auto = self._is_auto(auto_completed_from[1], value)
-            self._draw_ring_cell(ring_row, ring_col, value, is_hover, is_corner, is_auto)
+            is_breaking = pos in breaking_cells
+            self._draw_ring_cell(ring_row, ring_col, value, is_hover, is_corner, is_auto, is_breaking)
             
-        #draw inner 5x5 board (offset by 1 in the 7x7 grid)
-        for row in range(5):
-            for col in range(5):
+        #draw inner board (offset by 1 in the ring grid)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
                 self._draw_inner_cell_level2(row, col, inner_board[row][col], 
                                         is_auto=(self._is_auto(auto_completed_from[0], inner_board[row][col])))
     
@@ -105,9 +116,9 @@ class BoardRenderer:
             is_auto = self._is_auto(auto_completed_from[1], value)
             self._draw_ring_cell(ring_row, ring_col, value, False, is_corner, is_auto)
             
-        #draw inner 5x5 board (offset by 1 in the 7x7 grid)
-        for row in range(5):
-            for col in range(5):
+        #draw inner board (offset by 1 in the ring grid)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
                 is_hover = hover_cell == (row, col)
                 is_auto = self._is_auto(auto_completed_from[0], inner_board[row][col])
                 self._draw_inner_cell_level2(row, col, inner_board[row][col], is_hover, is_auto)
@@ -142,8 +153,9 @@ class BoardRenderer:
             self.screen.blit(text, text_rect)
             
     def _is_corner_cell(self, ring_row, ring_col):
-        #check if cell is a corner of the 7x7 grid
-        corners = [(0, 0), (0, 6), (6, 0), (6, 6)]
+        #check if cell is a corner of the ring grid
+        last = self.grid_size - 1
+        corners = [(0, 0), (0, last), (last, 0), (last, last)]
         return (ring_row, ring_col) in corners
     
     def _is_auto(self, auto_complete, value):
@@ -151,8 +163,8 @@ class BoardRenderer:
             return False
         return value >= auto_complete
     
-    def _draw_ring_cell(self, ring_row, ring_col, value, is_hover=False, is_corner=False, is_auto=False):
-        #calculate position in 7x7 grid
+    def _draw_ring_cell(self, ring_row, ring_col, value, is_hover=False, is_corner=False, is_auto=False, is_breaking=False):
+        #calculate position in the ring grid
         x = self.board_offset_x + ring_col * self.cell_size
         y = self.board_offset_y + ring_row * self.cell_size
         rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
@@ -160,6 +172,8 @@ class BoardRenderer:
         #determine cell color
         if is_hover and value == 0:
             color = CELL_HOVER
+        elif is_breaking:
+            color = RING_CELL_BREAKING   #placing here leaves the ring impossible to finish
         elif is_corner:
             color = RING_CORNER   #yellow corners
         elif value != 0:
@@ -181,7 +195,7 @@ class BoardRenderer:
             self.screen.blit(text, text_rect)
             
     def _draw_inner_cell_level2(self, inner_row, inner_col, value, is_hover=False, is_auto=False):
-        #inner board is offset by 1 in 7x7 grid
+        #inner board is offset by 1 in the ring grid
         grid_row = inner_row + 1
         grid_col = inner_col + 1
         
@@ -208,12 +222,28 @@ class BoardRenderer:
             text_rect = text.get_rect(center=rect.center)
             self.screen.blit(text, text_rect)
             
+    def draw_hint_heatmap(self, hints, level):
+        #shade the cells a hint ranked, the most searched one strongest, with each one's chance of finishing
+        #hints is a HintResult, its cells are inner board cells except on level 2 where they are ring grid cells
+        offset = 1 if level == 3 else 0
+        heat = hints.heat()
+        for hint in hints.cells:
+            row, col = hint.cell
+            x = self.board_offset_x + (col + offset) * self.cell_size
+            y = self.board_offset_y + (row + offset) * self.cell_size
+            overlay = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+            overlay.fill(HINT_HEAT + (int(40 + 140 * heat[hint.cell]),))
+            self.screen.blit(overlay, (x, y))
+            
+            text = self.small_font.render("%d%%" % round(100 * hint.completion_rate), True, HINT_TEXT)
+            self.screen.blit(text, text.get_rect(midbottom=(x + self.cell_size // 2, y + self.cell_size - 3)))
+            
     def get_cell_at_pos(self, mouse_x, mouse_y, level=1):
         #convert mouse position to board cell coordinates
         if level == 1:
-            grid_size = 5
+            grid_size = self.board_size
         else:
-            grid_size = 7
+            grid_size = self.grid_size
             
         col = (mouse_x - self.board_offset_x) // self.cell_size
         row = (mouse_y - self.board_offset_y) // self.cell_size
@@ -221,13 +251,22 @@ class BoardRenderer:
         if level == 3:
             row -= 1
             col -= 1
-            grid_size = 5
+            grid_size = self.board_size
             
         if 0 <= row < grid_size and 0 <= col < grid_size:
             return (int(row), int(col))
             
         return None
         
+    def draw_completable_indicator(self, completable, width, y=77):
+        #level 2: show whether the numbers still left can all be placed on the ring
+        if completable:
+            text = self.small_font.render("Ring can still be completed", True, COMPLETABLE_COLOR)
+        else:
+            text = self.small_font.render("Ring can no longer be completed", True, NOT_COMPLETABLE_COLOR)
+        text_rect = text.get_rect(center=(width // 2, y))
+        self.screen.blit(text, text_rect)
+        
     def draw_score(self, score, x=50, y=50):
         #draw score display
         text = self.font.render("Score: %d" % score, True, TEXT_DARK)
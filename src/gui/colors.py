@@ -21,6 +21,7 @@ CELL_LAST = (230, 245, 255)         #same light color for last placed
 RING_CELL_EMPTY = (173, 216, 230)   #light blue outer ring
 RING_CELL_FILLED = (173, 216, 230)  #light blue outer ring with number
 RING_CORNER = (255, 255, 0)         #bright yellow corner cells
+RING_CELL_BREAKING = (245, 190, 190) #light red for valid cells that leave the ring impossible to finish
 INNER_BOARD_LOCKED = (230, 245, 255) #very light blue - matches inner board
 
 #text colors
@@ -35,6 +36,14 @@ HEADER_LABEL = (120, 120, 130)      #muted gray for labels
 SCORE_COLOR = (40, 160, 120)        #teal/green for score value
 LEVEL_COLOR = (220, 80, 80)         #coral/red for level value
 
+#level 2 completability indicator colors
+COMPLETABLE_COLOR = (40, 160, 120)      #same teal/green as the score
+NOT_COMPLETABLE_COLOR = (220, 80, 80)   #same coral/red as the level
+
+#hint heatmap, drawn over the cells with more alpha the better the cell ranks
+HINT_HEAT = (255, 140, 0)           #orange
+HINT_TEXT = (150, 70, 0)            #dark orange for the completion chance
+
 #button colors
 BUTTON_NORMAL = (100, 150, 200)
 BUTTON_HOVER = (120, 170, 220)
@@ -10,6 +10,8 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from completion_logger import CompletionLogger, CompletionRecord, iso_now
+from game_logic.background import AutocompleteWorker
+from game_logic.hints import HintEngine
 
 # #sound effects for User Story 2 and 6
 # pygame.mixer.init(44100, -16, 2, 2048)
@@ -66,6 +68,17 @@ class GameWindow:
         self.sound_on = True
         #User Story 16
         self.show_restart_popup = False
+        
+        #give up on autocomplete after this long, it runs in the background until then
+        self.auto_time_budget = 5.0
+        self.auto_worker = None
+        
+        #hint heatmap, searched for this long each time the position changes while it is shown
+        self.hint_time_budget = 0.05
+        self.hint_engine = HintEngine()
+        self.show_hints = False
+        self.hints = None
+        self.hint_keys = None   #zobrist keys of the position self.hints is for
     
         #initialize renderer
         self.renderer = BoardRenderer(self.screen)
@@ -119,6 +132,7 @@ class GameWindow:
         self.btn_sound_on = Button(225, row1_total_width/2 - 35, btn_width + 40, btn_height, "Sound: ON", self.small_font)
 
         self.btn_auto = Button(row1_start_x + 2 * (btn_width + btn_spacing), row1_y, btn_width, btn_height, "Auto", self.small_font)
+        self.btn_hint = Button(row1_start_x + 3 * (btn_width + btn_spacing), row1_y, btn_width, btn_height, "Hint", self.small_font)
 
         
         #row 2: Quit button (centered, red)
@@ -140,8 +154,12 @@ class GameWindow:
 
         self.btn_restart_no = Button(center_x + gap//2, popup_y,
                                     popup_btn_w, popup_btn_h, "No", self.small_font)
+        
+        #cancel button on the autocomplete progress overlay
+        self.btn_auto_cancel = Button((self.width - popup_btn_w - 20) // 2, self.height // 2 + 55,
+                                      popup_btn_w + 20, popup_btn_h, "Cancel", self.small_font, danger=True)
                 
-        self.buttons = [self.btn_undo, self.btn_clear, self.btn_auto, self.btn_quit, self.btn_sound_on]
+        self.buttons = [self.btn_undo, self.btn_clear, self.btn_auto, self.btn_hint, self.btn_quit, self.btn_sound_on]
         
         
     def set_game_components(self, game_state, level1_logic, level2_logic, level3_logic):
@@ -150,6 +168,7 @@ class GameWindow:
         self.level1_logic = level1_logic
         self.level2_logic = level2_logic
         self.level3_logic = level3_logic
+        self.renderer.set_board_size(game_state.board_size)
     
     def set_player_name(self, name):
         #set authenticated player name
@@ -177,6 +196,7 @@ class GameWindow:
         #update hover state for buttons
         for btn in self.buttons:
             btn.check_hover(mouse_pos)
+        self.btn_auto_cancel.check_hover(mouse_pos)
             
         #update hover cell
         self.hover_cell = self.renderer.get_cell_at_pos(mouse_pos[0], mouse_pos[1], self.game_state.level)
@@ -191,9 +211,18 @@ class GameWindow:
                     
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    self.running = False
+                    if self.auto_worker is not None:
+                        self.auto_worker.cancel()   #Esc stops autocomplete first, quits otherwise
+                    else:
+                        self.running = False
                     
     def _handle_click(self, mouse_pos):
+        #while autocomplete runs only its Cancel button does anything
+        if self.auto_worker is not None:
+            if self.btn_auto_cancel.is_clicked(mouse_pos):
+                self.auto_worker.cancel()
+            return
+        
         # handle restart popup first
         if self.show_restart_popup:
             if self.btn_restart_yes.is_clicked(mouse_pos):
@@ -226,17 +255,15 @@ class GameWindow:
             return
         
         if self.btn_auto.is_clicked(mouse_pos) and not self.game_state.win:
-            match self.game_state.level:
-                case 1:
-                    logic = self.level1_logic
-                case 2:
-                    logic = self.level2_logic
-                case 3: 
-                    logic = self.level3_logic
-            
-            if not self.game_state.autocomplete(logic):
-                self.show_message("Board is impossible to complete from here")
-                invalid_sound(self.sound_on)
+            #search on a copy in the background, _update applies the answer when it is ready
+            self.auto_worker = AutocompleteWorker(self.game_state, max_seconds=self.auto_time_budget)
+            self.auto_worker.start()
+            return
+        
+        if self.btn_hint.is_clicked(mouse_pos) and not self.game_state.win:
+            self.show_hints = not self.show_hints
+            self.btn_hint.text = "Hide" if self.show_hints else "Hint"
+            return
         
         #check board click
         if self.game_state.win:
@@ -288,7 +315,7 @@ class GameWindow:
         ring_row, ring_col = cell
         
         #check if clicking on inner board (not allowed in level 2)
-        if 1 <= ring_row <= 5 and 1 <= ring_col <= 5:
+        if 1 <= ring_row <= self.game_state.board_size and 1 <= ring_col <= self.game_state.board_size:
             self.show_message("Inner board is locked in Level 2!")
             return
             
@@ -331,6 +358,16 @@ class GameWindow:
     def _update(self):
         #update game state
         
+        #finish autocomplete once the background search is done
+        if self.auto_worker is not None and self.auto_worker.is_done():
+            self._finish_autocomplete()
+        
+        #search for a new hint once the position changed, the engine carries on from its last tree
+        if self.show_hints and self.auto_worker is None and not self.game_state.win:
+            if self.game_state.zobrist_keys is not self.hint_keys:
+                self.hints = self.hint_engine.hint(self.game_state, max_seconds=self.hint_time_budget)
+                self.hint_keys = self.game_state.zobrist_keys
+        
         #clear message if timer expired
         if self.message and pygame.time.get_ticks() > self.message_timer:
             self.message = ""
@@ -343,6 +380,30 @@ class GameWindow:
         if self.game_state.level == 2 and self.game_state.win:
             self._transition_to_level3()
               
+    def _finish_autocomplete(self):
+        worker = self.auto_worker
+        self.auto_worker = None
+        match worker.level:
+            case 1:
+                logic = self.level1_logic
+            case 2:
+                logic = self.level2_logic
+            case 3: 
+                logic = self.level3_logic
+        
+        result = worker.result
+        if result.cancelled:
+            self.show_message("Autocomplete cancelled")
+        elif result.failed:
+            self.show_message("Autocomplete failed: %s" % worker.error)
+            invalid_sound(self.sound_on)
+        elif result.exhausted:
+            self.show_message("Gave up, no solution found in time")
+            invalid_sound(self.sound_on)
+        elif not result or not worker.apply(logic):
+            self.show_message("Board is impossible to complete from here")
+            invalid_sound(self.sound_on)
+              
     def _log_completion(self, level):
         #log game completion for Story 7 with human-readable board format
         #use authenticated player name
@@ -423,8 +484,11 @@ class GameWindow:
                 self.game_state.board,
                 self.game_state.outer_ring,
                 hover_cell=self.hover_cell,
-                auto_completed_from=self.game_state.auto_completed_from
+                auto_completed_from=self.game_state.auto_completed_from,
+                breaking_cells=self.level2_logic.get_breaking_cells()
             )
+            if not self.game_state.win:
+                self.renderer.draw_completable_indicator(self.level2_logic.is_completable(), self.width)
         else:
             self.renderer.draw_level3_board(
                 self.game_state.board,
@@ -433,6 +497,10 @@ class GameWindow:
                 auto_completed_from=self.game_state.auto_completed_from
             )
             
+        #draw the hint heatmap over the board
+        if self.show_hints and self.hints is not None and not self.game_state.win and self.hints.level == self.game_state.level:
+            self.renderer.draw_hint_heatmap(self.hints, self.game_state.level)
+            
         #draw buttons
         for btn in self.buttons:
             btn.draw(self.screen)
@@ -448,6 +516,10 @@ class GameWindow:
         # draw restart popup if needed
         if self.show_restart_popup:
             self._draw_restart_popup()
+        
+        #draw autocomplete progress while it runs
+        if self.auto_worker is not None:
+            self._draw_autocomplete_overlay()
             
         pygame.display.flip()
         
@@ -464,6 +536,25 @@ class GameWindow:
         self.screen.blit(win_text, win_text.get_rect(center=(self.width // 2, self.height // 2 - 30)))
         self.screen.blit(score_text, score_text.get_rect(center=(self.width // 2, self.height // 2 + 20)))
         
+    def _draw_autocomplete_overlay(self):
+        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 120))
+        self.screen.blit(overlay, (0, 0))
+        
+        #spinner: an arc that goes round once a second
+        center = (self.width // 2, self.height // 2 - 60)
+        radius = 22
+        start_angle = -self.auto_worker.elapsed() * 6.283
+        arc_rect = pygame.Rect(center[0] - radius, center[1] - radius, 2 * radius, 2 * radius)
+        pygame.draw.arc(self.screen, WHITE, arc_rect, start_angle, start_angle + 4.7, 4)
+        
+        text = self.font.render("Searching... %.1fs" % self.auto_worker.elapsed(), True, WHITE)
+        self.screen.blit(text, text.get_rect(center=(self.width // 2, self.height // 2)))
+        nodes = self.small_font.render("%d positions tried, Esc to cancel" % self.auto_worker.nodes(), True, WHITE)
+        self.screen.blit(nodes, nodes.get_rect(center=(self.width // 2, self.height // 2 + 30)))
+        
+        self.btn_auto_cancel.draw(self.screen)
+        
     def _draw_restart_popup(self):
     # dark overlay
         overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
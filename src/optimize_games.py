@@ -0,0 +1,44 @@
+# optimize_games.py
+# Best whole-game score from each start cell for 1, searched offline over all three levels
+#
+#   python src/optimize_games.py --max-seconds 30 --output best_games.json
+#   python src/optimize_games.py 0,0 2,2          only these start cells
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from game_logic.game_optimizer import optimize_all
+
+
+def parse_cell(text: str) -> Tuple[int, int]:
+    row, col = (int(part) for part in text.split(","))
+    if not (0 <= row < 5 and 0 <= col < 5):
+        raise argparse.ArgumentTypeError("start cell out of range: %s" % text)
+    return row, col
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find the best whole-game score from each start cell")
+    parser.add_argument("--max-seconds", type=float, help="search budget per start cell (default: until proven)")
+    parser.add_argument("--max-nodes", type=int, help="node budget per start cell")
+    parser.add_argument("--output", type=Path, help="write every best game, moves included, as JSON")
+    parser.add_argument("starts", nargs="*", type=parse_cell, help="row,col start cells (default: all 25)")
+    args = parser.parse_args(argv)
+
+    results = optimize_all(args.starts or None, args.max_seconds, args.max_nodes)
+    for start, best in sorted(results.items()):
+        levels = "-" if best.level_scores is None else "/".join(str(score) for score in best.level_scores)
+        print("%d,%d  score %-4s %-9s %-8s %9d nodes %8.2fs" % (
+            start[0], start[1], best.score, levels, "proven" if best.proven else "best", best.nodes, best.elapsed))
+    if args.output:
+        data = {"%d,%d" % start: best.to_dict() for start, best in sorted(results.items())}
+        args.output.write_text(json.dumps(data, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# random_playouts.py
+# Level 1 random playouts in numpy batches: completion rate and score distribution per start cell
+#
+#   python src/random_playouts.py --playouts 40000                   40000 games from each of the 25 starts
+#   python src/random_playouts.py --playouts 1000000 0,0 2,2 --output playouts.json
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from game_logic import playouts
+
+
+def parse_cell(text: str) -> Tuple[int, int]:
+    row, col = (int(part) for part in text.split(","))
+    return row, col
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run batched level 1 random playouts (needs numpy)")
+    parser.add_argument("--playouts", type=int, default=10000, help="games per start cell")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--board-size", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=100000, help="boards advanced together")
+    parser.add_argument("--output", type=Path, help="write the histograms as JSON")
+    parser.add_argument("starts", nargs="*", type=parse_cell, help="row,col start cells (default: all)")
+    args = parser.parse_args(argv)
+    if args.playouts < 1 or args.batch_size < 1:
+        parser.error("--playouts and --batch-size must be at least 1")
+    if args.board_size < 2:
+        parser.error("--board-size must be at least 2")
+    for row, col in args.starts:
+        if not (0 <= row < args.board_size and 0 <= col < args.board_size):
+            parser.error("start cell out of range: %d,%d" % (row, col))
+    if playouts.np is None:
+        print("random_playouts.py needs numpy: pip install numpy", file=sys.stderr)
+        return 2
+
+    report = playouts.run_playouts(args.playouts, args.starts or None, args.seed, args.board_size, args.batch_size)
+    print("%d playouts in %.2fs, %.0f playouts/s" % (report.playouts, report.elapsed, report.playouts_per_second))
+    print("start  completed   mean score  mean when completed")
+    for start, stats in sorted(report.by_start.items()):
+        finished = stats.mean_score(completed_only=True)
+        print("%d,%d   %8.4f%%   %10.3f  %s" % (start[0], start[1], 100.0 * stats.completion_rate, stats.mean_score(),
+                                              "-" if finished is None else "%.3f" % finished))
+    if args.output:
+        args.output.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
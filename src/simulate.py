@@ -0,0 +1,67 @@
+# simulate.py
+# Headless bulk play: many whole three-level games by a bot, no window and no pygame
+#
+#   python src/simulate.py --bot solver --games 2000 --workers 4
+#   python src/simulate.py --bot random --games 100000 --output random.json
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from game_logic.geometry import MIN_BOARD_SIZE
+from game_logic.simulation import BOTS, SimulationReport, simulate
+
+HISTOGRAM_WIDTH = 40
+
+
+def print_report(report: SimulationReport) -> None:
+    print("%s on %dx%d: %d games in %.2fs on %d worker(s), %.1f games/s" % (
+        report.bot, report.board_size, report.board_size, report.games, report.elapsed, report.workers,
+        report.games_per_second))
+    print("completed  %6d  %6.1f%%" % (report.completed, 100.0 * report.completed / report.games))
+    failures = report.failures()
+    for level, rate in report.failure_rates().items():
+        print("failed L%d  %6d  %6.1f%% of the games that got there" % (level, failures[level], 100.0 * rate))
+
+    print("score      mean %.2f  min %d  p10 %d  p50 %d  p90 %d  max %d" % (
+        report.mean_score(), report.score_percentile(0), report.score_percentile(10), report.score_percentile(50),
+        report.score_percentile(90), report.score_percentile(100)))
+    histogram = report.score_histogram()
+    most = max(histogram.values())
+    for score, count in histogram.items():
+        bar = "#" * max(1, count * HISTOGRAM_WIDTH // most)
+        print("  %4d %7d %s" % (score, count, bar))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play many whole games with a bot and report how they went")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="solver")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes to play on")
+    parser.add_argument("--board-size", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, help="solver bot's autocomplete budget per level")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--records", action="store_true", help="include every game in the JSON report")
+    args = parser.parse_args(argv)
+    if args.games < 1 or args.workers < 1:
+        parser.error("--games and --workers must be at least 1")
+    if args.board_size < MIN_BOARD_SIZE:
+        parser.error("--board-size must be at least %d" % MIN_BOARD_SIZE)
+
+    report = simulate(args.bot, args.games, args.seed, args.workers, args.board_size, args.max_seconds)
+    print_report(report)
+    if args.output:
+        data = report.to_dict()
+        if args.records:
+            data["records"] = [record.to_dict() for record in report.records]
+        args.output.write_text(json.dumps(data, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
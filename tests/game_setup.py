@@ -0,0 +1,78 @@
+import random
+
+from game_logic import GameState, Level1Logic, Level2Logic, Level3Logic
+
+#Games set up part way through a level, shared by the solver tests
+#Every helper takes the board size, 5x5 unless a test asks for another
+
+
+def make_level1(row, col, use_bitboard=True, board_size=5):   #a new level 1 game with 1 on (row, col)
+    gs = GameState(use_bitboard=use_bitboard, board_size=board_size)
+    gs.start_level1_at(row, col)
+    return gs, Level1Logic(gs)
+
+
+def level1_with_moves(moves, table=None, board_size=5):   #1 on moves[0], then the rest of moves placed in order
+    gs, l1 = make_level1(*moves[0], board_size=board_size)
+    if table is not None:
+        gs.transposition_table = table
+    for row, col in moves[1:]:
+        assert l1.place_number(row, col) == (True, None)
+    return gs, l1
+
+
+def make_midgame(seed, placed=14, solvable=False, board_size=5):
+    #a random walk far enough in that brute force stays quick
+    rng = random.Random(seed)
+    while True:
+        gs, l1 = make_level1(rng.randrange(board_size), rng.randrange(board_size), board_size=board_size)
+        while gs.current_num <= placed:
+            cells = l1.get_valid_cells()
+            if not cells:
+                break
+            l1.place_number(*rng.choice(cells))
+        if gs.current_num > placed and (not solvable or finishes(gs)):
+            return gs, l1
+
+
+def finishes(gs):   #can autocomplete still finish the level, tried on a copy
+    trial = gs.copy()
+    trial.transposition_table = None
+    return bool(trial.autocomplete(Level1Logic(trial)))
+
+
+def make_level2(row, col, seed=0, board_size=5):
+    #random level 1 walk finished by autocomplete, then an empty ring
+    rng = random.Random(seed)
+    gs, l1 = make_level1(row, col, board_size=board_size)
+    while not gs.autocomplete(l1):
+        gs.reset_level1()
+        l1.place_number(*rng.choice(l1.get_valid_cells()))
+    gs.start_level2([r[:] for r in gs.board])
+    return gs, Level2Logic(gs)
+
+
+def make_level3(seed, use_bitboard=True, board_size=5):
+    #random level 1 and level 2 games, then a few random level 3 moves
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(board_size), rng.randrange(board_size), seed, board_size)
+    assert gs.autocomplete(l2)
+    gs.use_bitboard = use_bitboard
+    gs.start_level3(gs.outer_ring.copy())
+    l3 = Level3Logic(gs)
+    for _ in range(rng.randint(0, 6)):
+        cells = l3.get_valid_cells()
+        if not cells:
+            break
+        l3.place_number(*rng.choice(cells))
+    return gs, l3
+
+
+def assert_valid_level1_path(board):   #1 to N*N each one king step from the last
+    size = len(board)
+    pos = {board[r][c]: (r, c) for r in range(size) for c in range(size)}
+    assert sorted(pos) == list(range(1, size * size + 1))
+    for n in range(1, size * size):
+        (r1, c1), (r2, c2) = pos[n], pos[n + 1]
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1
+
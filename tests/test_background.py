@@ -0,0 +1,73 @@
+from game_logic import Level1Logic
+from game_logic.background import AutocompleteWorker
+from game_setup import make_level1
+
+
+def test_copy_is_independent():
+    gs, l1 = make_level1(2, 2)
+    other = gs.copy()
+    Level1Logic(other).place_number(1, 1)
+    assert gs.board[1][1] == 0
+    assert gs.current_num == 2
+    assert len(gs.move_history.arr) == 1
+    assert other.transposition_table is gs.transposition_table
+
+
+def test_worker_solves_on_a_copy_and_applies_at_once():
+    gs, l1 = make_level1(1, 4)
+    expected, _ = make_level1(1, 4)
+    assert expected.autocomplete(Level1Logic(expected))
+
+    worker = AutocompleteWorker(gs)
+    worker.start()
+    assert worker.wait(10)
+    assert worker.result.solved
+    assert gs.current_num == 2   #nothing happens to the live game until apply
+
+    assert worker.apply(l1)
+    assert gs.win
+    assert gs.board == expected.board
+    assert gs.score == expected.score
+    assert gs.auto_completed_from[0] == 2
+    gs.undo()
+    assert gs.current_num == 25
+
+
+def test_cancel_stops_the_search_and_leaves_the_game_alone():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    board = [row[:] for row in gs.board]
+    worker = AutocompleteWorker(gs, ordering="row_major")
+    worker.start()
+    worker.cancel()
+    assert worker.wait(10)
+    assert worker.result.cancelled
+    assert not worker.apply(l1)
+    assert gs.board == board
+    assert gs.auto_completed_from[0] == -1
+
+
+def test_stale_solution_is_not_applied():
+    gs, l1 = make_level1(2, 2)
+    worker = AutocompleteWorker(gs)
+    worker.start()
+    assert worker.wait(10)
+    l1.place_number(1, 1)
+    assert not worker.apply(l1)
+    assert gs.current_num == 3
+
+
+def test_a_search_that_raises_still_finishes():
+    gs, l1 = make_level1(1, 4)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("search blew up")
+
+    worker = AutocompleteWorker(gs)
+    worker.search_state.autocomplete = broken
+    worker.start()
+    assert worker.wait(10)
+    assert worker.result.failed and not worker.result
+    assert isinstance(worker.error, RuntimeError)
+    assert not worker.apply(l1)
+    assert gs.current_num == 2
@@ -0,0 +1,37 @@
+# tests/test_benchmark.py
+import random
+
+import benchmark
+from game_setup import assert_valid_level1_path
+
+
+def test_corpus_is_seeded():
+    first = benchmark.random_level1_board(random.Random(3))
+    assert first == benchmark.random_level1_board(random.Random(3))
+    assert_valid_level1_path(first)
+
+
+def test_every_level_has_cases():
+    names = benchmark.build_cases()
+    assert sum(name.startswith("level1_start_") for name in names) == 25
+    assert any(name.startswith("level2_seed_") for name in names)
+    assert any(name.startswith("level3_seed_") for name in names)
+
+
+def test_run_and_compare_against_itself():
+    results = benchmark.run_all(["level1_start_1_4", "level3_seed_0"])
+    assert all(result.status == "solved" for result in results.values())
+    baseline = benchmark.to_json(results)
+    assert benchmark.compare(baseline, results) == []
+
+
+def test_compare_flags_regressions():
+    base = benchmark.CaseResult("solved", 0.1, 100, 10000)
+    baseline = benchmark.to_json({"case": base})
+    slower = benchmark.CaseResult("solved", 0.5, 100, 10000)
+    more_nodes = benchmark.CaseResult("solved", 0.1, 400, 10000)
+    failed = benchmark.CaseResult("exhausted", 0.1, 100, 10000)
+    assert len(benchmark.compare(baseline, {"case": slower})) == 1
+    assert len(benchmark.compare(baseline, {"case": more_nodes})) == 1
+    assert len(benchmark.compare(baseline, {"case": failed})) == 1
+    assert benchmark.compare(baseline, {"case": slower}, threshold=10) == []
@@ -0,0 +1,40 @@
+from game_logic import bitboard
+from game_setup import make_level1, assert_valid_level1_path
+
+
+def test_neighbour_masks_match_king_moves():
+    assert bitboard.popcount(bitboard.NEIGHBOUR_MASKS[0]) == 3
+    assert bitboard.popcount(bitboard.NEIGHBOUR_MASKS[bitboard.cell_index(2, 2)]) == 8
+    assert bitboard.mask_to_cells(bitboard.NEIGHBOUR_MASKS[bitboard.cell_index(0, 4)]) == [(0, 3), (1, 3), (1, 4)]
+
+
+def test_valid_cells_match_list_scan():
+    gs, l1 = make_level1(2, 2)
+    for cell in [(1, 1), (0, 1), (0, 2), (1, 3)]:
+        fast = l1.get_valid_cells()
+        gs.use_bitboard = False
+        slow = l1.get_valid_cells()
+        gs.use_bitboard = True
+        assert fast == slow
+        assert l1.place_number(*cell) == (True, None)
+
+
+def test_occupancy_follows_place_and_undo():
+    gs, l1 = make_level1(0, 0)
+    l1.place_number(1, 1)
+    assert gs.occupied == bitboard.board_to_mask(gs.board)
+    gs.undo()
+    assert gs.occupied == bitboard.board_to_mask(gs.board)
+    assert gs.occupied == 1
+
+
+def test_bitboard_autocomplete_matches_list_search():
+    gs, l1 = make_level1(1, 3)
+    assert gs.autocomplete(l1)
+    slow_gs, slow_l1 = make_level1(1, 3, use_bitboard=False)
+    assert slow_gs.autocomplete(slow_l1)
+
+    assert gs.board == slow_gs.board
+    assert gs.score == slow_gs.score
+    assert gs.win
+    assert_valid_level1_path(gs.board)
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from game_logic import GameState, Level1Logic, Level2Logic, Level3Logic, bitboard, geometry, lines
+
+
+@pytest.mark.parametrize("size", [5, 7, 9])
+def test_tables_follow_the_board_size(size):
+    g = geometry.for_size(size)
+    assert g.max_number == size * size
+    assert g.line_count == 2 * size + 2
+    assert len(g.ring_cells) == 4 * size + 4
+    assert g.last_ring_number == 4 * size + 5
+    assert sorted(g.ring_line.values()) == sorted(list(range(g.line_count)) * 2)
+    assert [len(cells) for cells in g.line_cells] == [size] * g.line_count
+    assert len(g.masks.neighbours) == size * size
+    assert bitboard.popcount(g.masks.neighbours[0]) == 3
+    assert bitboard.popcount(g.masks.neighbours[g.masks.cell_index(1, 1)]) == 8
+    assert g.ring_cell_masks[(0, 0)] == g.ring_cell_masks[(size + 1, size + 1)]
+    assert geometry.for_size(size) is g
+
+
+def test_the_default_tables_are_the_5x5_ones():
+    g = geometry.DEFAULT
+    assert g.size == 5
+    assert g.masks is bitboard.DEFAULT
+    assert g.inner_lines == lines.INNER_LINES
+    assert g.ring_line == lines.RING_LINE
+
+
+def test_boards_smaller_than_5x5_are_rejected():
+    with pytest.raises(ValueError):
+        GameState(board_size=4)
+
+
+@pytest.mark.parametrize("size", [7, 9])
+def test_level1_moves_and_undo_keep_the_bitboard_and_keys_in_sync(size):
+    rng = random.Random(size)
+    gs = GameState(board_size=size)
+    gs.start_level1_at(rng.randrange(size), rng.randrange(size))
+    l1 = Level1Logic(gs)
+    assert not l1.place_number(size, 0)[0]
+    for _ in range(20):
+        cells = l1.get_valid_cells()
+        if not cells:
+            break
+        l1.place_number(*rng.choice(cells))
+        assert gs.occupied == bitboard.board_to_mask(gs.board)
+        assert gs.zobrist_keys == gs.compute_zobrist_keys()
+    for _ in range(5):
+        gs.undo()
+        assert gs.zobrist_keys == gs.compute_zobrist_keys()
+
+
+@pytest.mark.parametrize("start", [(0, 0), (3, 3), (1, 2)])
+def test_a_whole_7x7_game_autocompletes(start):
+    gs = GameState(board_size=7)
+    gs.start_level1_at(*start)
+    assert gs.autocomplete(Level1Logic(gs))
+    assert gs.current_num == 50
+    gs.start_level2([row[:] for row in gs.board])
+    l2 = Level2Logic(gs)
+    assert gs.autocomplete(l2)
+    assert gs.win and gs.current_num == 34
+    assert all(gs.outer_ring.values())
+    gs.start_level3(gs.outer_ring.copy())
+    l3 = Level3Logic(gs)
+    assert gs.autocomplete(l3)
+    assert gs.win and gs.current_num == 50
+
+    #numbers that went on the ring sit on their ring cell's line, the rest only had to be adjacent
+    for num in range(2, 34):
+        ring_row, ring_col = gs.find_outer_position(num - 1)
+        row, col = gs.move_history.get_action(num - 2).third_pos
+        assert gs.geometry.ring_cell_masks[(ring_row, ring_col)] >> gs.geometry.masks.cell_index(row, col) & 1
+
+
+#A 9x9 level 1 board whose numbers 2 to 41 reach every row and column at least twice, so level 2 can finish
+SPREAD_9X9 = [
+    [80, 79, 14, 15, 16, 17, 2, 4, 6],
+    [78, 81, 76, 13, 18, 1, 3, 7, 5],
+    [72, 77, 75, 19, 12, 11, 8, 56, 57],
+    [71, 73, 74, 21, 20, 10, 9, 58, 55],
+    [69, 70, 22, 23, 24, 60, 59, 54, 51],
+    [68, 66, 65, 25, 61, 38, 53, 52, 50],
+    [67, 64, 28, 62, 26, 37, 39, 49, 48],
+    [30, 29, 63, 27, 36, 41, 40, 46, 47],
+    [31, 32, 33, 34, 35, 42, 43, 44, 45],
+]
+
+
+def test_9x9_level2_is_impossible_after_the_centre_autocomplete():
+    #the path autocomplete finds from the centre keeps 2 to 41 out of columns 5 to 8, and a ring cell only
+    #takes numbers on its own line, so those columns' ring cells can never be filled
+    gs = GameState(board_size=9)
+    gs.start_level1_at(4, 4)
+    assert gs.autocomplete(Level1Logic(gs), max_seconds=10)
+    assert gs.current_num == 82
+    assert all(num > 41 for row in gs.board for num in row[5:])
+    gs.start_level2([row[:] for row in gs.board])
+    result = gs.autocomplete(Level2Logic(gs))
+    assert result.impossible and result.nodes == 0
+    assert gs.current_num == 2
+
+
+def test_9x9_level2_finishes_on_a_spread_board():
+    cells = sorted((num, (row, col)) for row, values in enumerate(SPREAD_9X9) for col, num in enumerate(values))
+    gs = GameState(board_size=9)
+    gs.start_level1_at(*cells[0][1])
+    l1 = Level1Logic(gs)
+    for _, cell in cells[1:]:
+        assert l1.place_number(*cell)[0]
+    assert gs.board == SPREAD_9X9
+    gs.start_level2([row[:] for row in gs.board])
+    assert gs.autocomplete(Level2Logic(gs))
+    assert gs.win and gs.current_num == 42
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from game_setup import make_midgame, make_level2, make_level3
+
+
+def brute_count(gs, logic, undo):
+    #every finish, one placement at a time through the logic class
+    if gs.current_num > 25:
+        return 1
+    total = 0
+    for row, col in logic.get_valid_cells():
+        logic.place_number(row, col)
+        total += brute_count(gs, logic, undo)
+        undo()
+    return total
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_level1_count_matches_brute_force(seed):
+    gs, l1 = make_midgame(seed, placed=13)
+    assert gs.count_completions(l1) == brute_count(gs, l1, gs.undo)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_level2_count_matches_brute_force(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    while gs.current_num <= 16:
+        cells = [cell for cell in l2.get_valid_cells() if cell not in l2.get_breaking_cells()]
+        l2.place_number(*rng.choice(cells))
+    expected = brute_count(gs, l2, gs.undo)
+    assert expected > 0
+    assert gs.count_completions(l2) == expected
+
+
+def test_level2_broken_ring_counts_zero():
+    for seed in range(20):
+        rng = random.Random(seed)
+        gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+        while gs.current_num <= 25:
+            breaking = l2.get_breaking_cells()
+            if breaking:
+                l2.place_number(*breaking[0])
+                assert gs.count_completions(l2) == 0
+                return
+            l2.place_number(*rng.choice(l2.get_valid_cells()))
+    pytest.fail("no breaking move found")
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_level3_count_matches_brute_force(seed):
+    gs, l3 = make_level3(seed, use_bitboard=False)
+    assert gs.count_completions(l3) == brute_count(gs, l3, gs.undo)
+
+
+def test_limit_caps_the_count():
+    gs, l1 = make_midgame(0, placed=6)
+    full = gs.count_completions(l1)
+    assert full > 10
+    assert gs.count_completions(l1, limit=10) == 10
+    assert gs.count_completions(l1, limit=full + 5) == full
+    with pytest.raises(ValueError):
+        gs.count_completions(l1, limit=0)
+
+
+def test_finished_level_counts_one():
+    gs, l1 = make_midgame(0, placed=6, solvable=True)
+    assert gs.autocomplete(l1)
+    assert gs.count_completions(l1) == 1
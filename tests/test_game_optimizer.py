@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from game_logic import bitboard, search_engine
+from game_logic.game_optimizer import RingPathSearch, optimize_all, optimize_game, play_game, ring_and_path
+from benchmark import random_level1_board
+from game_setup import assert_valid_level1_path
+
+
+def level1_moves(board):
+    cells = {board[row][col]: (row, col) for row in range(5) for col in range(5)}
+    return cells[1], [cells[num] for num in range(2, 26)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_ring_path_search_finishes_levels_2_and_3(seed):
+    board = random_level1_board(random.Random(seed))
+    start, moves = level1_moves(board)
+    gs, _ = play_game(start, [moves, [], []])
+    positions = [None] + [bitboard.cell_index(*cell) for cell in [start] + moves]
+    result = search_engine.run(RingPathSearch(gs, positions))
+    assert result
+    ring_moves, level3_moves = ring_and_path(result.path)
+    gs, level_scores = play_game(start, [moves, ring_moves, level3_moves])
+    assert gs.win and gs.level == 3
+    assert level_scores[2] - level_scores[0] == 48
+
+
+def test_play_game_rejects_a_bad_move():
+    with pytest.raises(ValueError):
+        play_game((0, 0), [[(2, 2)], [], []])
+
+
+def level1_board(best):
+    board = [[0] * 5 for _ in range(5)]
+    board[best.start[0]][best.start[1]] = 1
+    for num, (row, col) in enumerate(best.moves[0], 2):
+        board[row][col] = num
+    return board
+
+
+def test_budgeted_game_is_valid_but_not_proven():
+    best = optimize_game((2, 2), max_nodes=2000)
+    assert not best.proven
+    gs, level_scores = play_game(best.start, best.moves)
+    assert gs.win
+    assert level_scores == best.level_scores and best.score == level_scores[-1]
+    assert_valid_level1_path(level1_board(best))
+    assert best.to_dict()["score"] == best.score
+
+
+def test_symmetric_starts_share_one_search():
+    results = optimize_all([(0, 0), (4, 4), (0, 4), (4, 0)], max_nodes=2000)
+    scores = {best.score for best in results.values()}
+    assert len(scores) == 1
+    for start, best in results.items():
+        assert best.start == start
+        gs, level_scores = play_game(start, best.moves)
+        assert gs.win and level_scores[-1] == best.score
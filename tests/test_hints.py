@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from game_logic import GameState, Level1Logic, Level2Logic, Level3Logic
+from game_logic.hints import HintEngine
+
+
+def play_level1(gs, engine, max_iterations=200):
+    logic = Level1Logic(gs)
+    while not gs.win:
+        result = engine.hint(gs, max_seconds=None, max_iterations=max_iterations)
+        assert logic.place_number(*result.best.cell)[0]
+    return logic
+
+
+def test_hints_rank_the_valid_cells():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(2, 2)
+    result = HintEngine(seed=1).hint(gs, max_seconds=None, max_iterations=300)
+    assert result.iterations == 300 and result.reused == 0
+    assert sorted(hint.cell for hint in result.cells) == sorted(Level1Logic(gs).get_valid_cells())
+    assert [hint.visits for hint in result.cells] == sorted((hint.visits for hint in result.cells), reverse=True)
+    assert sum(hint.visits for hint in result.cells) == 300
+    for hint in result.cells:
+        assert 0 <= hint.completion_rate <= 1
+        assert 0 <= hint.expected_score <= 24
+    heat = result.heat()
+    assert heat[result.best.cell] == 1 and all(0 < value <= 1 for value in heat.values())
+    assert json.loads(json.dumps(result.to_dict()))["cells"][0]["cell"] == list(result.best.cell)
+
+
+def test_the_search_leaves_the_game_alone():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(0, 0)
+    board = [row[:] for row in gs.board]
+    keys = list(gs.zobrist_keys)
+    HintEngine(seed=2).hint(gs, max_seconds=None, max_iterations=100)
+    assert gs.board == board and gs.zobrist_keys == keys and gs.current_num == 2 and gs.score == 0
+
+
+def test_hints_are_seeded():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(1, 3)
+    first = HintEngine(seed=5).hint(gs, max_seconds=None, max_iterations=150).to_dict()["cells"]
+    second = HintEngine(seed=5).hint(gs, max_seconds=None, max_iterations=150).to_dict()["cells"]
+    assert first == second
+
+
+def test_the_tree_is_reused_after_a_move():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(0, 0)
+    engine = HintEngine(seed=3)
+    first = engine.hint(gs, max_seconds=None, max_iterations=400)
+    Level1Logic(gs).place_number(*first.best.cell)
+    second = engine.hint(gs, max_seconds=None, max_iterations=10)
+    assert second.reused == first.best.visits
+    #the node's own first rollout, made when it was added, is the one none of its children has
+    assert sum(hint.visits for hint in second.cells) == first.best.visits + 10 - 1
+
+
+def test_an_undo_starts_a_new_tree():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(0, 0)
+    engine = HintEngine(seed=3)
+    logic = Level1Logic(gs)
+    logic.place_number(1, 1)
+    engine.hint(gs, max_seconds=None, max_iterations=100)
+    gs.undo()
+    logic.place_number(0, 1)
+    assert engine.hint(gs, max_seconds=None, max_iterations=10).reused == 0
+
+
+def test_following_the_hints_finishes_every_level():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(0, 0)
+    engine = HintEngine(seed=4)
+    play_level1(gs, engine)
+
+    gs.start_level2([row[:] for row in gs.board])
+    logic = Level2Logic(gs)
+    while not gs.win:
+        assert logic.place_number(*engine.hint(gs, max_seconds=None, max_iterations=100).best.cell)[0]
+
+    gs.start_level3(gs.outer_ring.copy())
+    logic = Level3Logic(gs)
+    while not gs.win:
+        assert logic.place_number(*engine.hint(gs, max_seconds=None, max_iterations=100).best.cell)[0]
+    assert engine.hint(gs, max_seconds=None, max_iterations=10).cells == []
+
+
+def test_time_budget():
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(2, 2)
+    result = HintEngine(seed=6).hint(gs, max_seconds=0.02)
+    assert result.iterations >= 1 and result.elapsed < 1
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        HintEngine(rollout="solver")
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_at(0, 0)
+    with pytest.raises(ValueError):
+        HintEngine().hint(gs, max_seconds=None)
@@ -0,0 +1,109 @@
+import pytest
+
+from game_logic import Level1Logic, bitboard, search_engine
+from game_logic.search_problems import Level1MaxScore, diagonal_step_bound
+from game_setup import make_level1, make_midgame, make_level2, assert_valid_level1_path
+
+
+def best_gain(l1):
+    #plain exhaustive search over every finish
+    gs = l1.state
+    if gs.current_num > 25:
+        return 0
+    best = None
+    for row, col in l1.get_valid_cells():
+        gain = l1.score_gain(row, col)
+        l1.place_number(row, col)
+        rest = best_gain(l1)
+        gs.undo()
+        if rest is not None and (best is None or gain + rest > best):
+            best = gain + rest
+    return best
+
+
+def test_diagonal_components():
+    full = bitboard.FULL_MASK
+    assert bitboard.diagonal_components(full) == 2
+    assert bitboard.diagonal_components(0) == 0
+    corners = 1 | 1 << 4 | 1 << 20 | 1 << 24
+    assert bitboard.diagonal_components(corners) == 4
+    assert bitboard.diagonal_components(1 | 1 << 6 | 1 << 12) == 1
+    #a path over the whole board needs at least one orthogonal step
+    assert diagonal_step_bound(full & ~1, 0) == 23
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_optimum_matches_brute_force(seed):
+    gs, l1 = make_midgame(seed)
+    expected = best_gain(l1)
+    start_score = gs.score
+    result = gs.autocomplete(l1, optimize=True)
+    if expected is None:
+        assert result.impossible and result.proven
+        return
+    assert result and result.proven
+    assert result.optimum == result.score == result.upper_bound == start_score + expected
+    assert gs.score == result.score
+    assert_valid_level1_path(gs.board)
+
+
+def order_dependent_leaf(path):
+    #stands in for levels 2 and 3, which depend on the order the numbers went down and not just the cells
+    if path[-1] % 3 == 0:
+        return None
+    return sum(step * index for step, index in enumerate(path)) % 7
+
+
+def best_leaf_gain(l1, path=()):
+    #plain exhaustive search over every finish, its diagonal steps plus what the leaf adds
+    gs = l1.state
+    if gs.current_num > 25:
+        return order_dependent_leaf(list(path))
+    best = None
+    for row, col in l1.get_valid_cells():
+        gain = l1.score_gain(row, col)
+        l1.place_number(row, col)
+        rest = best_leaf_gain(l1, path + (bitboard.cell_index(row, col),))
+        gs.undo()
+        if rest is not None and (best is None or gain + rest > best):
+            best = gain + rest
+    return best
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_leaf_value_optimum_matches_brute_force(seed):
+    gs, l1 = make_midgame(seed, placed=10)
+    problem = Level1MaxScore(gs, leaf_value=order_dependent_leaf, leaf_bound=6)
+    result = search_engine.run(problem)
+    expected = best_leaf_gain(l1)
+    assert result.impossible   #the whole tree was searched
+    assert problem.best_gain == (-1 if expected is None else expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_optimum_beats_or_ties_plain_autocomplete(seed):
+    gs, l1 = make_midgame(seed, placed=10, solvable=True)
+    plain_gs = gs.copy()
+    plain_gs.transposition_table = None
+    plain = plain_gs.autocomplete(Level1Logic(plain_gs))
+    result = gs.autocomplete(l1, optimize=True)
+    assert plain and result.proven
+    assert result.score >= plain_gs.score
+
+
+def test_budget_cut_keeps_the_best_finish_found():
+    gs, l1 = make_level1(0, 0)
+    result = gs.autocomplete(l1, optimize=True, max_nodes=3000)
+    assert not result.proven
+    assert result.optimum is None
+    if result:
+        assert gs.score == result.score <= result.upper_bound
+        assert_valid_level1_path(gs.board)
+    else:
+        assert result.exhausted and gs.current_num == 2
+
+
+def test_optimize_is_level1_only():
+    gs, l2 = make_level2(2, 2)
+    with pytest.raises(ValueError):
+        gs.autocomplete(l2, optimize=True)
@@ -0,0 +1,56 @@
+from game_logic import bitboard
+from game_setup import level1_with_moves
+
+
+def mask_of(*cells):
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << bitboard.cell_index(row, col)
+    return mask
+
+
+def test_flood_fill_stops_at_filled_cells():
+    wall = mask_of((0, 2), (1, 2), (2, 2), (3, 2), (4, 2))
+    empty = bitboard.FULL_MASK & ~wall
+    left = bitboard.flood_fill(mask_of((0, 0)), empty)
+    assert left == empty & (bitboard.column_mask(0) | bitboard.column_mask(1))
+
+
+def test_single_neighbour_cells_finds_corner_pocket():
+    region = mask_of((0, 0), (1, 1), (2, 2))
+    assert bitboard.single_neighbour_cells(region) & region == mask_of((0, 0), (2, 2))
+
+
+def test_split_board_is_pruned_at_the_root():
+    #1-5 fill the middle column, cutting the empty cells into two halves
+    gs, l1 = level1_with_moves([(0, 2), (1, 2), (2, 2), (3, 2), (4, 2)])
+    assert not gs.autocomplete(l1)
+    assert gs.prune_counts["disconnected"] == 1
+    assert gs.current_num == 6
+
+
+def test_two_pockets_are_pruned_as_dead_ends():
+    #(0, 0) can only be entered from (1, 0), so it has to be the end of the path
+    gs, l1 = level1_with_moves([(0, 1), (1, 1), (2, 2), (3, 3), (4, 3)])
+    empty = bitboard.FULL_MASK & ~gs.occupied
+    assert gs._level1_prune(empty, bitboard.cell_index(4, 3)) is None
+    #moving away from (4, 4) leaves it with a single way in as well
+    l1.place_number(4, 2)
+    empty = bitboard.FULL_MASK & ~gs.occupied
+    assert gs._level1_prune(empty, bitboard.cell_index(4, 2)) == "dead_ends"
+    assert not gs.autocomplete(l1)
+    assert gs.prune_counts["dead_ends"] == 1
+
+
+def test_pruning_keeps_solvable_positions_solvable():
+    for start in [(0, 0), (1, 4), (2, 2), (4, 3)]:
+        gs, l1 = level1_with_moves([start])
+        assert gs.autocomplete(l1)
+        assert gs.win
+
+
+def test_disabled_rules_are_not_counted():
+    gs, l1 = level1_with_moves([(2, 2)])
+    gs.level1_prune_rules = ()
+    assert gs.autocomplete(l1)
+    assert gs.prune_counts == {}
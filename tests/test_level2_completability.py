@@ -0,0 +1,127 @@
+import gc
+import random
+import weakref
+
+import pytest
+
+from game_logic import Level2Logic
+from game_logic.matching import hopcroft_karp
+from game_setup import make_level2
+
+
+def rebuilt_size(gs, l2):
+    candidates = {num: l2.get_valid_cells(num) for num in range(gs.current_num, 26)}
+    return len(hopcroft_karp(candidates))
+
+
+def can_finish(gs, l2):
+    #plain backtracking over the ring, independent of the matching
+    if gs.current_num > 25:
+        return True
+    for row, col in l2.get_valid_cells():
+        l2.place_number(row, col)
+        finished = can_finish(gs, l2)
+        gs.undo()
+        if finished:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_matching_matches_a_rebuild(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    assert l2.is_completable()
+    for _ in range(60):
+        cells = l2.get_valid_cells()
+        if cells and (gs.current_num == 2 or rng.random() < 0.7):
+            l2.place_number(*rng.choice(cells))
+        elif gs.current_num > 2:
+            gs.undo()
+        keys = gs.zobrist_keys
+        assert l2.is_completable() == (rebuilt_size(gs, l2) == 26 - gs.current_num)
+        #the answer came from the repaired matching, not a rebuild
+        assert l2._matching_keys is keys
+        assert len(l2.matched_cell) == rebuilt_size(gs, l2)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_breaking_cells_agree_with_brute_force(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    #fill most of the ring so brute force stays quick
+    for _ in range(17):
+        cells = [cell for cell in l2.get_valid_cells() if cell not in l2.get_breaking_cells()]
+        l2.place_number(*rng.choice(cells))
+    assert l2.is_completable()
+
+    breaking = l2.get_breaking_cells()
+    for row, col in l2.get_valid_cells():
+        l2.place_number(row, col)
+        assert can_finish(gs, l2) == ((row, col) not in breaking)
+        gs.undo()
+
+
+def test_indicator_turns_off_after_a_breaking_move():
+    for seed in range(20):
+        rng = random.Random(seed)
+        gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+        while l2.is_completable() and gs.current_num <= 25:
+            breaking = l2.get_breaking_cells()
+            if breaking:
+                l2.place_number(*breaking[0])
+                assert not l2.is_completable()
+                assert not gs.autocomplete(l2)
+                gs.undo()
+                assert l2.is_completable()
+                return
+            l2.place_number(*rng.choice(l2.get_valid_cells()))
+    pytest.fail("no breaking move found")
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_candidate_counts_follow_place_undo_and_make_unmake(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    l2.has_starved_number()
+    moves = []   #(cell, previous) for make_move, None for place_number, taken back in reverse
+    for _ in range(80):
+        cells = l2.get_valid_cells()
+        roll = rng.random()
+        if cells and (not moves or roll < 0.6):
+            cell = rng.choice(cells)
+            if roll < 0.3:
+                moves.append((cell, l2.make_move(*cell)))
+            else:
+                l2.place_number(*cell)
+                moves.append(None)
+        elif moves:
+            move = moves.pop()
+            if move is None:
+                gs.undo()
+            else:
+                l2.unmake_move(*move[0], move[1])
+        else:
+            break
+        keys = gs.zobrist_keys
+        starved = any(not l2.get_valid_cells(num) for num in range(gs.current_num, 26))
+        assert l2.has_starved_number() == starved
+        #kept up incrementally, not rebuilt
+        assert l2._counts_keys is keys
+        for num in range(gs.current_num, 26):
+            assert l2.option_count[num] == len(l2.get_valid_cells(num))
+
+
+def test_undo_only_tells_the_newest_logic():
+    gs, old = make_level2(2, 2)
+    old_ref = weakref.ref(old)
+    del old
+    l2 = Level2Logic(gs)
+    gc.collect()
+    assert gs.ring_listener is l2 and old_ref() is None   #the game does not keep the old logic alive
+    for _ in range(3):
+        l2.place_number(*l2.get_valid_cells()[0])
+    l2.has_starved_number()
+    gs.undo()
+    assert l2._counts_keys is gs.zobrist_keys
+    assert gs.copy().ring_listener is None
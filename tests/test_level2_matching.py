@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from game_logic.matching import hopcroft_karp
+from game_setup import make_level2
+
+
+def test_hopcroft_karp_finds_perfect_matching():
+    candidates = {1: ["a", "b"], 2: ["a"], 3: ["b", "c"]}
+    assignment = hopcroft_karp(candidates)
+    assert assignment == {1: "b", 2: "a", 3: "c"}
+
+
+def test_hopcroft_karp_reports_maximum_size_when_incomplete():
+    candidates = {1: ["a"], 2: ["a"], 3: ["a", "b"]}
+    assert len(hopcroft_karp(candidates)) == 2
+
+
+@pytest.mark.parametrize("start", [(0, 0), (2, 2), (3, 1)])
+def test_matching_fills_the_ring_like_clicks_would(start):
+    gs, l2 = make_level2(*start)
+    score = gs.score
+    assert gs.level2_solver == "matching"
+    assert gs.autocomplete(l2)
+    assert gs.win
+    assert gs.score == score + 24
+    for num in range(2, 26):
+        pos = gs.find_outer_position(num - 1)
+        assert gs.outer_ring[pos] == num
+    assert sorted(gs.outer_ring.values()) == list(range(2, 26))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matching_agrees_with_backtracking(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    #a few random placements may already make the ring impossible
+    for _ in range(rng.randint(0, 8)):
+        cells = l2.get_valid_cells()
+        if not cells:
+            break
+        l2.place_number(*rng.choice(cells))
+
+    gs.level2_solver = "backtrack"
+    slow = gs.autocomplete(l2)
+    while gs.is_auto_completed(gs.current_num - 1, True):
+        gs.undo()
+    gs.level2_solver = "matching"
+    gs.transposition_table.clear()
+    assert gs.autocomplete(l2).status == slow.status
+
+
+def test_unknown_solver_raises():
+    gs, l2 = make_level2(2, 2)
+    gs.level2_solver = "guess"
+    with pytest.raises(ValueError):
+        gs.autocomplete(l2)
@@ -0,0 +1,77 @@
+import pytest
+
+from game_logic import bitboard, level3_solver
+from game_setup import make_level3
+
+
+def test_allowed_masks_follow_ring_alignment():
+    gs, l3 = make_level3(0)
+    ring_positions = [None, None] + [gs.find_outer_position(num - 1) for num in range(2, 26)]
+    allowed = level3_solver.allowed_masks(ring_positions)
+    for num in range(2, 26):
+        cells = [(row, col) for row in range(5) for col in range(5) if l3._is_ring_aligned(row, col, num)]
+        assert bitboard.mask_to_cells(allowed[num]) == cells
+
+
+def aligned_by_rule(row, col, ring_row, ring_col):
+    return (col == ring_col - 1 or row == ring_row - 1
+            or (row == col and ring_row == ring_col)
+            or (row + col == 4 and ring_row + ring_col == 6))
+
+
+def test_ring_cell_masks_cover_all_24_ring_cells():
+    assert len(level3_solver.RING_CELL_MASKS) == 24
+    for (ring_row, ring_col), mask in level3_solver.RING_CELL_MASKS.items():
+        cells = [(row, col) for row in range(5) for col in range(5) if aligned_by_rule(row, col, ring_row, ring_col)]
+        assert bitboard.mask_to_cells(mask) == cells
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_valid_cells_match_the_rules_cell_by_cell(seed):
+    gs, l3 = make_level3(seed)
+    while gs.current_num <= 25:
+        ring_row, ring_col = gs.find_outer_position(gs.current_num - 1)
+        last_row, last_col = gs.last_pos
+        expected = [(row, col) for row in range(5) for col in range(5)
+                    if gs.board[row][col] == 0
+                    and max(abs(row - last_row), abs(col - last_col)) == 1
+                    and aligned_by_rule(row, col, ring_row, ring_col)]
+        assert l3.get_valid_cells() == expected
+        for row in range(5):
+            for col in range(5):
+                assert l3._is_valid_move(row, col)[0] == ((row, col) in expected)
+        if not expected:
+            break
+        l3.place_number(*expected[0])
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_solver_agrees_with_backtracking(seed):
+    slow_gs, slow_l3 = make_level3(seed, use_bitboard=False)
+    slow_gs.transposition_table = None
+    expected = slow_gs.autocomplete(slow_l3)
+
+    gs, l3 = make_level3(seed)
+    result = gs.autocomplete(l3)
+    assert result.status == expected.status
+    assert result.nodes <= expected.nodes   #its pruning only ever cuts the search down
+    if expected:
+        assert gs.win
+        assert gs.score == slow_gs.score
+        for num in range(2, 26):
+            row, col = gs.move_history.get_action(num - 2).third_pos
+            assert gs.board[row][col] == num
+            assert l3._is_ring_aligned(row, col, num)
+
+
+def test_failed_search_leaves_the_board_alone():
+    for seed in range(40):
+        gs, l3 = make_level3(seed)
+        board = [row[:] for row in gs.board]
+        current, score = gs.current_num, gs.score
+        if not gs.autocomplete(l3):
+            assert gs.board == board
+            assert (gs.current_num, gs.score) == (current, score)
+            assert gs.auto_completed_from[0] == -1
+            return
+    pytest.skip("every sampled position was solvable")
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from game_logic import lines
+from game_logic.bitboard import cell_index
+from game_setup import make_level2
+
+
+def test_every_line_has_five_cells_and_two_ring_ends():
+    assert lines.LINE_COUNT == 12
+    assert [len(cells) for cells in lines.LINE_CELLS] == [5] * 12
+    ends = sorted(lines.RING_LINE.values())
+    assert ends == sorted(list(range(12)) * 2)
+    for line, cells in enumerate(lines.LINE_CELLS):
+        for row, col in cells:
+            assert line in lines.INNER_LINES[cell_index(row, col)]
+
+
+def test_lines_through_corner_and_centre():
+    assert lines.INNER_LINES[cell_index(0, 0)] == (0, 5, 10)
+    assert lines.INNER_LINES[cell_index(0, 4)] == (0, 9, 11)
+    assert lines.INNER_LINES[cell_index(2, 2)] == (2, 7, 10, 11)
+    assert lines.INNER_LINES[cell_index(1, 2)] == (1, 7)
+    assert lines.RING_LINE[(0, 0)] == lines.RING_LINE[(6, 6)] == 10
+    assert lines.RING_LINE[(6, 0)] == lines.RING_LINE[(0, 6)] == 11
+    assert lines.RING_LINE[(3, 0)] == 2
+    assert lines.RING_LINE[(6, 4)] == 8
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_edited_ring_check_matches_a_rebuild(seed):
+    rng = random.Random(seed)
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    ring_check = gs.make_ring_check()
+    placed = []
+    for _ in range(12):
+        cells = l2.get_valid_cells()
+        if not cells:
+            break
+        row, col = rng.choice(cells)
+        gs.edit_ring_check(gs.current_num, row, col, ring_check, False)
+        placed.append(((row, col), l2.make_move(row, col)))
+        assert ring_check == gs.make_ring_check()
+
+    while placed:
+        (row, col), previous = placed.pop()
+        l2.unmake_move(row, col, previous)
+        gs.edit_ring_check(gs.current_num, row, col, ring_check, True)
+        assert ring_check == gs.make_ring_check()
+
+
+def test_a_line_with_more_empty_ends_than_numbers_is_a_dead_end():
+    gs, l2 = make_level2(2, 2)
+    ring_check = gs.make_ring_check()
+    assert not any(gs.single_deadend_check(ring_check, line) for line in range(lines.LINE_COUNT))
+    ring_check[lines.RING_LINE[(0, 0)]] = 1
+    assert gs.is_deadend(0, 0, ring_check)
+    assert not gs.is_deadend(0, 3, ring_check)
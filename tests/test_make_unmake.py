@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from game_setup import make_level1, make_level2, make_level3
+
+
+def snapshot(gs):
+    return ([row[:] for row in gs.board], dict(gs.outer_ring), gs.occupied, list(gs.zobrist_keys),
+            gs.last_pos, gs.current_num, gs.score, len(gs.move_history.arr))
+
+
+def walk_and_return(gs, logic, rng, steps=8):
+    before = snapshot(gs)
+    made = []
+    for _ in range(steps):
+        cells = logic.get_valid_cells()
+        if not cells:
+            break
+        row, col = rng.choice(cells)
+        made.append((row, col, logic.make_move(row, col)))
+        #keys stay what a full rehash gives, so the transposition table still works mid-search
+        assert gs.zobrist_keys == gs.compute_zobrist_keys()
+    assert gs.score == before[6]
+    assert len(gs.move_history.arr) == before[7]
+    for row, col, previous in reversed(made):
+        logic.unmake_move(row, col, previous)
+    assert snapshot(gs) == before
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_make_unmake_round_trip_on_every_level(seed):
+    rng = random.Random(seed)
+    gs, l1 = make_level1(rng.randrange(5), rng.randrange(5))
+    walk_and_return(gs, l1, rng)
+
+    gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+    walk_and_return(gs, l2, rng)
+
+    gs, l3 = make_level3(seed)
+    walk_and_return(gs, l3, rng)
+
+
+def test_search_builds_history_and_score_once():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    assert gs.autocomplete(l1)
+    replayed, replayed_l1 = make_level1(1, 4)
+    for num in range(2, 26):
+        row, col = next((r, c) for r in range(5) for c in range(5) if gs.board[r][c] == num)
+        assert replayed_l1.place_number(row, col) == (True, None)
+    assert gs.score == replayed.score
+    assert [(a.inner_pos_x, a.inner_pos_y, a.scored) for a in gs.move_history.arr] == \
+        [(a.inner_pos_x, a.inner_pos_y, a.scored) for a in replayed.move_history.arr]
+
+
+def test_level2_backtracking_leaves_a_consistent_game():
+    gs, l2 = make_level2(3, 1, 1)
+    gs.level2_solver = "backtrack"
+    score = gs.score
+    assert gs.autocomplete(l2)
+    assert gs.score == score + 24
+    #undo walks the recorded history back, which only works if it was built properly
+    for _ in range(24):
+        gs.undo()
+    assert all(value == 0 for value in gs.outer_ring.values())
+    assert gs.zobrist_keys == gs.compute_zobrist_keys()
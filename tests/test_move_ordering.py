@@ -0,0 +1,44 @@
+import pytest
+
+from game_logic import GameState, Level1Logic, Level2Logic, Level3Logic
+from game_logic import move_ordering
+from game_setup import make_level1
+
+
+def test_warnsdorff_prefers_fewest_onward_then_score():
+    onward = {"a": 3, "b": 1, "c": 1}
+    gain = {"a": 1, "b": 0, "c": 1}
+    ordered = move_ordering.warnsdorff(["a", "b", "c"], onward.get, gain.get)
+    assert ordered == ["c", "b", "a"]
+
+
+def test_unknown_policy_raises():
+    with pytest.raises(ValueError):
+        move_ordering.get_policy("fastest")
+
+
+@pytest.mark.parametrize("policy", ["row_major", "warnsdorff"])
+def test_every_policy_completes_level1(policy):
+    gs, l1 = make_level1(1, 4)
+    assert gs.autocomplete(l1, ordering=policy)
+    assert gs.win
+    assert gs.current_num == 26
+
+
+def level3_from(row, col):   #levels 1 and 2 autocompleted from 1 on (row, col), level 3 still empty
+    gs = GameState()
+    gs.start_level1_at(row, col)
+    assert gs.autocomplete(Level1Logic(gs))
+    gs.start_level2([r[:] for r in gs.board])
+    assert gs.autocomplete(Level2Logic(gs))
+    gs.start_level3(gs.outer_ring.copy())
+    return gs, Level3Logic(gs)
+
+
+@pytest.mark.parametrize("policy", ["row_major", "warnsdorff"])
+def test_level3_autocomplete_with_policy(policy):
+    gs, l3 = level3_from(2, 2)
+    assert gs.move_ordering[3] == "warnsdorff"
+    assert gs.autocomplete(l3, ordering=policy)
+    assert gs.win
+    assert gs.current_num == 26
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import random_playouts
+from game_logic import GameState, Level1Logic, bitboard, playouts
+
+
+def replay(board):
+    #place the board's numbers through Level1Logic, which checks every step and keeps the score
+    size = len(board)
+    cells = {value: (row, col) for row in range(size) for col in range(size)
+             for value in [int(board[row][col])] if value}
+    gs = GameState(transposition_bytes=0, board_size=size)
+    gs.start_level1_at(*cells[1])
+    logic = Level1Logic(gs)
+    for num in range(2, len(cells) + 1):
+        assert logic.place_number(*cells[num])[0]
+    return gs, logic
+
+
+def test_neighbour_table_matches_the_bitboard():
+    table = playouts.neighbour_table()
+    for index in range(25):
+        mask = 0
+        for neighbour in table[index]:
+            if neighbour != 25:
+                mask |= 1 << int(neighbour)
+        assert mask == bitboard.NEIGHBOUR_MASKS[index]
+
+
+def test_every_playout_is_a_legal_game():
+    rng = np.random.default_rng(4)
+    batch = playouts.random_playouts(np.arange(25).repeat(40), rng)
+    for board, score, placed, start in zip(batch.boards, batch.scores, batch.placed, batch.starts):
+        grid = board.reshape(5, 5)
+        assert grid.flat[start] == 1
+        assert sorted(int(value) for value in board if value) == list(range(1, int(placed) + 1))
+        gs, logic = replay(grid)
+        assert gs.score == score
+        if placed < 25:
+            assert not logic.has_valid_moves()   #only stuck boards stop early
+
+
+def test_playouts_are_seeded():
+    first = playouts.random_playouts([0, 12, 24] * 10, np.random.default_rng(1))
+    second = playouts.random_playouts([0, 12, 24] * 10, np.random.default_rng(1))
+    assert (first.boards == second.boards).all()
+
+
+def test_report_per_start_cell():
+    report = playouts.run_playouts(500, [(0, 0), (2, 2)], seed=3, batch_size=300)
+    assert report.playouts == 1000
+    for start, stats in report.by_start.items():
+        assert stats.games == 500
+        assert stats.score_histogram.sum() == 500
+        assert stats.completed_score_histogram.sum() == stats.completed
+        assert 0 <= stats.completion_rate <= 1
+    assert report.playouts_per_second > 0
+    assert json.loads(json.dumps(report.to_dict()))["playouts"] == 1000
+
+
+def test_completion_rate_is_small_but_not_zero():
+    #a random walk rarely fills the board, but from a corner it does about 1.5% of the time
+    stats = playouts.run_playouts(20000, [(0, 0)], seed=0).by_start[(0, 0)]
+    assert 0.005 < stats.completion_rate < 0.04
+
+
+def test_cli(tmp_path, capsys):
+    output = tmp_path / "playouts.json"
+    assert random_playouts.main(["--playouts", "200", "--output", str(output), "0,0", "1,2"]) == 0
+    assert "playouts/s" in capsys.readouterr().out
+    assert [start["start"] for start in json.loads(output.read_text())["starts"]] == [[0, 0], [1, 2]]
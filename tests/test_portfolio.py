@@ -0,0 +1,93 @@
+import threading
+
+from game_logic import GameState, Level1Logic, portfolio
+from game_logic.search_engine import SearchBudget
+from game_setup import make_level1, make_level3, assert_valid_level1_path
+
+
+def test_portfolio_solves_and_replays_into_history():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    result = gs.autocomplete(l1, ordering="row_major", workers=2)
+    assert result.solved
+    assert gs.win
+    assert_valid_level1_path(gs.board)
+    assert len(gs.move_history.arr) == 25
+    assert gs.auto_completed_from[0] == 2
+    #history was built by place_number, so undo walks it back
+    gs.undo()
+    assert gs.current_num == 25
+
+
+def test_portfolio_proves_impossible_like_one_process():
+    gs, l1 = make_level1(0, 0)
+    for cell in [(1, 1), (2, 2), (3, 3), (4, 4), (4, 3), (3, 2), (2, 1), (1, 0)]:
+        assert l1.place_number(*cell) == (True, None)
+    expected = gs.copy()
+    expected.transposition_table = None
+    single = expected.autocomplete(type(l1)(expected), workers=1)
+
+    result = gs.autocomplete(l1, workers=2)
+    assert result.impossible
+    assert result.status == single.status
+    assert gs.current_num == 10
+
+
+def test_portfolio_works_on_level3():
+    gs, l3 = make_level3(1)
+    result = gs.autocomplete(l3, workers=2)
+    single, single_l3 = make_level3(1)
+    assert result.status == single.autocomplete(single_l3).status
+
+
+def test_cancelled_budget_stops_the_workers():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    gs.portfolio_policies = ("row_major",)
+    cancel = threading.Event()
+    cancel.set()
+    result = gs.autocomplete(l1, ordering="row_major", workers=2, budget=SearchBudget(cancel_event=cancel))
+    assert result.cancelled
+    assert gs.current_num == 2
+
+
+def test_node_budget_is_shared_between_the_workers():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    result = gs.autocomplete(l1, ordering="row_major", workers=2, max_nodes=200)
+    assert result.exhausted
+    assert 0 < result.nodes <= 200
+    assert gs.current_num == 2
+    #a budget too small to give every task its share runs fewer of them
+    tasks, task_nodes = portfolio._split_nodes(list(range(10)), 7)
+    assert len(tasks) == 2 and task_nodes == 1
+    assert portfolio._split_nodes(list(range(10)), None) == (list(range(10)), None)
+
+
+def test_policy_names_put_the_level_default_first():
+    gs, _ = make_level1(2, 2)
+    assert portfolio.policy_names(gs) == ["warnsdorff", "row_major"]
+    assert portfolio.policy_names(gs, "diagonal_first") == ["diagonal_first", "warnsdorff", "row_major"]
+    gs.level = 2
+    assert portfolio.policy_names(gs) == ["row_major"]
+
+
+def test_portfolio_finishes_a_bigger_board():
+    #past 25 numbers a 7x7 board is still only part way, so the portfolio has to search and place the rest
+    gs = GameState(board_size=7)
+    gs.start_level1_at(0, 0)
+    l1 = Level1Logic(gs)
+    snake = [(row, col if row % 2 == 0 else 6 - col) for row in range(7) for col in range(7)]
+    for cell in snake[1:25]:
+        assert l1.place_number(*cell) == (True, None)
+    assert gs.current_num == 26
+
+    result = gs.autocomplete(l1, workers=2)
+    assert result.solved
+    assert gs.win and gs.current_num == 50
+    #the solution cached on the way is a real one
+    while gs.current_num > 26:
+        gs.undo()
+    gs.win = False
+    assert gs.autocomplete(l1, workers=1).solved
+    assert gs.win and gs.current_num == 50
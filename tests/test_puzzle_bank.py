@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from game_logic import GameState, Level1Logic
+from game_logic.puzzle_bank import DIFFICULTIES, PuzzleBank, generate_puzzles, rate, write_bank
+from game_setup import assert_valid_level1_path
+
+
+@pytest.fixture(scope="module")
+def puzzles():
+    return generate_puzzles(3, 12)
+
+
+def test_generation_is_seeded(puzzles):
+    again = generate_puzzles(3, 12)
+    assert [p.board for p in again] == [p.board for p in puzzles]
+    assert [p.difficulty for p in again] == [p.difficulty for p in puzzles]
+
+
+def test_rating_follows_completions_and_effort():
+    assert rate(10000, 10) == "easy"
+    assert rate(10000, 5000) == "medium"
+    assert rate(600, 10) == "medium"
+    assert rate(3, 10) == "expert"
+    assert rate(3, 5000) == "expert"
+    assert rate(0, 10) is None
+
+
+def test_bank_round_trip(tmp_path, puzzles):
+    path = tmp_path / "puzzles.bank"
+    write_bank(path, puzzles, seed=3)
+    bank = PuzzleBank(path)
+    assert bank.seed == 3
+    assert sum(bank.count(difficulty) for difficulty in DIFFICULTIES) == len(puzzles)
+    for difficulty in DIFFICULTIES:
+        expected = [p for p in puzzles if p.difficulty == difficulty]
+        for number, puzzle in enumerate(expected):
+            loaded = bank.get(difficulty, number)
+            assert loaded.board == puzzle.board
+            assert (loaded.completions, loaded.nodes, loaded.difficulty) == (
+                puzzle.completions, puzzle.nodes, puzzle.difficulty)
+        with pytest.raises(IndexError):
+            bank.get(difficulty, len(expected))
+
+
+def test_game_starts_from_the_bank(tmp_path, puzzles):
+    path = tmp_path / "puzzles.bank"
+    write_bank(path, puzzles)
+    bank = PuzzleBank(path)
+    difficulty = next(d for d in DIFFICULTIES if bank.count(d))
+    gs = GameState()
+    puzzle = gs.start_level1_from_bank(bank, difficulty, random.Random(0))
+    givens = puzzle.givens()
+    assert gs.current_num == len(givens) + 1
+    assert gs.last_pos == givens[-1] and gs.original_one_pos == givens[0]
+    assert gs.score == 0
+    l1 = Level1Logic(gs)
+    assert gs.count_completions(l1, 10000) == puzzle.completions
+    assert gs.autocomplete(l1)
+    assert_valid_level1_path(gs.board)
+
+
+def test_not_a_bank(tmp_path):
+    path = tmp_path / "other.bank"
+    header = b'{"format": "other"}'
+    path.write_bytes(len(header).to_bytes(4, "little") + header)
+    with pytest.raises(ValueError):
+        PuzzleBank(path)
+
+
+def puzzle_game(puzzles):
+    puzzle = max(puzzles, key=lambda p: len(p.givens()))
+    gs = GameState(transposition_bytes=0)
+    gs.start_level1_with_puzzle(puzzle)
+    return gs, Level1Logic(gs), puzzle
+
+
+def test_undo_stops_at_the_givens(puzzles):
+    gs, l1, puzzle = puzzle_game(puzzles)
+    given_board = [row[:] for row in gs.board]
+    l1.place_number(*l1.get_valid_cells()[0])
+    gs.undo()
+    assert gs.board == given_board
+    gs.undo()   #nothing left that the player placed
+    assert gs.board == given_board
+    assert gs.current_num == len(puzzle.givens()) + 1
+    assert gs.last_pos == puzzle.givens()[-1]
+
+
+def test_clear_puts_the_givens_back(puzzles):
+    gs, l1, puzzle = puzzle_game(puzzles)
+    given_board = [row[:] for row in gs.board]
+    while l1.get_valid_cells() and not gs.win:
+        l1.place_number(*l1.get_valid_cells()[0])
+    gs.reset_level1()
+    assert gs.board == given_board
+    assert gs.score == 0
+    assert gs.current_num == len(puzzle.givens()) + 1
+    assert gs.last_pos == puzzle.givens()[-1]
+    assert len(gs.move_history.arr) == len(puzzle.givens())
+    gs.undo()
+    assert gs.board == given_board
@@ -0,0 +1,103 @@
+import pytest
+
+from game_logic import search_engine
+from game_logic.search_engine import SearchBudget, SearchResult
+from game_setup import make_level1
+
+
+class CountDown:
+    #toy problem: reach 0 from start by steps of 1 or 2, numbers in blocked are dead ends
+    def __init__(self, start, blocked=()):
+        self.value = start
+        self.blocked = set(blocked)
+        self.dead = []
+
+    def is_goal(self):
+        return self.value == 0
+
+    def expand(self):
+        if self.value < 0 or self.value in self.blocked:
+            return None
+        return [2, 1]
+
+    def make(self, step):
+        self.value -= step
+
+    def unmake(self, step):
+        self.value += step
+
+    def mark_dead(self):
+        self.dead.append(self.value)
+
+
+def test_engine_finds_a_path_and_leaves_the_goal_state():
+    problem = CountDown(5)
+    result = search_engine.run(problem)
+    assert result.solved and result
+    assert sum(result.path) == 5
+    assert problem.value == 0
+
+
+def test_engine_proves_impossible_and_marks_dead_states():
+    problem = CountDown(4, blocked=(2, 3))
+    result = search_engine.run(problem)
+    assert result.impossible and not result
+    assert problem.value == 4
+    assert problem.dead == [4]
+
+
+def test_budget_cutoff_restores_the_start_and_marks_nothing():
+    problem = CountDown(40, blocked=range(1, 40, 3))
+    result = search_engine.run(problem, SearchBudget(max_nodes=5))
+    assert result.exhausted and not result
+    assert result.nodes == 6
+    assert problem.value == 40
+    assert problem.dead == []
+
+
+@pytest.mark.parametrize("kwargs", [{"max_nodes": 0}, {"max_seconds": 0}, {"max_seconds": -1}])
+def test_bad_budget_raises(kwargs):
+    with pytest.raises(ValueError):
+        SearchBudget(**kwargs)
+
+
+def test_autocomplete_gives_up_on_node_budget():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    board = [row[:] for row in gs.board]
+    result = gs.autocomplete(l1, ordering="row_major", max_nodes=200)
+    assert result.exhausted
+    assert gs.board == board
+    assert gs.current_num == 2
+    assert gs.auto_completed_from[0] == -1
+    #the start was never fully searched, so it must not be cached as a dead end
+    assert not gs.transposition_table.is_dead_end(gs.zobrist_key)
+
+    assert gs.autocomplete(l1)
+    assert gs.win
+
+
+def test_autocomplete_gives_up_on_time_budget():
+    gs, l1 = make_level1(1, 4)
+    gs.level1_prune_rules = ()
+    gs.transposition_table = None
+    result = gs.autocomplete(l1, ordering="diagonal_first", max_seconds=0.05)
+    assert result.exhausted
+    assert result.nodes > 0
+    assert gs.current_num == 2 and not gs.win
+
+
+def test_default_budget_comes_from_the_state():
+    gs, l1 = make_level1(1, 4, use_bitboard=False)
+    gs.level1_prune_rules = ()
+    gs.autocomplete_max_nodes = 10
+    assert gs.autocomplete(l1, ordering="row_major").exhausted
+
+
+def test_result_reports_path_and_nodes():
+    gs, l1 = make_level1(2, 2)
+    result = gs.autocomplete(l1)
+    assert isinstance(result, SearchResult)
+    assert result.solved
+    assert len(result.path) == 24
+    assert result.nodes >= 24
@@ -0,0 +1,86 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import simulate
+from game_logic import simulation
+
+
+def test_solver_bot_finishes_every_game():
+    report = simulation.simulate("solver", 20, seed=3)
+    assert report.games == report.completed == 20
+    assert report.failures() == {1: 0, 2: 0, 3: 0}
+    for record in report.records:
+        assert len(record.level_scores) == 3
+        assert record.score == record.level_scores[-1]
+        assert record.level_scores[2] - record.level_scores[1] == 24   #a point per level 3 placement
+
+
+def test_random_bot_failures_add_up():
+    report = simulation.simulate("random", 200, seed=1)
+    failures = report.failures()
+    assert sum(failures.values()) + report.completed == 200
+    assert failures[1] > 0
+    assert sum(report.score_histogram().values()) == 200
+    rates = report.failure_rates()
+    assert rates[1] == failures[1] / 200
+
+
+@pytest.mark.parametrize("bot", sorted(simulation.BOTS))
+def test_games_only_depend_on_the_seed(bot):
+    first = simulation.simulate(bot, 6, seed=9, max_seconds=5)
+    second = simulation.simulate(bot, 6, seed=9, max_seconds=5)
+    assert [(r.seed, r.start, r.score, r.failed_level) for r in first.records] == \
+           [(r.seed, r.start, r.score, r.failed_level) for r in second.records]
+
+
+def test_a_process_pool_plays_the_same_games():
+    alone = simulation.simulate("warnsdorff", 12, seed=5)
+    pooled = simulation.simulate("warnsdorff", 12, seed=5, workers=2, chunk_size=5)
+    assert pooled.workers == 2
+    assert [(r.seed, r.score, r.level_scores) for r in pooled.records] == \
+           [(r.seed, r.score, r.level_scores) for r in alone.records]
+
+
+def test_bigger_boards():
+    report = simulation.simulate("solver", 3, seed=2, board_size=7)
+    assert all(record.failed_level != 1 for record in report.records)
+    assert all(0 <= coord < 7 for record in report.records for coord in record.start)
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        simulation.simulate("no_such_bot", 1)
+    with pytest.raises(ValueError):
+        simulation.simulate("random", 0)
+
+
+def test_percentiles():
+    records = [simulation.GameRecord(seed, (0, 0), score, [], 1, 0.0) for seed, score in enumerate([5, 1, 3, 2, 4])]
+    report = simulation.SimulationReport("random", 5, records, 1.0, 1)
+    assert report.score_percentile(0) == 1
+    assert report.score_percentile(50) == 3
+    assert report.score_percentile(100) == 5
+    assert report.score_percentile(50, completed_only=True) is None
+    assert report.mean_score() == 3
+
+
+def test_headless_run_never_imports_pygame():
+    src = Path(__file__).resolve().parent.parent / "src"
+    code = ("import sys; from game_logic.simulation import simulate; simulate('greedy_diagonal', 3);"
+            "print('pygame' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_cli_writes_a_report(tmp_path, capsys):
+    output = tmp_path / "report.json"
+    assert simulate.main(["--bot", "random", "--games", "30", "--workers", "1", "--output", str(output),
+                          "--records"]) == 0
+    assert "games/s" in capsys.readouterr().out
+    data = json.loads(output.read_text())
+    assert data["games"] == 30 and len(data["records"]) == 30
+    assert sum(data["score_histogram"].values()) == 30
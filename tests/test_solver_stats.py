@@ -0,0 +1,69 @@
+import json
+import random
+
+from game_logic.solver_stats import SolverStats
+from game_setup import make_level1, make_level2, make_level3
+
+
+def test_level1_stats_add_up():
+    gs, l1 = make_level1(1, 4)
+    gs.move_ordering[1] = "row_major"
+    result = gs.autocomplete(l1)
+    stats = result.stats
+    assert stats.nodes == result.nodes > 24
+    assert sum(stats.depth_histogram) == stats.nodes
+    assert stats.max_depth == len(stats.depth_histogram) - 1 == 24
+    assert stats.depth_histogram[0] == 0
+    assert stats.elapsed > 0
+    assert stats.prunes is gs.prune_counts
+    assert sum(stats.prunes.values()) > 0
+
+
+def test_stats_round_trip_through_json():
+    gs, l1 = make_level1(0, 0)
+    stats = gs.autocomplete(l1).stats
+    data = json.loads(stats.to_json())
+    assert data == stats.to_dict()
+    assert SolverStats.from_dict(data).to_dict() == stats.to_dict()
+
+
+def test_level2_backtracking_counts_ring_check_and_viability():
+    prunes = SolverStats()
+    for seed in (0, 2, 4):
+        rng = random.Random(seed)
+        gs, l2 = make_level2(rng.randrange(5), rng.randrange(5), seed)
+        gs.level2_solver = "backtrack"
+        prunes.merge(gs.autocomplete(l2).stats)
+    assert prunes.prunes.get("ring_check", 0) > 0
+    assert prunes.prunes.get("viability", 0) > 0
+
+
+def test_replayed_solution_is_a_cache_hit():
+    gs, l1 = make_level1(2, 2)
+    assert gs.autocomplete(l1)
+    gs.reset_level1()
+    result = gs.autocomplete(l1)
+    assert result.stats.cache_hits == {"solution": 1}
+    assert result.stats.nodes == 0
+
+
+def test_level3_counts_memo_hits():
+    stats = SolverStats()
+    for seed in range(8):
+        gs, l3 = make_level3(seed)
+        gs.move_ordering[3] = "row_major"
+        stats.merge(gs.autocomplete(l3).stats)
+    assert stats.nodes > 0
+    assert stats.cache_hits.get("memo", 0) + stats.prunes.get("viability", 0) > 0
+
+
+def test_merge_shifts_depths():
+    inner = SolverStats()
+    inner.nodes = 2
+    inner.record_node(1)
+    inner.record_node(2)
+    outer = SolverStats()
+    outer.merge(inner, depth_offset=1)
+    assert outer.depth_histogram == [0, 0, 1, 1]
+    assert outer.max_depth == 3
+    assert outer.nodes == 2
@@ -0,0 +1,75 @@
+from game_logic import GameState, Level2Logic
+from game_logic import symmetry
+from game_setup import level1_with_moves
+
+
+def mirrored(t, moves):
+    return [symmetry.transform_cell(t, row, col, 5) for row, col in moves]
+
+
+def test_every_symmetry_is_undone_by_its_inverse():
+    images = set()
+    for t in symmetry.SYMMETRIES:
+        back = symmetry.inverse(t)
+        for row in range(7):
+            for col in range(7):
+                moved = symmetry.transform_cell(t, row, col, 7)
+                assert symmetry.transform_cell(back, *moved, 7) == (row, col)
+        images.add(tuple(symmetry.transform_cell(t, row, col, 5) for row in range(5) for col in range(5)))
+    assert len(images) == 8
+
+
+def test_all_orientations_share_one_key():
+    moves = [(0, 1), (1, 2), (2, 2), (3, 1)]
+    keys = set()
+    for t in symmetry.SYMMETRIES:
+        gs, _ = level1_with_moves(mirrored(t, moves))
+        keys.add(gs.zobrist_key)
+    assert len(keys) == 1
+
+
+def test_dead_ends_are_stored_once_for_all_orientations():
+    moves = [(0, 1), (1, 1), (2, 2), (3, 3), (4, 3), (4, 2)]
+    gs, l1 = level1_with_moves(moves)
+    gs.level1_prune_rules = ()
+    assert not gs.autocomplete(l1)
+    table = gs.transposition_table
+    entries = len(table)
+
+    for t in symmetry.SYMMETRIES:
+        other, other_l1 = level1_with_moves(mirrored(t, moves), table)
+        other.level1_prune_rules = ()
+        assert not other.autocomplete(other_l1)
+    assert len(table) == entries
+
+
+def test_mirrored_start_is_a_cache_hit():
+    gs, l1 = level1_with_moves([(1, 4)])
+    assert gs.autocomplete(l1)
+    table = gs.transposition_table
+
+    #(1, 4) turned a quarter anticlockwise is (0, 1)
+    other, other_l1 = level1_with_moves([(0, 1)], table)
+    hits = table.hits
+    assert other.autocomplete(other_l1)
+    assert table.hits == hits + 1
+    assert other.win
+    assert other.board == symmetry.transform_board(symmetry.inverse(1), gs.board)
+    assert other.score == gs.score
+
+
+def test_level2_key_follows_board_and_ring_together():
+    gs, l1 = level1_with_moves([(2, 2)])
+    assert gs.autocomplete(l1)
+    gs.start_level2([row[:] for row in gs.board])
+    l2 = Level2Logic(gs)
+    row, col = l2.get_valid_cells()[0]
+    l2.place_number(row, col)
+
+    t = 5
+    other = GameState()
+    other.level = 2
+    other.board = symmetry.transform_board(t, gs.board)
+    other.outer_ring = symmetry.transform_ring(t, gs.outer_ring)
+    other.sync_occupancy()
+    assert other.zobrist_key == gs.zobrist_key
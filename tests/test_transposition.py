@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from game_logic import GameState, Level2Logic, Level3Logic
+from game_logic.search_problems import Level1Search
+from game_logic.transposition import TranspositionTable, ENTRY_BYTES
+from game_setup import level1_with_moves
+
+
+def random_walk(gs, logic, rng, steps):
+    #place and undo at random, checking the incremental key against a full rehash each step
+    for _ in range(steps):
+        cells = logic.get_valid_cells()
+        if cells and rng.random() < 0.7:
+            logic.place_number(*rng.choice(cells))
+        else:
+            gs.undo()
+        assert gs.zobrist_keys == gs.compute_zobrist_keys()
+
+
+def test_incremental_key_matches_rehash_on_every_level():
+    rng = random.Random(3)
+    gs, l1 = level1_with_moves([(2, 2)])
+    random_walk(gs, l1, rng, 40)
+
+    gs.reset_level1()
+    assert gs.autocomplete(l1)
+    gs.start_level2([row[:] for row in gs.board])
+    l2 = Level2Logic(gs)
+    random_walk(gs, l2, rng, 40)
+
+    gs.reset_lv2()
+    assert gs.autocomplete(l2)
+    gs.start_level3(gs.outer_ring.copy())
+    l3 = Level3Logic(gs)
+    random_walk(gs, l3, rng, 40)
+
+
+def test_search_keys_match_place_number_and_leave_the_game_alone():
+    rng = random.Random(5)
+    gs, l1 = level1_with_moves([(2, 2)])
+    start = gs.zobrist_keys
+    placed = gs.copy()
+    placed_l1 = type(l1)(placed)
+    problem = Level1Search(gs)
+    made = []
+    while True:
+        moves = problem.expand()
+        if not moves:
+            break
+        index = rng.choice(moves)
+        problem.make(index)
+        made.append(index)
+        placed_l1.place_number(*divmod(index, 5))
+        assert problem.keys == placed.zobrist_keys
+    assert len(made) > 3
+    for index in reversed(made):
+        problem.unmake(index)
+    assert problem.keys == start and problem.occupied == gs.occupied and problem.last == 12
+    assert gs.zobrist_keys is start and start == gs.compute_zobrist_keys()
+
+def test_keys_differ_between_levels_and_last_cell():
+    gs, l1 = level1_with_moves([(0, 0), (1, 1)])
+    other, _ = level1_with_moves([(1, 1), (0, 0)])
+    assert gs.occupied == other.occupied
+    assert gs.zobrist_key != other.zobrist_key
+
+
+def test_dead_end_is_remembered_between_runs():
+    gs, l1 = level1_with_moves([(0, 1), (1, 1), (2, 2), (3, 3), (4, 3), (4, 2)])
+    gs.level1_prune_rules = ()
+    assert not gs.autocomplete(l1)
+    table = gs.transposition_table
+    assert table.is_dead_end(gs.zobrist_key)
+    hits = table.hits
+    assert not gs.autocomplete(l1)
+    assert table.hits == hits + 1
+
+
+def test_table_evicts_least_recently_used():
+    table = TranspositionTable(max_bytes=2 * ENTRY_BYTES)
+    table.store_dead_end(1)
+    table.store_dead_end(2)
+    assert table.is_dead_end(1)
+    table.store_dead_end(3)
+    assert len(table) == 2
+    assert not table.is_dead_end(2)
+    assert table.is_dead_end(1) and table.is_dead_end(3)
+    assert table.stats() == {'hits': 3, 'misses': 1, 'entries': 2, 'max_entries': 2}
+
+
+def test_table_needs_room_for_one_entry():
+    with pytest.raises(ValueError):
+        TranspositionTable(max_bytes=1)
+
+
+def test_zero_bytes_turns_the_table_off():
+    gs = GameState(transposition_bytes=0)
+    assert gs.transposition_table is None